@@ -23,6 +23,22 @@ class Settings(BaseSettings):
     VECTOR_DB_TYPE: str = "FAISS" # Or "ChromaDB"
     FAISS_NLIST: int = 100 # Number of clusters for IndexIVFFlat
     FAISS_NPROBE: int = 10 # Number of clusters to probe during search
+    # Use an OPQ-rotated IVF-PQ index instead of IndexIVFFlat. Compresses vectors to
+    # FAISS_PQ_M x FAISS_PQ_NBITS bits; the OPQ rotation recovers recall so a lower
+    # nprobe can be used. FAISS_PQ_M must divide the embedding dimension.
+    FAISS_USE_OPQ: bool = False
+    FAISS_PQ_M: int = 16
+    FAISS_PQ_NBITS: int = 8
+    # OpenMP threads used by FAISS; 0 means one per physical core (os.cpu_count() // 2).
+    # Thread binding must be set in the environment before faiss is imported,
+    # e.g. OMP_PROC_BIND=close OMP_PLACES=cores.
+    FAISS_OMP_THREADS: int = 0
+
+    # Retrieval cache: a query whose embedding has at least this cosine similarity to a
+    # cached query (in the same LSH bucket) reuses its results
+    SEMANTIC_CACHE_PLANES: int = 16 # Random hyperplanes, i.e. bits per LSH bucket key
+    SEMANTIC_CACHE_THRESHOLD: float = 0.95
+    SEMANTIC_CACHE_MAX_ENTRIES: int = 1024 # Least recently used entries are evicted beyond this
 
     # SQLite Database
     METADATA_DB_NAME: str = "metadata.db"
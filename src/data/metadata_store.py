@@ -1,10 +1,46 @@
 import sqlite3
 import os
 import json
+try:
+    # orjson encodes/decodes in C, several times faster than json for the per-chunk metadata column
+    import orjson
+except ImportError:
+    orjson = None
 from typing import List, Dict, Any, Optional
 from ..config import settings
 from datetime import datetime
 
+def _dump_metadata(metadata: Dict[str, Any]) -> str:
+    """
+    Serializes chunk metadata to canonical JSON text: sorted keys and compact separators.
+    Non-string keys are written as strings, as json.dumps does. For str, int, float, bool,
+    None, list and dict values orjson and the json fallback produce the same text; they
+    differ on NaN/Infinity (orjson writes null, json writes NaN) and on datetime values
+    (orjson writes an ISO string, json raises). Anything orjson rejects goes to json.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(metadata, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass # E.g. integers beyond 64 bits, which json still encodes
+    try:
+        return json.dumps(metadata, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    except TypeError:
+        # Keys of mixed types (e.g. int and str) cannot be sorted against each other
+        return json.dumps(metadata, separators=(",", ":"), ensure_ascii=False)
+
+_load_metadata = orjson.loads if orjson is not None else json.loads
+
+def _chunk_row_factory(cursor: sqlite3.Cursor, row: tuple) -> Dict[str, Any]:
+    """Row factory building a chunk dict with its JSON metadata decoded once, while fetching."""
+    return {
+        desc[0]: (_load_metadata(row[i]) if desc[0] == "metadata" and row[i] is not None else row[i])
+        for i, desc in enumerate(cursor.description)
+    }
+
+# SQLITE_MAX_VARIABLE_NUMBER is 999 in SQLite builds before 3.32
+_MAX_SQL_PARAMS = 999
+
 class MetadataStore:
     """
     Manages the SQLite database for storing document and chunk metadata.
@@ -15,18 +51,24 @@ class MetadataStore:
         Initializes the MetadataStore and ensures the database directory exists.
 
         Args:
-            db_path: The full path to the SQLite database file.
+            db_path: The full path to the SQLite database file, or a SQLite URI
+                     such as "file:name?mode=memory&cache=shared".
         """
         self.db_path = db_path
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self._is_uri = db_path.startswith("file:")
+        if not self._is_uri:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
         self._create_tables()
 
     def _get_connection(self) -> sqlite3.Connection:
         """
         Establishes and returns a connection to the SQLite database.
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(self.db_path, uri=self._is_uri)
         conn.row_factory = sqlite3.Row
+        # Per-connection settings: with WAL, NORMAL sync skips the fsync on every commit
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
         return conn
 
     def _create_tables(self):
@@ -38,10 +80,13 @@ class MetadataStore:
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
+            # WAL is persistent in the database file; in-memory databases keep "memory"
+            cursor.execute("PRAGMA journal_mode=WAL")
+
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS documents (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    file_path TEXT UNIQUE NOT NULL,
+                    file_path TEXT UNIQUE NOT NULL, -- UNIQUE indexes get_document_by_path
                     filename TEXT NOT NULL,
                     file_type TEXT,
                     size INTEGER,
@@ -69,7 +114,7 @@ class MetadataStore:
                     FOREIGN KEY (document_id) REFERENCES documents (id),
                     FOREIGN KEY (previous_chunk_id) REFERENCES chunks (id),  -- Add foreign key constraint
                     FOREIGN KEY (next_chunk_id) REFERENCES chunks (id),      -- Add foreign key constraint
-                    UNIQUE (document_id, chunk_index)
+                    UNIQUE (document_id, chunk_index) -- Also the index for chunk lookups by document, in order
                 )
             """)
 
@@ -157,32 +202,22 @@ class MetadataStore:
             with self._get_connection() as conn:
                 cursor = conn.cursor()
 
-                # Get existing chunks for the document to determine previous/next chunk IDs
-                existing_chunks = self.get_chunks_by_document_id(document_id)
-                existing_chunk_ids = [chunk['id'] for chunk in existing_chunks]
-
-                # Prepare data for bulk insertion
-                data_to_insert = []
-                previous_chunk_id = None  # Initialize previous_chunk_id
-
-                for i, chunk_data in enumerate(chunks_data):
-                    # Determine next_chunk_id (if it exists)
-                    next_chunk_id = None
-                    if i + 1 < len(chunks_data):
-                        next_chunk_id = None  # We can't know the actual ID yet, set to None for now
-
-                    data_to_insert.append((
+                # Prepare data for bulk insertion. previous/next chunk IDs aren't known
+                # until the rows exist, so they are linked after the insert.
+                data_to_insert = [
+                    (
                         document_id,
                         chunk_data.get("chunk_index"),
                         chunk_data.get("content"), # Include content
                         chunk_data.get("chunk_type"),
                         chunk_data.get("start_char"),
                         chunk_data.get("end_char"),
-                        json.dumps(chunk_data.get("metadata", {})), # Store metadata as JSON string
-                        previous_chunk_id,
-                        next_chunk_id
-                    ))
-                    previous_chunk_id = None # We can't know the actual ID yet
+                        _dump_metadata(chunk_data.get("metadata", {})), # Store metadata as canonical JSON string
+                        None,
+                        None,
+                    )
+                    for chunk_data in chunks_data
+                ]
 
                 # Consider deleting old chunks for this document_id before inserting new ones
                 # This depends on the desired versioning strategy (e.g., keep all versions vs. replace)
@@ -198,14 +233,11 @@ class MetadataStore:
                 cursor.execute("SELECT id FROM chunks WHERE document_id = ? ORDER BY chunk_index", (document_id,))
                 new_chunk_ids = [row[0] for row in cursor.fetchall()]
 
-                # Update previous_chunk_id and next_chunk_id for all chunks
-                for i, chunk_id in enumerate(new_chunk_ids):
-                    prev_chunk_id = new_chunk_ids[i - 1] if i > 0 else None
-                    next_chunk_id = new_chunk_ids[i + 1] if i < len(new_chunk_ids) - 1 else None
-
-                    cursor.execute("""
-                        UPDATE chunks SET previous_chunk_id = ?, next_chunk_id = ? WHERE id = ?
-                    """, (prev_chunk_id, next_chunk_id, chunk_id))
+                # Update previous_chunk_id and next_chunk_id for all chunks in one batch
+                links = zip([None] + new_chunk_ids[:-1], new_chunk_ids[1:] + [None], new_chunk_ids)
+                cursor.executemany("""
+                    UPDATE chunks SET previous_chunk_id = ?, next_chunk_id = ? WHERE id = ?
+                """, links)
 
                 conn.commit()
                 print(f"Added {len(chunks_data)} chunk entries for document ID {document_id}.")
@@ -241,30 +273,34 @@ class MetadataStore:
 
         Returns:
             A list of dictionaries containing chunk data (including content and metadata).
+            The metadata column is already decoded from JSON into a dictionary.
         """
         try:
             with self._get_connection() as conn:
+                conn.row_factory = _chunk_row_factory
                 cursor = conn.cursor()
                 cursor.execute("SELECT * FROM chunks WHERE document_id = ? ORDER BY chunk_index", (document_id,))
-                rows = cursor.fetchall()
-                # Convert JSON metadata back to dictionary
-                return [dict(row) for row in rows]
+                return cursor.fetchall()
         except Exception as e:
             print(f"Error retrieving chunks for document ID {document_id}: {e}")
             return []
 
-    def get_chunk_by_id(self, chunk_id: int) -> Optional[Dict[str, Any]]:
+    def get_chunk_by_id(self, chunk_id: int, parse_metadata: bool = True) -> Optional[Dict[str, Any]]:
         """
         Retrieves a single chunk by its ID.
 
         Args:
             chunk_id: The ID of the chunk.
+            parse_metadata: If True, the metadata column is returned decoded into a
+                            dictionary; if False, as the stored JSON string.
 
         Returns:
             A dictionary containing chunk data, or None if not found.
         """
         try:
             with self._get_connection() as conn:
+                if parse_metadata:
+                    conn.row_factory = _chunk_row_factory
                 cursor = conn.cursor()
                 cursor.execute("SELECT * FROM chunks WHERE id = ?", (chunk_id,))
                 row = cursor.fetchone()
@@ -273,10 +309,55 @@ class MetadataStore:
             print(f"Error retrieving chunk by ID {chunk_id}: {e}")
             return None
 
-    def get_previous_chunk(self, chunk_id: int) -> Optional[Dict[str, Any]]:
-        """Retrieves the previous chunk given a chunk ID."""
+    def get_chunks_by_ids(self, chunk_ids: List[int], parse_metadata: bool = True) -> Dict[int, Dict[str, Any]]:
+        """
+        Retrieves several chunks by ID with one query per batch of IDs, instead of
+        one get_chunk_by_id round trip each.
+
+        Args:
+            chunk_ids: The IDs of the chunks. Duplicates are ignored.
+            parse_metadata: If True, the metadata column is returned decoded into a
+                            dictionary; if False, as the stored JSON string.
+
+        Returns:
+            A dictionary mapping chunk ID to chunk data. IDs that were not found
+            are absent, and the mapping does not follow the order of chunk_ids.
+        """
+        unique_ids = list(dict.fromkeys(chunk_ids))
+        chunks: Dict[int, Dict[str, Any]] = {}
         try:
             with self._get_connection() as conn:
+                if parse_metadata:
+                    conn.row_factory = _chunk_row_factory
+                cursor = conn.cursor()
+                # Stay below SQLite's limit on host parameters per statement
+                for start in range(0, len(unique_ids), _MAX_SQL_PARAMS):
+                    batch = unique_ids[start:start + _MAX_SQL_PARAMS]
+                    placeholders = ",".join("?" * len(batch))
+                    cursor.execute(f"SELECT * FROM chunks WHERE id IN ({placeholders})", batch)
+                    for row in cursor.fetchall():
+                        chunks[row["id"]] = dict(row)
+            return chunks
+        except Exception as e:
+            print(f"Error retrieving chunks by IDs: {e}")
+            return {}
+
+    def get_previous_chunk(self, chunk_id: int, parse_metadata: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Retrieves the previous chunk given a chunk ID.
+
+        Args:
+            chunk_id: The ID of the chunk.
+            parse_metadata: If True, the metadata column is returned decoded into a
+                            dictionary; if False, as the stored JSON string.
+
+        Returns:
+            A dictionary containing the previous chunk's data, or None if there is none.
+        """
+        try:
+            with self._get_connection() as conn:
+                if parse_metadata:
+                    conn.row_factory = _chunk_row_factory
                 cursor = conn.cursor()
                 cursor.execute("SELECT * FROM chunks WHERE id = (SELECT previous_chunk_id FROM chunks WHERE id = ?)", (chunk_id,))
                 row = cursor.fetchone()
@@ -285,10 +366,22 @@ class MetadataStore:
             print(f"Error retrieving previous chunk for chunk ID {chunk_id}: {e}")
             return None
 
-    def get_next_chunk(self, chunk_id: int) -> Optional[Dict[str, Any]]:
-        """Retrieves the next chunk given a chunk ID."""
+    def get_next_chunk(self, chunk_id: int, parse_metadata: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Retrieves the next chunk given a chunk ID.
+
+        Args:
+            chunk_id: The ID of the chunk.
+            parse_metadata: If True, the metadata column is returned decoded into a
+                            dictionary; if False, as the stored JSON string.
+
+        Returns:
+            A dictionary containing the next chunk's data, or None if there is none.
+        """
         try:
             with self._get_connection() as conn:
+                if parse_metadata:
+                    conn.row_factory = _chunk_row_factory
                 cursor = conn.cursor()
                 cursor.execute("SELECT * FROM chunks WHERE id = (SELECT next_chunk_id FROM chunks WHERE id = ?)", (chunk_id,))
                 row = cursor.fetchone()
@@ -358,7 +451,7 @@ if __name__ == "__main__":
         print(f"Retrieved {len(retrieved_chunks)} chunks.")
         if retrieved_chunks:
             print("First retrieved chunk content:", retrieved_chunks[0].get("content"))
-            print("First retrieved chunk metadata:", json.loads(retrieved_chunks[0].get("metadata", "{}")))
+            print("First retrieved chunk metadata:", retrieved_chunks[0].get("metadata"))
 
         # Example of retrieving previous and next chunks
         first_chunk_id = retrieved_chunks[0]["id"]
@@ -46,20 +46,17 @@ class ChangeDetector:
         """
         changes: List[DocumentChange] = []
         
-        original_paras = self.original_editor.document.paragraphs
-        modified_paras = self.modified_editor.document.paragraphs
+        # Materialize paragraph texts once; each Paragraph.text access re-joins its runs.
+        original_texts = [p.text for p in self.original_editor.document.paragraphs]
+        modified_texts = [p.text for p in self.modified_editor.document.paragraphs]
 
         # Simple comparison based on paragraph index
         # This won't correctly identify changes if paragraphs are inserted/deleted,
         # as indices will shift. A more sophisticated alignment is needed for that.
-        len_orig = len(original_paras)
-        len_mod = len(modified_paras)
-        common_len = min(len_orig, len_mod)
-
-        for i in range(common_len):
-            orig_para_text = original_paras[i].text
-            mod_para_text = modified_paras[i].text
+        len_orig = len(original_texts)
+        len_mod = len(modified_texts)
 
+        for i, (orig_para_text, mod_para_text) in enumerate(zip(original_texts, modified_texts)):
             if orig_para_text != mod_para_text:
                 # TODO: Implement run-level diffing within the paragraph for more granularity
                 # For now, treating the whole paragraph text as changed.
@@ -81,7 +78,7 @@ class ChangeDetector:
                     change_type=ChangeType.PARAGRAPH_INSERT, # Or treat as TEXT_UPDATE with old_value=None
                     location=LocationParagraph(paragraph_index=i),
                     old_value=None,
-                    new_value=modified_paras[i].text,
+                    new_value=modified_texts[i],
                     description=f"Paragraph {i} inserted."
                 )
                 changes.append(change)
@@ -91,7 +88,7 @@ class ChangeDetector:
                     document_id=self.document_id,
                     change_type=ChangeType.PARAGRAPH_DELETE, # Or treat as TEXT_UPDATE with new_value=None
                     location=LocationParagraph(paragraph_index=i),
-                    old_value=original_paras[i].text,
+                    old_value=original_texts[i],
                     new_value=None,
                     description=f"Paragraph {i} deleted."
                 )
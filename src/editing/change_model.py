@@ -3,7 +3,7 @@ from enum import Enum
 from typing import Any, Dict, Optional, Union, List
 from pydantic import BaseModel, Field
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 
 class ChangeType(str, Enum):
     """Enumeration for types of changes that can be applied to a document."""
@@ -41,6 +41,10 @@ class LocationSection(BaseModel):
     heading_style_name: Optional[str] = None
     # Could also include paragraph range if known
 
+def _utcnow() -> datetime:
+    """Current UTC time as a naive datetime; resolves `datetime` at call time so the clock can be patched."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
 # Union type for various location specifications
 ChangeLocation = Union[LocationParagraph, LocationTable, LocationSection, int, str, None]
 # int could be paragraph_index for simple cases, str could be a unique element ID if available.
@@ -66,7 +70,7 @@ class DocumentChange(BaseModel):
     description: Optional[str] = None # Human-readable description of the change
     status: ChangeStatus = ChangeStatus.PROPOSED
     source: Optional[str] = None # e.g., "LLM_suggestion", "user_edit"
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=_utcnow)
     
     # For formatting changes, specific attributes
     # old_format: Optional[Dict[str, Any]] = None
@@ -3,7 +3,7 @@ from docx import Document
 from docx.shared import Pt
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 
-from typing import List, Optional
+from typing import IO, List, Optional, Union
 from docx.text.run import Run
 from docx.text.paragraph import Paragraph
 from docx.table import Table, _Cell
@@ -14,25 +14,41 @@ class WordEditor:
     Provides utilities for editing Word documents (.docx) while attempting to preserve formatting.
     """
 
-    def __init__(self, doc_path: Optional[str] = None):
+    def __init__(self, doc_path: Optional[Union[str, IO[bytes]]] = None):
         """
         Initializes the WordEditor.
 
         Args:
-            doc_path (str, optional): Path to the Word document. Defaults to None.
-                                      If None, a new document is created.
+            doc_path (str or file-like, optional): Path to the Word document, or a binary
+                                      file-like object (e.g. io.BytesIO) holding one.
+                                      Defaults to None. If None, a new document is created.
         """
         if doc_path:
             self.document = Document(doc_path)
         else:
             self.document = Document()
 
-    def save_document(self, save_path: str):
+    @classmethod
+    def from_document(cls, document) -> "WordEditor":
+        """
+        Creates a WordEditor that edits an already loaded python-docx Document in place.
+
+        Args:
+            document (docx.document.Document): The document to edit.
+        Returns:
+            WordEditor: An editor wrapping the given document.
+        """
+        editor = cls.__new__(cls)
+        editor.document = document
+        return editor
+
+    def save_document(self, save_path: Union[str, IO[bytes]]):
         """
         Saves the document to the specified path.
 
         Args:
-            save_path (str): The path where the document will be saved.
+            save_path (str or file-like): The path where the document will be saved,
+                                          or a writable binary file-like object.
         """
         self.document.save(save_path)
 
@@ -4,6 +4,28 @@ class PromptTemplates:
     These templates are designed with token efficiency and clarity for the Gemini API.
     """
 
+    # Static instructions shared by every QA prompt. Keeping them as an identical leading
+    # prefix lets servers with prefix (KV) caching reuse it across requests.
+    QA_PREFIX = """Answer the following question based *only* on the provided context.
+If the answer is not in the context, state "I don't know."
+
+"""
+
+    @staticmethod
+    def qa_prefix() -> str:
+        """Returns the static instruction prefix of the QA prompt."""
+        return PromptTemplates.QA_PREFIX
+
+    @staticmethod
+    def qa_suffix(context: str, query: str) -> str:
+        """Returns the per-request part of the QA prompt, which follows qa_prefix()."""
+        return f"""Context:
+{context}
+
+Question: {query}
+
+Answer:"""
+
     @staticmethod
     def qa_template(context: str, query: str) -> str:
         """
@@ -12,15 +34,7 @@ class PromptTemplates:
         # Optimization: Concise instructions, direct question format.
         """
         # Keep prompt short and focused on direct answer extraction.
-        return f"""Answer the following question based *only* on the provided context.
-If the answer is not in the context, state "I don't know."
-
-Context:
-{context}
-
-Question: {query}
-
-Answer:"""
+        return PromptTemplates.qa_prefix() + PromptTemplates.qa_suffix(context, query)
 
     @staticmethod
     def summarize_template(text: str) -> str:
@@ -1,6 +1,5 @@
 import os
 from typing import List, Dict, Any
-from unstructured.partition.auto import partition
 
 def parse_document(file_path: str) -> List[Dict[str, Any]]:
     """
@@ -19,7 +18,9 @@ def parse_document(file_path: str) -> List[Dict[str, Any]]:
         return []
 
     try:
-        # Use unstructured.partition.auto to handle different file types
+        # Use unstructured.partition.auto to handle different file types. Imported here so
+        # that importing src.processors (e.g. for chunking) does not load unstructured.
+        from unstructured.partition.auto import partition
         elements = partition(filename=file_path)
 
         # Convert elements to a list of dictionaries
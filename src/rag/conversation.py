@@ -1,6 +1,6 @@
 import sqlite3
 import json
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 import os
 
@@ -16,17 +16,20 @@ class ConversationManager:
         Initializes the ConversationManager and ensures the database table exists.
 
         Args:
-            db_path: The full path to the SQLite database file (reusing metadata DB).
+            db_path: The full path to the SQLite database file (reusing metadata DB),
+                     or a SQLite URI such as "file:name?mode=memory&cache=shared".
         """
         self.db_path = db_path
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True) # Ensure directory exists
+        self._is_uri = db_path.startswith("file:")
+        if not self._is_uri:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True) # Ensure directory exists
         self._create_table()
 
     def _get_connection(self) -> sqlite3.Connection:
         """
         Establishes and returns a connection to the SQLite database.
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(self.db_path, uri=self._is_uri)
         conn.row_factory = sqlite3.Row # Access columns by name
         return conn
 
@@ -92,6 +95,39 @@ class ConversationManager:
         except Exception as e:
             print(f"Error adding message to conversation history: {e}")
 
+    def add_messages_bulk(self, session_id: str, messages: List[Tuple[str, str, Optional[Dict[str, Any]]]]):
+        """
+        Adds several messages to the conversation history in a single transaction.
+        Turn indices continue from the session's last turn, in list order.
+
+        Args:
+            session_id: A unique identifier for the conversation session.
+            messages: A list of (role, message, metadata) tuples, as for add_message.
+        """
+        rows = []
+        turn_index = self.get_last_turn_index(session_id) + 1
+        for role, message, metadata in messages:
+            if role not in ['user', 'assistant']:
+                print(f"Warning: Invalid role '{role}'. Message not added.")
+                continue
+            rows.append((session_id, turn_index, role, message, json.dumps(metadata) if metadata else None))
+            turn_index += 1
+
+        if not rows:
+            return
+
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.executemany("""
+                    INSERT INTO conversation_history (session_id, turn_index, role, message, metadata)
+                    VALUES (?, ?, ?, ?, ?)
+                """, rows)
+                conn.commit()
+            print(f"Added {len(rows)} messages to session '{session_id}'.")
+        except Exception as e:
+            print(f"Error adding messages to conversation history: {e}")
+
     def get_conversation_history(self, session_id: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Retrieves the conversation history for a given session, ordered by turn index.
@@ -1,3 +1,4 @@
+import numpy as np
 import torch
 from sentence_transformers import SentenceTransformer
 from typing import List, Dict, Any
@@ -28,9 +29,9 @@ class EmbeddingModel:
             self.model = SentenceTransformer(model_name, device=self.device)
             print(f"Loaded embedding model: {model_name} on {self.device}")
 
-        self.cache: Dict[str, List[float]] = {} # In-memory cache: text -> embedding
+        self.cache: Dict[str, np.ndarray] = {} # In-memory cache: text -> float32 embedding row
 
-    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+    def generate_embeddings(self, texts: List[str]) -> np.ndarray:
         """
         Generates embeddings for a list of text strings using batched processing
         and an in-memory cache.
@@ -39,51 +40,36 @@ class EmbeddingModel:
             texts: A list of text strings (document chunks).
 
         Returns:
-            A list of embeddings, where each embedding is a list of floats.
+            A C-contiguous float32 array of shape (len(texts), dimension), row i being
+            the embedding of texts[i]. FAISS consumes it without any conversion.
         """
-        if not texts:
-            return []
+        # Encode each distinct non-cached text once
+        texts_to_embed = list(dict.fromkeys(text for text in texts if text not in self.cache))
 
-        # Separate texts into cached and non-cached
-        texts_to_embed = []
-        cached_embeddings = {}
-        original_order_map = {} # To maintain the original order
-
-        for i, text in enumerate(texts):
-            if text in self.cache:
-                cached_embeddings[text] = self.cache[text]
-            else:
-                texts_to_embed.append(text)
-            original_order_map[text] = i # Store original index
-
-        generated_embeddings = []
         if texts_to_embed:
             print(f"Generating embeddings for {len(texts_to_embed)} non-cached texts...")
             # Generate embeddings for non-cached texts in batches
             # Use mixed precision if on CUDA for potential memory savings
             precision = 'float16' if self.device == 'cuda' else 'float32'
-            generated_embeddings_tensors = self.model.encode(
+            generated_embeddings = self.model.encode(
                 texts_to_embed,
                 batch_size=settings.EMBEDDING_BATCH_SIZE,
                 show_progress_bar=True,
-                convert_to_numpy=False,
-                convert_to_tensor=True,
+                convert_to_numpy=True,
+                convert_to_tensor=False,
                 precision=precision
             )
-            generated_embeddings = generated_embeddings_tensors.tolist() # Convert to list of lists
+            generated_embeddings = np.asarray(generated_embeddings, dtype=np.float32)
 
             # Store newly generated embeddings in the cache
             for text, embedding in zip(texts_to_embed, generated_embeddings):
                 self.cache[text] = embedding
 
-        # Combine cached and generated embeddings, maintaining original order
-        all_embeddings = [None] * len(texts)
-        for text in texts:
-            if text in self.cache:
-                all_embeddings[original_order_map[text]] = self.cache[text]
-            # Note: If a text was in texts_to_embed, its embedding is already in cache now
-
-        return all_embeddings
+        # Gather cached rows into one (N, D) buffer in the original order
+        embeddings = np.empty((len(texts), self.model.get_sentence_embedding_dimension()), dtype=np.float32)
+        for i, text in enumerate(texts):
+            embeddings[i] = self.cache[text]
+        return embeddings
 
 
 # Example Usage
@@ -116,12 +102,12 @@ if __name__ == "__main__":
     print(f"Cache size after second pass: {len(embedding_model.cache)}")
 
     # Verify that embeddings for duplicate texts are the same
-    assert embeddings_pass1[0] == embeddings_pass2[0]
-    assert embeddings_pass1[1] == embeddings_pass2[1]
-    assert embeddings_pass1[0] == embeddings_pass2[6] # Compare first text embedding with its duplicate
-    assert embeddings_pass1[1] == embeddings_pass2[7] # Compare second text embedding with its duplicate
+    assert np.array_equal(embeddings_pass1[0], embeddings_pass2[0])
+    assert np.array_equal(embeddings_pass1[1], embeddings_pass2[1])
+    assert np.array_equal(embeddings_pass1[0], embeddings_pass2[6]) # Compare first text embedding with its duplicate
+    assert np.array_equal(embeddings_pass1[1], embeddings_pass2[7]) # Compare second text embedding with its duplicate
 
     print("\nCache test successful: Embeddings for duplicate texts were retrieved from cache.")
 
-    if embeddings_pass1:
-        print(f"Embedding dimension: {len(embeddings_pass1[0])}")
\ No newline at end of file
+    if len(embeddings_pass1):
+        print(f"Embedding dimension: {embeddings_pass1.shape[1]}")
\ No newline at end of file
@@ -6,6 +6,7 @@ from collections import defaultdict
 
 from .embeddings import EmbeddingModel
 from .vector_store import VectorStore
+from .semantic_cache import LSHCache
 from ..data.metadata_store import MetadataStore
 from ..llm.gemini import GeminiClient  # Import GeminiClient
 from ..llm.prompts import PromptTemplates  # Import PromptTemplates
@@ -53,6 +54,7 @@ class Retriever:
         self.bm25: Optional[BM25Okapi] = None
         self.chunk_id_corpus_map: Optional[Dict[int, str]] = None  # Map chunk_id to content for BM25 retrieval
         self.retrieval_cache: Dict[str, List[Dict[str, Any]]] = {}  # Cache retrieval results
+        self.semantic_cache = LSHCache()  # Cache retrieval results by query embedding, so paraphrases hit too
 
     def build_bm25_index(self):
         """
@@ -101,7 +103,10 @@ class Retriever:
     ) -> List[Dict[str, Any]]:
         """
         Retrieves the top-k most relevant document chunks for a given query and generates a response.
-        Caches retrieval results to improve performance.
+        Caches retrieval results to improve performance: an identical query hits the exact cache.
+        For vector search, a query whose embedding is close enough to a cached query's reuses
+        that query's retrieved chunks (semantic cache); the response is still generated for the
+        query itself.
 
         Args:
             query: The search query string.
@@ -118,45 +123,59 @@ class Retriever:
         if not query:
             return []
 
-        # Create a cache key
-        cache_key = json.dumps(
-            {
-                "query": query,
-                "k": k,
-                "search_type": search_type,
-                "rrf_k": rrf_k,
-                "metadata_filters": metadata_filters,
-            },
-            sort_keys=True,
-        )
+        # Create a cache key. The semantic cache is keyed on the query embedding, so its
+        # namespace holds only the other parameters.
+        cache_params = {
+            "k": k,
+            "search_type": search_type,
+            "rrf_k": rrf_k,
+            "metadata_filters": metadata_filters,
+        }
+        semantic_namespace = json.dumps(cache_params, sort_keys=True)
+        cache_key = json.dumps({"query": query, **cache_params}, sort_keys=True)
 
         # Check if the result is already cached
         if cache_key in self.retrieval_cache:
             print("Retrieving results from cache - HIT")
             return self.retrieval_cache[cache_key]
-        else:
-            print("Retrieving results from cache - MISS")
+
+        query_embedding = None
+        if search_type in ["vector", "hybrid"]:
+            query_embedding = self.embedding_model.generate_embeddings([query])[0]
+        if search_type == "vector":
+            # Only pure vector rankings are reused for similar queries: they depend on the query
+            # through its embedding alone, while BM25 hits depend on its exact words. The cached
+            # chunks are re-answered for this query, so a response is never shared across queries.
+            cached_chunks = self.semantic_cache.get(query_embedding, namespace=semantic_namespace)
+            if cached_chunks is not None:
+                print("Retrieving results from cache - HIT (semantic)")
+                results = self._generate_results(query, cached_chunks)
+                self.retrieval_cache[cache_key] = results
+                return results
+        print("Retrieving results from cache - MISS")
 
         vector_results = []
         bm25_results = []
         final_results_ids = set()
+        # Chunk rows fetched during this call, keyed by chunk_id, so each chunk is read
+        # from the metadata store at most once and always as part of a batch
+        chunks_by_id: Dict[int, Dict[str, Any]] = {}
 
         # 1. Vector Search (if applicable)
         if search_type in ["vector", "hybrid"]:
             print(f"Performing vector search for query: '{query}'")
-            query_embedding = self.embedding_model.generate_embeddings([query])[0]
             # Retrieve more results initially for potential re-ranking
             initial_k_vector = k * 2 if search_type == "hybrid" else k
             vector_search_raw = self.vector_store.search(query_embedding, k=initial_k_vector)
 
             # Apply metadata filters
+            chunks_by_id.update(self.metadata_store.get_chunks_by_ids([int(res['external_id']) for res in vector_search_raw]))
             filtered_vector_search_raw = []
             for res in vector_search_raw:
                 chunk_id = int(res['external_id'])
-                chunk_data = self.metadata_store.get_chunk_by_id(chunk_id)
+                chunk_data = chunks_by_id.get(chunk_id)
                 if chunk_data:
-                    metadata = json.loads(chunk_data.get("metadata", "{}"))
-                    if self._matches_filters(metadata, metadata_filters):
+                    if self._matches_filters(chunk_data.get("metadata") or {}, metadata_filters):
                         filtered_vector_search_raw.append(res)
 
             # Assuming external_id is chunk_id (needs update in indexer)
@@ -178,16 +197,19 @@ class Retriever:
                 # We need to map these scores back to chunk_ids and sort
                 doc_scores = self.bm25.get_scores(tokenized_query)
 
-                # Apply metadata filters
-                filtered_chunk_id_scores = {}
-                corpus_index_to_chunk_id = {i: chunk_id for i, chunk_id in enumerate(self.chunk_id_corpus_map.keys())}
-                for i, score in enumerate(doc_scores):
-                    chunk_id = corpus_index_to_chunk_id[i]
-                    chunk_data = self.metadata_store.get_chunk_by_id(chunk_id)
-                    if chunk_data:
-                        metadata = json.loads(chunk_data.get("metadata", "{}"))
-                        if self._matches_filters(metadata, metadata_filters):
-                            filtered_chunk_id_scores[chunk_id] = score
+                # Apply metadata filters. The corpus was read from the metadata store, so
+                # chunk rows are only needed when there is something to filter on.
+                corpus_chunk_ids = list(self.chunk_id_corpus_map.keys())
+                if metadata_filters:
+                    chunks_by_id.update(self.metadata_store.get_chunks_by_ids(corpus_chunk_ids))
+                    filtered_chunk_id_scores = {}
+                    for chunk_id, score in zip(corpus_chunk_ids, doc_scores):
+                        chunk_data = chunks_by_id.get(chunk_id)
+                        if chunk_data:
+                            if self._matches_filters(chunk_data.get("metadata") or {}, metadata_filters):
+                                filtered_chunk_id_scores[chunk_id] = score
+                else:
+                    filtered_chunk_id_scores = dict(zip(corpus_chunk_ids, doc_scores))
 
                 # Sort by score descending
                 sorted_bm25 = sorted(filtered_chunk_id_scores.items(), key=lambda item: item[1], reverse=True)
@@ -213,11 +235,16 @@ class Retriever:
             for rank, (chunk_id, rank_score, bm25_score) in enumerate(bm25_results):
                 rrf_scores[chunk_id] += 1.0 / (rrf_k + rank + 1)  # RRF formula
 
+            # Fetch any fused candidates not already read, in one batch
+            missing_ids = [chunk_id for chunk_id in rrf_scores if chunk_id not in chunks_by_id]
+            if missing_ids:
+                chunks_by_id.update(self.metadata_store.get_chunks_by_ids(missing_ids))
+
             # ----------------------------------------------------------------------------------------------------
             # Add chunk length to the RRF score
             # ----------------------------------------------------------------------------------------------------
             for chunk_id in rrf_scores:
-                chunk_data = self.metadata_store.get_chunk_by_id(chunk_id)
+                chunk_data = chunks_by_id.get(chunk_id)
                 if chunk_data:
                     chunk_length = len(chunk_data["content"])
                     # Normalize chunk length (assuming a reasonable range, e.g., 50-200 tokens)
@@ -233,9 +260,9 @@ class Retriever:
             # For now, let's assume the query itself is the topic
             query_topic = query.lower()  # Treat the query as the topic
             for chunk_id in rrf_scores:
-                chunk_data = self.metadata_store.get_chunk_by_id(chunk_id)
+                chunk_data = chunks_by_id.get(chunk_id)
                 if chunk_data:
-                    metadata = json.loads(chunk_data.get("metadata", "{}"))
+                    metadata = chunk_data.get("metadata") or {}
                     chunk_topic = metadata.get("topic", "").lower()
                     if chunk_topic == query_topic:
                         rrf_scores[chunk_id] += 0.2  # Adjust the weight (0.2) as needed
@@ -245,7 +272,7 @@ class Retriever:
             # ----------------------------------------------------------------------------------------------------
             # Boost scores for chunks that appear earlier in the document
             for chunk_id in rrf_scores:
-                chunk_data = self.metadata_store.get_chunk_by_id(chunk_id)
+                chunk_data = chunks_by_id.get(chunk_id)
                 if chunk_data:
                     chunk_index = chunk_data.get("chunk_index", 0)
                     # Normalize chunk index (assuming chunks are roughly in order)
@@ -264,8 +291,12 @@ class Retriever:
         # 4. Retrieve full chunk data for final results
         retrieved_chunks_data: List[Dict[str, Any]] = []
         print(f"Retrieving final {len(final_results_ids)} chunks from metadata store...")
+        missing_ids = [chunk_id for chunk_id in final_results_ids if chunk_id not in chunks_by_id]
+        if missing_ids:
+            chunks_by_id.update(self.metadata_store.get_chunks_by_ids(missing_ids))
         for chunk_id in final_results_ids:
-            chunk_data = self.metadata_store.get_chunk_by_id(chunk_id)  # Use get_chunk_by_id
+            # Copy, so adding the score below does not touch the row shared with the boosts above
+            chunk_data = dict(chunks_by_id[chunk_id]) if chunk_id in chunks_by_id else None
             if chunk_data:
                 # Optionally add the final score (RRF, distance, or BM25)
                 if search_type == "hybrid":
@@ -291,6 +322,27 @@ class Retriever:
         elif search_type == "bm25":
             retrieved_chunks_data.sort(key=lambda x: x.get("score", 0), reverse=True)
 
+        if search_type == "vector":
+            self.semantic_cache.put(query_embedding, retrieved_chunks_data, namespace=semantic_namespace)
+
+        results = self._generate_results(query, retrieved_chunks_data)
+
+        # Store the result in the cache
+        self.retrieval_cache[cache_key] = results
+        return results
+
+    def _generate_results(self, query: str, retrieved_chunks_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Fits the ranked chunks into the context window and generates the response for the
+        query from them.
+
+        Args:
+            query: The search query string.
+            retrieved_chunks_data: The retrieved chunks, best first.
+
+        Returns:
+            The chunks that fit the context window, each merged with the generated response.
+        """
         # 5. Context Window Management
         print("Managing context window...")
         max_context_tokens = 4096  # Example token limit for Gemini
@@ -332,9 +384,6 @@ class Retriever:
             results.append({**chunk, "response": response_text})  # Merge chunk data with response
 
         print(f"Retrieved {len(results)} final chunks and generated response.")
-        
-        # Store the result in the cache
-        self.retrieval_cache[cache_key] = results
         return results
 
     def _matches_filters(self, metadata: Dict[str, Any], metadata_filters: Optional[Dict[str, Any]]) -> bool:
@@ -353,6 +402,7 @@ class Retriever:
     def clear_cache(self):
         """Clears the retrieval cache."""
         self.retrieval_cache = {}
+        self.semantic_cache.clear()
         print("Retrieval cache cleared.")
 
     def invalidate_cache(self):
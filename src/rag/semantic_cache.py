@@ -0,0 +1,105 @@
+import itertools
+import numpy as np
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+from ..config import settings # Assuming config is in src/
+
+class LSHCache:
+    """
+    Semantic cache keyed on embeddings rather than exact strings.
+
+    Embeddings are hashed with random-projection LSH: the sign of the embedding's
+    projection onto each of n_planes random Gaussian vectors gives one bit, and the
+    packed bits select a bucket. Similar embeddings mostly share a bucket, so a lookup
+    only compares cosine similarity against the few entries stored there and returns
+    the closest one if it reaches the threshold. Once max_entries entries are stored, adding
+    another evicts the least recently used one.
+    """
+    def __init__(self, n_planes: int = settings.SEMANTIC_CACHE_PLANES,
+                 threshold: float = settings.SEMANTIC_CACHE_THRESHOLD,
+                 max_entries: int = settings.SEMANTIC_CACHE_MAX_ENTRIES, seed: int = 0):
+        """
+        Initializes an empty cache.
+
+        Args:
+            n_planes: Number of random hyperplanes, i.e. bits in each bucket key.
+            threshold: Minimum cosine similarity for a cached entry to count as a hit.
+            max_entries: Maximum number of cached entries before the least recently used is evicted.
+            seed: Seed for the hyperplanes, so bucketing is reproducible.
+        """
+        self.n_planes = n_planes
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._rng = np.random.default_rng(seed)
+        self._planes: Optional[np.ndarray] = None # (n_planes, dim); drawn once the dimension is known
+        # Bucket -> [(entry id, unit embedding, value)]; _lru maps entry id -> bucket, oldest first
+        self._buckets: Dict[Tuple[Hashable, bytes], List[Tuple[int, np.ndarray, Any]]] = {}
+        self._lru: "OrderedDict[int, Tuple[Hashable, bytes]]" = OrderedDict()
+        self._ids = itertools.count()
+
+    def _unit(self, embedding) -> Optional[np.ndarray]:
+        """The embedding as a unit-length float32 vector, or None if it has zero norm."""
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        if not np.isfinite(norm) or norm == 0:
+            return None
+        return vector / norm
+
+    def _bucket_key(self, unit: np.ndarray) -> bytes:
+        """Packs the signs of the hyperplane projections into the bucket key."""
+        if self._planes is None or self._planes.shape[1] != unit.shape[0]:
+            self._planes = self._rng.standard_normal((self.n_planes, unit.shape[0])).astype(np.float32)
+            self.clear() # Keys from another dimension are meaningless
+        return np.packbits(self._planes @ unit > 0).tobytes()
+
+    def get(self, embedding, namespace: Hashable = None) -> Optional[Any]:
+        """
+        Returns the value cached for the most similar embedding in the same bucket and
+        namespace, or None if there is none at or above the threshold.
+
+        Args:
+            embedding: The query embedding.
+            namespace: Separates entries that must never match each other, e.g. results
+                       for different retrieval parameters.
+        """
+        unit = self._unit(embedding)
+        if unit is None or self._planes is None:
+            return None
+        candidates = self._buckets.get((namespace, self._bucket_key(unit)))
+        if not candidates:
+            return None
+        similarities = np.stack([cached for _, cached, _ in candidates]) @ unit
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            return None
+        entry_id, _, value = candidates[best]
+        self._lru.move_to_end(entry_id)
+        return value
+
+    def put(self, embedding, value: Any, namespace: Hashable = None):
+        """
+        Caches value for embedding, evicting the least recently used entry if the cache is
+        full. Zero-norm embeddings are not cached.
+        """
+        unit = self._unit(embedding)
+        if unit is None or self.max_entries <= 0:
+            return
+        key = (namespace, self._bucket_key(unit))
+        entry_id = next(self._ids)
+        self._buckets.setdefault(key, []).append((entry_id, unit, value))
+        self._lru[entry_id] = key
+        while len(self._lru) > self.max_entries:
+            evicted_id, evicted_key = self._lru.popitem(last=False)
+            remaining = [entry for entry in self._buckets[evicted_key] if entry[0] != evicted_id]
+            if remaining:
+                self._buckets[evicted_key] = remaining
+            else:
+                del self._buckets[evicted_key]
+
+    def clear(self):
+        """Removes all cached entries; the hyperplanes are kept."""
+        self._buckets.clear()
+        self._lru.clear()
+
+    def __len__(self) -> int:
+        return len(self._lru)
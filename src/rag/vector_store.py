@@ -1,9 +1,38 @@
 import faiss
 import numpy as np
+try:
+    # Patches FAISS index methods to also accept torch tensors; CUDA tensors are
+    # passed to GPU indexes without a device->host copy.
+    import faiss.contrib.torch_utils
+except ImportError:
+    pass
 import os
-from typing import List, Dict, Any, Optional
+import json
+from typing import List, Dict, Any, Optional, Union
 from ..config import settings # Assuming config is in src/
 
+def _as_float32_matrix(embeddings: Union[np.ndarray, List[List[float]]]) -> np.ndarray:
+    """
+    Converts embeddings to a C-contiguous float32 matrix without a float64 staging copy.
+    A no-op for arrays that are already contiguous float32.
+    """
+    if isinstance(embeddings, np.ndarray):
+        return np.ascontiguousarray(embeddings, dtype=np.float32)
+    out = np.empty((len(embeddings), len(embeddings[0])), dtype=np.float32)
+    for i, embedding in enumerate(embeddings):
+        out[i] = embedding
+    return out
+
+def _faiss_omp_threads() -> int:
+    """
+    Number of OpenMP threads FAISS should use. Defaults to the physical core count
+    (assuming 2-way SMT), since hyperthread siblings thrash the cache during the
+    memory-bound IVF list scan.
+    """
+    if settings.FAISS_OMP_THREADS > 0:
+        return settings.FAISS_OMP_THREADS
+    return max(1, (os.cpu_count() or 2) // 2)
+
 class VectorStore:
     """
     Manages the FAISS vector index for storing and searching document embeddings.
@@ -19,12 +48,22 @@ class VectorStore:
         """
         self.index_path = index_path
         self.index: Optional[faiss.Index] = None
+        faiss.omp_set_num_threads(_faiss_omp_threads())
         self.index_id_to_external_id: List[Any] = [] # Map FAISS internal ID to external ID (e.g., chunk ID)
         self.dimension = None # Dimension of the embeddings
+        # Number of clusters probed per search (trade-off between speed and accuracy).
+        # Applied to the index once, not on every search.
+        self._nprobe = int(settings.FAISS_NPROBE)
 
         os.makedirs(self.index_path, exist_ok=True)
         self._index_file = os.path.join(self.index_path, "faiss.index")
+        # The ID mapping is stored in exactly one of these, depending on the ID types:
+        # int IDs -> native int64 .npy, non-empty str IDs -> newline-separated UTF-8 .txt,
+        # anything else -> JSON. None of them require pickle to load. An id_map.npy written
+        # by older versions (object dtype, pickled) is still read once and rewritten.
         self._id_map_file = os.path.join(self.index_path, "id_map.npy")
+        self._id_map_txt_file = os.path.join(self.index_path, "id_map.txt")
+        self._id_map_json_file = os.path.join(self.index_path, "id_map.json")
 
         self.load() # Attempt to load existing index on initialization
 
@@ -34,45 +73,91 @@ class VectorStore:
         IndexIVFFlat is an inverted file index that uses a flat (L2) index for
         quantization. It requires a training step to cluster the data.
 
+        With settings.FAISS_USE_OPQ, an OPQ rotation followed by IVF-PQ is built
+        instead. The rotation is fit in the same train() call.
+
         Args:
             dimension: The dimension of the vectors to be stored.
         """
         if self.index is None:
+            if settings.FAISS_USE_OPQ:
+                m = settings.FAISS_PQ_M
+                if dimension % m != 0:
+                    raise ValueError(f"FAISS_PQ_M ({m}) must divide the embedding dimension ({dimension}) to use OPQ.")
+                self.dimension = dimension
+                factory_string = f"OPQ{m}_{dimension},IVF{settings.FAISS_NLIST},PQ{m}x{settings.FAISS_PQ_NBITS}"
+                self.index = faiss.index_factory(self.dimension, factory_string, faiss.METRIC_L2)
+                self.set_nprobe(self._nprobe)
+                print(f"Initialized new {factory_string} index with dimension {self.dimension}")
+                return
             self.dimension = dimension
             # Using IndexIVFFlat for faster search
             quantizer = faiss.IndexFlatL2(self.dimension)  # Quantizer is a simple L2 index
             self.index = faiss.IndexIVFFlat(quantizer, self.dimension, settings.FAISS_NLIST, faiss.METRIC_L2)
+            self.set_nprobe(self._nprobe)
             print(f"Initialized new IndexIVFFlat index with dimension {self.dimension} and nlist {settings.FAISS_NLIST}")
         elif self.dimension != dimension:
             raise ValueError(f"Attempted to initialize index with dimension {dimension}, but existing index has dimension {self.dimension}")
 
 
-    def train(self, embeddings: List[List[float]]) -> None:
+    def set_nprobe(self, nprobe: int) -> None:
+        """
+        Sets the number of IVF clusters probed per search. Higher values improve
+        recall at the cost of search speed.
+
+        Args:
+            nprobe: The number of clusters to probe.
+        """
+        self._nprobe = int(nprobe)
+        if self.index is not None:
+            # Reaches the IVF layer through any pre-transform (e.g. OPQ) wrapping it
+            faiss.extract_index_ivf(self.index).nprobe = self._nprobe
+
+    def train(self, embeddings: Union[np.ndarray, List[List[float]]]) -> None:
         """
         Trains the IndexIVFFlat index with a sample of the data.
         This is a required step before adding vectors to the index.
+
+        IVF k-means only needs ~39 points per centroid to converge, so at most
+        max(256, 39 * FAISS_NLIST) embeddings are sampled uniformly (with a fixed
+        seed, so training is reproducible) instead of training on all of them.
+        With OPQ enabled, the PQ codebooks' 2**FAISS_PQ_NBITS centroids are
+        accounted for as well.
         """
         if self.index is None:
             raise ValueError("Index not initialized. Call initialize_index first.")
 
-        embeddings_np = np.array(embeddings).astype('float32')
-        print("Training IndexIVFFlat...")
+        n_total = len(embeddings)
+        n_centroids = settings.FAISS_NLIST
+        if settings.FAISS_USE_OPQ:
+            n_centroids = max(n_centroids, 2 ** settings.FAISS_PQ_NBITS)
+        n_needed = min(n_total, max(256, 39 * n_centroids))
+        if n_needed < n_total:
+            rng = np.random.default_rng(0)
+            sample_ids = np.sort(rng.choice(n_total, n_needed, replace=False))
+            if isinstance(embeddings, np.ndarray):
+                embeddings = embeddings[sample_ids]
+            else:
+                embeddings = [embeddings[i] for i in sample_ids]
+
+        embeddings_np = np.asarray(embeddings, dtype=np.float32)
+        print(f"Training index on {len(embeddings_np)} of {n_total} embeddings...")
         self.index.train(embeddings_np)
-        print("IndexIVFFlat training complete.")
+        print("Index training complete.")
 
-    def add_embeddings(self, embeddings: List[List[float]], external_ids: List[Any]) -> None:
+    def add_embeddings(self, embeddings: Union[np.ndarray, List[List[float]]], external_ids: List[Any]) -> None:
         """
         Adds embeddings to the FAISS index and updates the ID mapping.
 
         Args:
-            embeddings: A list of embeddings (list of floats).
+            embeddings: A 2D float32 array, or a list of embeddings (list of floats).
             external_ids: A list of external identifiers corresponding to the embeddings.
                           Must be the same length as embeddings.
         """
-        if not embeddings:
+        if len(embeddings) == 0:
             return
 
-        embeddings_np = np.array(embeddings).astype('float32')
+        embeddings_np = _as_float32_matrix(embeddings)
 
         if self.dimension is None:
             self.initialize_index(embeddings_np.shape[1])
@@ -82,7 +167,7 @@ class VectorStore:
 
         if not self.index.is_trained:
             print("Index is not trained yet. Training now with a sample of the embeddings...")
-            self.train(embeddings) # Train with a sample of the embeddings
+            self.train(embeddings_np) # Train with a sample of the embeddings
 
         # Add vectors to the index
         self.index.add(embeddings_np)
@@ -93,12 +178,12 @@ class VectorStore:
         print(f"Added {len(embeddings)} embeddings to the index.")
 
 
-    def search(self, query_embedding: List[float], k: int = 5) -> List[Dict[str, Any]]:
+    def search(self, query_embedding: Union[np.ndarray, List[float]], k: int = 5) -> List[Dict[str, Any]]:
         """
         Performs a similarity search on the FAISS index.
 
         Args:
-            query_embedding: The embedding of the query.
+            query_embedding: The embedding of the query (1D array or list of floats).
             k: The number of nearest neighbors to retrieve.
 
         Returns:
@@ -109,24 +194,61 @@ class VectorStore:
             print("Index is empty. Cannot perform search.")
             return []
 
-        query_embedding_np = np.array([query_embedding]).astype('float32')
+        # A float32 row from EmbeddingModel passes through as a view, without a copy
+        query_embedding_np = np.asarray(query_embedding, dtype=np.float32).reshape(1, -1)
 
         if self.dimension != query_embedding_np.shape[1]:
              raise ValueError(f"Query embedding dimension mismatch. Expected {self.dimension}, got {query_embedding_np.shape[1]}")
 
 
-        # Set the number of probes (trade-off between speed and accuracy)
-        self.index.nprobe = settings.FAISS_NPROBE
-
         # Perform the search
         distances, indices = self.index.search(query_embedding_np, k)
 
-        results: List[Dict[str, Any]] = []
         # indices[0] contains the indices of the k nearest neighbors for the first query
         # distances[0] contains the distances for the k nearest neighbors
-        for i in range(len(indices[0])):
-            faiss_index_id = indices[0][i]
-            distance = distances[0][i]
+        return self._build_results(distances[0], indices[0])
+
+    def search_torch(self, query, k: int = 5) -> List[List[Dict[str, Any]]]:
+        """
+        Performs a batched similarity search with a torch tensor of query embeddings.
+
+        On a GPU index, a float32 CUDA tensor is searched in place with no PCIe
+        round-trip (requires faiss.contrib.torch_utils, which only supports
+        single-GPU indexes). On a CPU index the tensor is moved to the host first.
+
+        Args:
+            query: A torch tensor of shape (n, d) or (d,).
+            k: The number of nearest neighbors to retrieve per query.
+
+        Returns:
+            One result list per query, in the same format as `search`.
+        """
+        if self.index is None or self.index.ntotal == 0:
+            print("Index is empty. Cannot perform search.")
+            return []
+
+        if query.dim() == 1:
+            query = query.unsqueeze(0)
+        if self.dimension != query.shape[1]:
+             raise ValueError(f"Query embedding dimension mismatch. Expected {self.dimension}, got {query.shape[1]}")
+
+        # GPU indexes expose getDevice(); anything else has to be searched from host memory
+        if query.is_cuda and not hasattr(self.index, "getDevice"):
+            query = query.cpu()
+        query = query.float().contiguous()
+
+        distances, indices = self.index.search(query, k)
+        distances = distances.cpu().numpy()
+        indices = indices.cpu().numpy()
+
+        return [self._build_results(distances[row], indices[row]) for row in range(len(indices))]
+
+    def _build_results(self, distances: np.ndarray, indices: np.ndarray) -> List[Dict[str, Any]]:
+        """Maps one row of FAISS search output to external IDs."""
+        results: List[Dict[str, Any]] = []
+        for i in range(len(indices)):
+            faiss_index_id = indices[i]
+            distance = distances[i]
 
             # Ensure the FAISS index ID is valid and within the bounds of our mapping
             if 0 <= faiss_index_id < len(self.index_id_to_external_id):
@@ -139,7 +261,6 @@ class VectorStore:
             else:
                 print(f"Warning: FAISS index ID {faiss_index_id} out of bounds for ID mapping.")
 
-
         return results
 
     def save(self):
@@ -148,20 +269,66 @@ class VectorStore:
         """
         if self.index is not None:
             faiss.write_index(self.index, self._index_file) # Save trained index
-            np.save(self._id_map_file, np.array(self.index_id_to_external_id, dtype=object))  # Use dtype=object for mixed types
+            self._save_id_map()
             print(f"FAISS index and ID mapping saved to {self.index_path}")
         else:
             print("No index to save.")
 
+    def _save_id_map(self) -> None:
+        """Writes the ID mapping in the cheapest pickle-free format its ID types allow."""
+        ids = self.index_id_to_external_id
+        if all(isinstance(i, (int, np.integer)) and not isinstance(i, bool) for i in ids):
+            target = self._id_map_file
+            np.save(target, np.asarray(ids, dtype=np.int64))
+        elif all(isinstance(i, str) and i and "\n" not in i for i in ids):
+            # Empty strings are left to JSON: [""] and [] would both be written as an empty file
+            target = self._id_map_txt_file
+            with open(target, "w", encoding="utf-8") as f:
+                f.write("\n".join(ids))
+        else:
+            target = self._id_map_json_file
+            with open(target, "w", encoding="utf-8") as f:
+                # json cannot encode numpy integers, which can be mixed in with str IDs
+                json.dump([int(i) if isinstance(i, np.integer) else i for i in ids], f)
+
+        # Remove mappings left over from a previous save in another format
+        for path in (self._id_map_file, self._id_map_txt_file, self._id_map_json_file):
+            if path != target and os.path.exists(path):
+                os.remove(path)
+
+    def _load_id_map(self) -> List[Any]:
+        """Reads the ID mapping written by _save_id_map."""
+        if os.path.exists(self._id_map_txt_file):
+            with open(self._id_map_txt_file, "r", encoding="utf-8") as f:
+                content = f.read()
+            return content.split("\n") if content else []
+        if os.path.exists(self._id_map_json_file):
+            with open(self._id_map_json_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        try:
+            return np.load(self._id_map_file, allow_pickle=False).tolist()
+        except ValueError:
+            # An object-dtype id_map.npy from before the pickle-free formats. Read it this once
+            # and rewrite it in the current format, so the indexed corpus is not lost.
+            print(f"Warning: {self._id_map_file} uses the legacy pickled format; converting it.")
+            ids = np.load(self._id_map_file, allow_pickle=True).tolist()
+            self.index_id_to_external_id = ids
+            self._save_id_map()
+            return ids
+
+    def _id_map_exists(self) -> bool:
+        return any(os.path.exists(path) for path in (self._id_map_file, self._id_map_txt_file, self._id_map_json_file))
+
     def load(self):
         """
         Loads the FAISS index and the ID mapping from disk.
         """
-        if os.path.exists(self._index_file) and os.path.exists(self._id_map_file):
+        if os.path.exists(self._index_file) and self._id_map_exists():
             try:
                 self.index = faiss.read_index(self._index_file)  # Load trained index
-                self.index_id_to_external_id = np.load(self._id_map_file, allow_pickle=True).tolist()
+                self.index_id_to_external_id = self._load_id_map()
                 self.dimension = self.index.d
+                self.set_nprobe(self._nprobe)
                 print(f"FAISS index and ID mapping loaded from {self.index_path}")
             except Exception as e:
                 print(f"Error loading FAISS index or ID mapping: {e}")
@@ -3,65 +3,144 @@ Document Comparison Utility
 Provides functions to compare two .docx documents and report differences
 in text content and basic formatting.
 """
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from docx import Document
+from docx.oxml.ns import qn
 from docx.text.paragraph import Paragraph
 from docx.text.run import Run
 import difflib
 
-def compare_run_formatting(run1: Run, run2: Run) -> List[str]:
-    """Compares basic formatting of two runs."""
+# Resolved once so the hot comparison loop doesn't re-run the namespace lookup.
+_W_P = qn('w:p')
+_W_R = qn('w:r')
+_W_HYPERLINK = qn('w:hyperlink')
+_W_B = qn('w:b')
+_W_I = qn('w:i')
+_W_RFONTS = qn('w:rFonts')
+_W_ASCII = qn('w:ascii')
+_W_SZ = qn('w:sz')
+_W_VAL = qn('w:val')
+
+RunFormat = Tuple[Optional[bool], Optional[bool], Optional[str], Optional[float]]
+# (run text, w:r element)
+RunParts = List[Tuple[str, Any]]
+
+def _on_off(element) -> Optional[bool]:
+    """Reads a w:b/w:i style toggle the same way python-docx does (absent -> None)."""
+    if element is None:
+        return None
+    val = element.get(_W_VAL)
+    return val is None or val in ("1", "true", "on")
+
+def _r_format_tuple(r) -> RunFormat:
+    """Returns (bold, italic, font_name, font_size_pt) read directly from a w:r element's w:rPr."""
+    rPr = r.rPr
+    if rPr is None:
+        return (None, None, None, None)
+    rFonts = rPr.find(_W_RFONTS)
+    sz = rPr.find(_W_SZ)
+    font_name = rFonts.get(_W_ASCII) if rFonts is not None else None
+    sz_val = sz.get(_W_VAL) if sz is not None else None
+    # w:sz is stored in half-points
+    font_size = int(sz_val) / 2 if sz_val is not None else None
+    return (_on_off(rPr.find(_W_B)), _on_off(rPr.find(_W_I)), font_name, font_size)
+
+def _run_format_tuple(run: Run) -> RunFormat:
+    """
+    Returns (bold, italic, font_name, font_size_pt) for a run in a single pass
+    over its w:rPr element, bypassing the python-docx font descriptors.
+    """
+    return _r_format_tuple(run._element)
+
+def _format_diffs(fmt1: RunFormat, fmt2: RunFormat) -> List[str]:
+    """Describes the differences between two run format tuples."""
+    if fmt1 == fmt2:
+        return []
+
+    bold1, italic1, name1, size1 = fmt1
+    bold2, italic2, name2, size2 = fmt2
     diffs = []
-    if run1.bold != run2.bold:
-        diffs.append(f"Bold: {run1.bold} -> {run2.bold}")
-    if run1.italic != run2.italic:
-        diffs.append(f"Italic: {run1.italic} -> {run2.italic}")
-    if (run1.font.name or "") != (run2.font.name or ""): # Handle None case
-        diffs.append(f"Font Name: '{run1.font.name}' -> '{run2.font.name}'")
-    r1_size = run1.font.size.pt if run1.font.size else None
-    r2_size = run2.font.size.pt if run2.font.size else None
-    if r1_size != r2_size:
-        diffs.append(f"Font Size: {r1_size}pt -> {r2_size}pt")
+    if bold1 != bold2:
+        diffs.append(f"Bold: {bold1} -> {bold2}")
+    if italic1 != italic2:
+        diffs.append(f"Italic: {italic1} -> {italic2}")
+    if (name1 or "") != (name2 or ""): # Handle None case
+        diffs.append(f"Font Name: '{name1}' -> '{name2}'")
+    if size1 != size2:
+        diffs.append(f"Font Size: {size1}pt -> {size2}pt")
     return diffs
 
-def compare_paragraphs(para1: Paragraph, para2: Paragraph) -> List[str]:
-    """Compares two paragraphs run by run."""
+def compare_run_formatting(run1: Run, run2: Run) -> List[str]:
+    """Compares basic formatting of two runs."""
+    return _format_diffs(_run_format_tuple(run1), _run_format_tuple(run2))
+
+def _paragraph_parts(p) -> Tuple[str, RunParts]:
+    """
+    Extracts a paragraph's text and its direct runs from a w:p element in one pass
+    over its children. Hyperlink text counts towards the paragraph text but, as
+    with python-docx's Paragraph.runs, hyperlink runs are not listed.
+    """
+    texts: List[str] = []
+    runs: RunParts = []
+    for child in p.iterchildren(_W_R, _W_HYPERLINK):
+        text = child.text
+        texts.append(text)
+        if child.tag == _W_R:
+            runs.append((text, child))
+    return "".join(texts), runs
+
+def _document_paragraphs(doc) -> List[Tuple[str, RunParts]]:
+    """Extracts the body-level paragraphs of a document, matching doc.paragraphs."""
+    return [_paragraph_parts(p) for p in doc.element.body.iterchildren(_W_P)]
+
+def _compare_paragraph_parts(text1: str, runs1: RunParts, text2: str, runs2: RunParts) -> List[str]:
+    """Compares two extracted paragraphs run by run."""
     paragraph_diffs = []
     # Simple text comparison for the whole paragraph first
-    if para1.text != para2.text:
+    if text1 != text2:
         # Use difflib for a more granular text diff
         d = difflib.Differ()
-        text_diff = list(d.compare(para1.text.splitlines(keepends=True),
-                                   para2.text.splitlines(keepends=True)))
+        text_diff = list(d.compare(text1.splitlines(keepends=True),
+                                   text2.splitlines(keepends=True)))
         filtered_diff = [line for line in text_diff if line.startswith(('+ ', '- ', '? '))]
         if filtered_diff:
             paragraph_diffs.append("Text content differs:")
             paragraph_diffs.extend([f"  {line.rstrip()}" for line in filtered_diff])
 
-    # Run-by-run comparison for formatting
-    runs1 = para1.runs
-    runs2 = para2.runs
-    max_runs = max(len(runs1), len(runs2))
-
-    for i in range(max_runs):
-        run_diffs = []
-        if i < len(runs1) and i < len(runs2):
-            run1 = runs1[i]
-            run2 = runs2[i]
-            if run1.text != run2.text:
-                run_diffs.append(f"Run text: '{run1.text}' -> '{run2.text}'")
-            formatting_diffs = compare_run_formatting(run1, run2)
-            run_diffs.extend(formatting_diffs)
-        elif i < len(runs1):
-            run_diffs.append(f"Extra run in original: '{runs1[i].text}'")
-        else: # i < len(runs2)
-            run_diffs.append(f"Extra run in modified: '{runs2[i].text}'")
-
-        if run_diffs:
-            paragraph_diffs.append(f"  Run {i+1}:")
-            paragraph_diffs.extend([f"    - {d}" for d in run_diffs])
+    # Run-by-run comparison for formatting. Runs are aligned on a (text, format)
+    # fingerprint so that identical runs match with a single tuple compare and an
+    # inserted/removed run doesn't shift every later run out of position.
+    fingerprints1 = [(text, _r_format_tuple(r)) for text, r in runs1]
+    fingerprints2 = [(text, _r_format_tuple(r)) for text, r in runs2]
+    matcher = difflib.SequenceMatcher(None, fingerprints1, fingerprints2, autojunk=False)
+
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            continue
+        # Pair up runs positionally within a replaced block; leftovers are extra runs
+        paired = min(i2 - i1, j2 - j1) if tag == 'replace' else 0
+        for offset in range(paired):
+            (run1_text, fmt1), (run2_text, fmt2) = fingerprints1[i1 + offset], fingerprints2[j1 + offset]
+            run_diffs = []
+            if run1_text != run2_text:
+                run_diffs.append(f"Run text: '{run1_text}' -> '{run2_text}'")
+            run_diffs.extend(_format_diffs(fmt1, fmt2))
+            _append_run_diffs(paragraph_diffs, i1 + offset, run_diffs)
+        for i in range(i1 + paired, i2):
+            _append_run_diffs(paragraph_diffs, i, [f"Extra run in original: '{runs1[i][0]}'"])
+        for j in range(j1 + paired, j2):
+            _append_run_diffs(paragraph_diffs, j, [f"Extra run in modified: '{runs2[j][0]}'"])
     return paragraph_diffs
 
+def _append_run_diffs(paragraph_diffs: List[str], run_index: int, run_diffs: List[str]) -> None:
+    if run_diffs:
+        paragraph_diffs.append(f"  Run {run_index+1}:")
+        paragraph_diffs.extend([f"    - {d}" for d in run_diffs])
+
+def compare_paragraphs(para1: Paragraph, para2: Paragraph) -> List[str]:
+    """Compares two paragraphs run by run."""
+    return _compare_paragraph_parts(*_paragraph_parts(para1._p), *_paragraph_parts(para2._p))
+
 
 def compare_documents(original_path: str, modified_path: str) -> List[str]:
     """
@@ -75,8 +154,10 @@ def compare_documents(original_path: str, modified_path: str) -> List[str]:
         return [f"Error opening documents: {e}"]
 
     differences: List[str] = []
-    paragraphs1 = doc1.paragraphs
-    paragraphs2 = doc2.paragraphs
+    # Extract text and runs straight from w:body rather than building Paragraph/Run
+    # wrappers and recomputing .text on every access.
+    paragraphs1 = _document_paragraphs(doc1)
+    paragraphs2 = _document_paragraphs(doc2)
     max_paras = max(len(paragraphs1), len(paragraphs2))
 
     differences.append(f"Comparing '{original_path}' and '{modified_path}'")
@@ -85,14 +166,14 @@ def compare_documents(original_path: str, modified_path: str) -> List[str]:
     for i in range(max_paras):
         para_diff_details = []
         if i < len(paragraphs1) and i < len(paragraphs2):
-            para_diff_details = compare_paragraphs(paragraphs1[i], paragraphs2[i])
+            para_diff_details = _compare_paragraph_parts(*paragraphs1[i], *paragraphs2[i])
             if para_diff_details:
                 differences.append(f"Paragraph {i+1}:")
                 differences.extend(para_diff_details)
         elif i < len(paragraphs1):
-            differences.append(f"Paragraph {i+1}: Extra in original: \"{paragraphs1[i].text[:100]}...\"")
+            differences.append(f"Paragraph {i+1}: Extra in original: \"{paragraphs1[i][0][:100]}...\"")
         else: # i < len(paragraphs2)
-            differences.append(f"Paragraph {i+1}: Extra in modified: \"{paragraphs2[i].text[:100]}...\"")
+            differences.append(f"Paragraph {i+1}: Extra in modified: \"{paragraphs2[i][0][:100]}...\"")
 
     if not any(d for d in differences if not d.startswith("Comparing") and not d.startswith("---")):
         differences.append("No differences found.")
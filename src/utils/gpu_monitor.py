@@ -1,12 +1,85 @@
+import atexit
+import functools
 import torch
 import time
 
+try:
+    # nvidia-ml-py: queries the driver directly and reports device-wide usage,
+    # including memory held by other processes.
+    import pynvml
+except ImportError:
+    pynvml = None
+
+_GB = 1024**3
+
+@functools.lru_cache(maxsize=1)
+def _nvml_available() -> bool:
+    """Initializes NVML once per process; False if pynvml is missing or init fails."""
+    if pynvml is None:
+        return False
+    try:
+        pynvml.nvmlInit()
+    except Exception as e:
+        print(f"NVML initialization failed, falling back to torch.cuda: {e}")
+        return False
+    atexit.register(pynvml.nvmlShutdown)
+    return True
+
+@functools.lru_cache(maxsize=1)
+def _cuda_available() -> bool:
+    """Checks CUDA availability once; the first call lazily initializes CUDA."""
+    return torch.cuda.is_available()
+
+def _device_count() -> int:
+    if _nvml_available():
+        return pynvml.nvmlDeviceGetCount()
+    return torch.cuda.device_count()
+
+@functools.lru_cache(maxsize=16)
+def _nvml_handle(device_id: int):
+    return pynvml.nvmlDeviceGetHandleByIndex(device_id)
+
+@functools.lru_cache(maxsize=16)
+def _device_name(device_id: int) -> str:
+    """Device names are fixed per device, so only query the driver once."""
+    if _nvml_available():
+        name = pynvml.nvmlDeviceGetName(_nvml_handle(device_id))
+        # Older pynvml releases return bytes
+        return name.decode() if isinstance(name, bytes) else name
+    return torch.cuda.get_device_name(device_id)
+
+@functools.lru_cache(maxsize=16)
+def _total_memory(device_id: int) -> int:
+    """Total device memory (bytes) is fixed per device, so only query the driver once."""
+    return torch.cuda.get_device_properties(device_id).total_memory
+
+def _device_memory_info(device_id: int) -> tuple:
+    """Returns device-wide (free, total) memory in bytes with a single driver call."""
+    if _nvml_available():
+        info = pynvml.nvmlDeviceGetMemoryInfo(_nvml_handle(device_id))
+        return info.free, info.total
+    return torch.cuda.mem_get_info(device_id)
+
+def _torch_memory(device_id: int) -> tuple:
+    """
+    Returns this process's PyTorch (allocated, reserved) memory in bytes, or (0, 0) if
+    torch cannot see the device. torch numbers devices after CUDA_VISIBLE_DEVICES is
+    applied, so an NVML index beyond torch.cuda.device_count() has no torch counterpart.
+    """
+    if not _cuda_available() or device_id >= torch.cuda.device_count():
+        return 0, 0
+    return torch.cuda.memory_allocated(device_id), torch.cuda.memory_reserved(device_id)
+
 def get_gpu_memory_usage(device_id: int = 0) -> dict:
     """
     Retrieves the current GPU memory usage for a specific device.
+    Uses NVML (pynvml) when available, which reports device-wide usage across
+    all processes; otherwise falls back to PyTorch's caching allocator stats.
 
     Args:
-        device_id: The ID of the GPU device to check. Defaults to 0.
+        device_id: The ID of the GPU device to check. Defaults to 0. With NVML this is
+                   an NVML index, which ignores CUDA_VISIBLE_DEVICES; PyTorch's allocated
+                   and reserved figures are reported as 0 when torch cannot see it.
 
     Returns:
         A dictionary containing memory usage details:
@@ -18,27 +91,46 @@ def get_gpu_memory_usage(device_id: int = 0) -> dict:
             "free_memory_gb": float,
             "usage_percent": float
         }
-        Returns an empty dictionary if CUDA is not available or the device ID is invalid.
+        With NVML, "used_memory_gb" and "gpu_utilization_percent" are also included
+        and "usage_percent" is based on device-wide used memory.
+        Returns an empty dictionary if no GPU is available or the device ID is invalid.
     """
-    if not torch.cuda.is_available():
+    if not _nvml_available() and not _cuda_available():
         print("CUDA is not available. Cannot monitor GPU memory.")
         return {}
 
-    if device_id >= torch.cuda.device_count():
-        print(f"Error: Invalid device ID {device_id}. Available devices: {torch.cuda.device_count()}")
+    device_count = _device_count()
+    if device_id >= device_count:
+        print(f"Error: Invalid device ID {device_id}. Available devices: {device_count}")
         return {}
 
     try:
-        device_name = torch.cuda.get_device_name(device_id)
-        total_memory = torch.cuda.get_device_properties(device_id).total_memory
-        allocated_memory = torch.cuda.memory_allocated(device_id)
-        reserved_memory = torch.cuda.memory_reserved(device_id) # PyTorch's cache
-
-        total_memory_gb = total_memory / (1024**3)
-        allocated_memory_gb = allocated_memory / (1024**3)
-        reserved_memory_gb = reserved_memory / (1024**3)
+        device_name = _device_name(device_id)
+        allocated_memory, reserved_memory = _torch_memory(device_id) # PyTorch's cache
+
+        if _nvml_available():
+            handle = _nvml_handle(device_id)
+            info = pynvml.nvmlDeviceGetMemoryInfo(handle)
+            utilization = pynvml.nvmlDeviceGetUtilizationRates(handle)
+            total_memory = info.total
+            usage_percent = (info.used / total_memory) * 100 if total_memory > 0 else 0
+            return {
+                "device_name": device_name,
+                "total_memory_gb": round(total_memory / _GB, 2),
+                "used_memory_gb": round(info.used / _GB, 2),
+                "allocated_memory_gb": round(allocated_memory / _GB, 2),
+                "reserved_memory_gb": round(reserved_memory / _GB, 2),
+                "free_memory_gb": round(info.free / _GB, 2),
+                "usage_percent": round(usage_percent, 1),
+                "gpu_utilization_percent": float(utilization.gpu),
+            }
+
+        total_memory = _total_memory(device_id)
+        total_memory_gb = total_memory / _GB
+        allocated_memory_gb = allocated_memory / _GB
+        reserved_memory_gb = reserved_memory / _GB
         # Free memory calculation can be tricky; using total - reserved as an estimate
-        free_memory_gb = (total_memory - reserved_memory) / (1024**3)
+        free_memory_gb = (total_memory - reserved_memory) / _GB
         usage_percent = (reserved_memory / total_memory) * 100 if total_memory > 0 else 0
 
         return {
@@ -59,23 +151,34 @@ def monitor_gpu_memory(interval_seconds: int = 5, device_id: int = 0):
 
     Args:
         interval_seconds: The time interval (in seconds) between checks.
-        device_id: The ID of the GPU device to monitor.
+        device_id: The ID of the GPU device to monitor (an NVML index when NVML is used).
     """
-    if not torch.cuda.is_available():
+    if not _nvml_available() and not _cuda_available():
         print("CUDA not available. Exiting GPU monitor.")
         return
 
+    device_count = _device_count()
+    if device_id >= device_count:
+        print(f"Error: Invalid device ID {device_id}. Available devices: {device_count}")
+        return
+
+    device_name = _device_name(device_id)
+
     print(f"Starting GPU memory monitor for device {device_id} (refresh every {interval_seconds}s)... Press Ctrl+C to stop.")
     try:
         while True:
-            usage = get_gpu_memory_usage(device_id)
-            if usage:
-                print(f"[{time.strftime('%H:%M:%S')}] GPU {device_id} ({usage['device_name']}): "
-                      f"Used: {usage['reserved_memory_gb']:.2f}/{usage['total_memory_gb']:.2f} GB "
-                      f"({usage['usage_percent']:.1f}%) | "
-                      f"Allocated: {usage['allocated_memory_gb']:.2f} GB")
-            else:
+            try:
+                free_memory, total_memory = _device_memory_info(device_id)
+                allocated_memory, _ = _torch_memory(device_id)
+            except Exception:
                 print(f"[{time.strftime('%H:%M:%S')}] Could not retrieve GPU info.")
+            else:
+                used_memory = total_memory - free_memory
+                usage_percent = (used_memory / total_memory) * 100 if total_memory > 0 else 0
+                print(f"[{time.strftime('%H:%M:%S')}] GPU {device_id} ({device_name}): "
+                      f"Used: {used_memory / _GB:.2f}/{total_memory / _GB:.2f} GB "
+                      f"({usage_percent:.1f}%) | "
+                      f"Allocated: {allocated_memory / _GB:.2f} GB")
             time.sleep(interval_seconds)
     except KeyboardInterrupt:
         print("\nStopping GPU memory monitor.")
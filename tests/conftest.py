@@ -0,0 +1,82 @@
+import io
+import os
+import pytest
+
+def pytest_addoption(parser):
+    parser.addoption("--run-slow", action="store_true", default=False,
+                     help="also run tests marked slow (full PDF/PPTX/DOCX parsing)")
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: parses real documents; skipped unless --run-slow is given")
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-slow"):
+        return
+    skip_slow = pytest.mark.skip(reason="slow test; pass --run-slow to run it")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+# Pre-generated dummy documents; rebuild them with tests/fixtures/make_dummy_docs.py
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+@pytest.fixture(scope="session")
+def dummy_docs():
+    """
+    Paths of the dummy DOCX/PDF/PPTX/TXT inputs shared by the processor and pipeline
+    tests, keyed by type. The files are committed under tests/fixtures and only ever
+    read, so building them needs no document libraries at test time.
+    """
+    return {
+        "docx": os.path.join(FIXTURES_DIR, "dummy.docx"),
+        "pdf": os.path.join(FIXTURES_DIR, "dummy.pdf"),
+        "pptx": os.path.join(FIXTURES_DIR, "dummy.pptx"),
+        "txt": os.path.join(FIXTURES_DIR, "dummy.txt"),
+        "empty_txt": os.path.join(FIXTURES_DIR, "dummy_empty.txt"),
+    }
+
+@pytest.fixture(scope="session")
+def retrieval_test_data(tmp_path_factory):
+    """
+    Scratch vector DB/metadata DB locations plus a small dummy DOCX for retrieval
+    tests, created once per session (per worker under xdist) in a pytest temp dir.
+    """
+    base = tmp_path_factory.mktemp("retrieval")
+    paths = {
+        "vector_db": str(base / "vector_db"),
+        "metadata_db": str(base / "metadata.db"),
+        "documents": str(base / "documents"),
+        "docx": str(base / "documents" / "dummy_retrieval_test.docx"),
+    }
+    os.makedirs(paths["vector_db"], exist_ok=True)
+    os.makedirs(paths["documents"], exist_ok=True)
+    if not os.path.exists(paths["docx"]):
+        DocxDocument = pytest.importorskip("docx").Document
+        doc = DocxDocument()
+        doc.add_paragraph("This is a test document for RAG retrieval.")
+        doc.add_paragraph("It has a second paragraph about keyword matching.")
+        doc.save(paths["docx"])
+    return paths
+
+@pytest.fixture(scope="session")
+def existing_docx_bytes():
+    """
+    A small formatted sample DOCX, serialized once per session: a bold, centered Arial
+    12pt paragraph "Hello, existing world!" followed by "This is the second paragraph.".
+    Wrap it in io.BytesIO to load a private copy.
+    """
+    docx = pytest.importorskip("docx")
+    from docx.shared import Pt
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    doc = docx.Document()
+    p1 = doc.add_paragraph()
+    run1 = p1.add_run("Hello, existing world!")
+    run1.bold = True
+    run1.font.name = 'Arial'
+    run1.font.size = Pt(12)
+    p1.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    doc.add_paragraph("This is the second paragraph.")
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
@@ -0,0 +1,55 @@
+"""
+Regenerates the dummy documents in this directory that the processor and pipeline
+tests read through the dummy_docs fixture in tests/conftest.py.
+
+Run from the repository root: python tests/fixtures/make_dummy_docs.py
+"""
+import os
+
+import fitz # PyMuPDF
+from docx import Document as DocxDocument
+from pptx import Presentation as PptxPresentation
+
+FIXTURES_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def main():
+    # Dummy docx: a paragraph with templated bold/italic runs, then plain paragraphs
+    doc = DocxDocument()
+    paragraph = doc.add_paragraph("This is a test paragraph in a docx file with ")
+    run = paragraph.add_run("{{ bold }}")
+    run.bold = True
+    paragraph.add_run(" bold text and ")
+    run = paragraph.add_run("{{ italic }}")
+    run.italic = True
+    paragraph.add_run(" italic text.")
+    doc.add_paragraph("This is the first paragraph for parsing and chunking.")
+    doc.add_paragraph("This is the second paragraph, which is a bit longer to test chunking boundaries.")
+    doc.add_paragraph("Third paragraph.")
+    doc.save(os.path.join(FIXTURES_DIR, "dummy.docx"))
+
+    # Dummy pdf
+    pdf = fitz.open()
+    page = pdf.new_page()
+    page.insert_text((10, 50), "This is a test page in a pdf file.")
+    pdf.save(os.path.join(FIXTURES_DIR, "dummy.pdf"))
+    pdf.close()
+
+    # Dummy pptx
+    prs = PptxPresentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[0])
+    slide.shapes.title.text = "Test Presentation for Parsing"
+    slide.shapes.placeholders[1].text_frame.text = "This is the body text on the first slide."
+    prs.save(os.path.join(FIXTURES_DIR, "dummy.pptx"))
+
+    # Dummy txt and an empty txt
+    with open(os.path.join(FIXTURES_DIR, "dummy.txt"), "w") as f:
+        f.write("This is a plain text file for parsing and chunking.\n")
+        f.write("It has multiple lines.\n")
+        f.write("And a third line.")
+    with open(os.path.join(FIXTURES_DIR, "dummy_empty.txt"), "w") as f:
+        f.write("")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 # tests/test_change_detector.py
 import unittest
 import os
+import shutil
+import tempfile
 from docx import Document as DocxDocument
 
 from src.editing.change_detector import ChangeDetector
@@ -9,19 +11,17 @@ from src.editing.change_model import ChangeType, LocationParagraph
 class TestChangeDetector(unittest.TestCase):
     """Unit tests for the ChangeDetector class."""
 
-    TEST_DOC_DIR = "test_detector_docs"
-    ORIG_DOC_PATH = os.path.join(TEST_DOC_DIR, "original.docx")
-    MOD_DOC_PATH_IDENTICAL = os.path.join(TEST_DOC_DIR, "modified_identical.docx")
-    MOD_DOC_PATH_TEXT_CHANGE = os.path.join(TEST_DOC_DIR, "modified_text_change.docx")
-    MOD_DOC_PATH_PARA_ADDED = os.path.join(TEST_DOC_DIR, "modified_para_added.docx")
-    MOD_DOC_PATH_PARA_DELETED = os.path.join(TEST_DOC_DIR, "modified_para_deleted.docx")
-    MOD_DOC_PATH_MIXED = os.path.join(TEST_DOC_DIR, "modified_mixed.docx")
-
     @classmethod
     def setUpClass(cls):
         """Set up test directory and sample documents."""
-        if not os.path.exists(cls.TEST_DOC_DIR):
-            os.makedirs(cls.TEST_DOC_DIR)
+        # A private temp dir per process, so parallel workers (pytest-xdist) never share files
+        cls.TEST_DOC_DIR = tempfile.mkdtemp(prefix="test_detector_docs_")
+        cls.ORIG_DOC_PATH = os.path.join(cls.TEST_DOC_DIR, "original.docx")
+        cls.MOD_DOC_PATH_IDENTICAL = os.path.join(cls.TEST_DOC_DIR, "modified_identical.docx")
+        cls.MOD_DOC_PATH_TEXT_CHANGE = os.path.join(cls.TEST_DOC_DIR, "modified_text_change.docx")
+        cls.MOD_DOC_PATH_PARA_ADDED = os.path.join(cls.TEST_DOC_DIR, "modified_para_added.docx")
+        cls.MOD_DOC_PATH_PARA_DELETED = os.path.join(cls.TEST_DOC_DIR, "modified_para_deleted.docx")
+        cls.MOD_DOC_PATH_MIXED = os.path.join(cls.TEST_DOC_DIR, "modified_mixed.docx")
 
         # Create original document
         doc_orig = DocxDocument()
@@ -77,16 +77,7 @@ class TestChangeDetector(unittest.TestCase):
     @classmethod
     def tearDownClass(cls):
         """Clean up test files and directory."""
-        for path in [
-            cls.ORIG_DOC_PATH, cls.MOD_DOC_PATH_IDENTICAL, 
-            cls.MOD_DOC_PATH_TEXT_CHANGE, cls.MOD_DOC_PATH_PARA_ADDED,
-            cls.MOD_DOC_PATH_PARA_DELETED, cls.MOD_DOC_PATH_MIXED
-        ]:
-            if os.path.exists(path):
-                os.remove(path)
-        if os.path.exists(cls.TEST_DOC_DIR):
-            if not os.listdir(cls.TEST_DOC_DIR): # Only remove if empty
-                os.rmdir(cls.TEST_DOC_DIR)
+        shutil.rmtree(cls.TEST_DOC_DIR, ignore_errors=True)
 
     def test_01_identical_documents(self):
         """Test with two identical documents, expecting no changes."""
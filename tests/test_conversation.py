@@ -1,55 +1,53 @@
 import pytest
-import os
 import sqlite3
 import json
+import uuid
 from datetime import datetime
 
 # Assuming ConversationManager is in src/rag/conversation.py
 from src.rag.conversation import ConversationManager
 from src.config import settings # To get the base metadata directory
 
-# Define path for the temporary test database
-TEST_METADATA_DIR = "tests/temp_conversation_test_data"
-TEST_DB_PATH = os.path.join(TEST_METADATA_DIR, "test_conversation.db")
-
-@pytest.fixture(scope="function", autouse=True)
-def setup_and_teardown_database():
+@pytest.fixture(scope="session")
+def db_path():
     """
-    Fixture to create and remove a temporary database for each test function.
+    URI of an in-memory database shared by the whole test session, so no test touches
+    the disk. The uniquely named shared-cache database lives as long as one connection
+    to it is open, so the fixture holds a connection until the session ends.
     """
-    os.makedirs(TEST_METADATA_DIR, exist_ok=True)
-    # Ensure the database file does not exist before the test
-    if os.path.exists(TEST_DB_PATH):
-        os.remove(TEST_DB_PATH)
+    uri = f"file:conv_{uuid.uuid4().hex}?mode=memory&cache=shared"
+    keepalive = sqlite3.connect(uri, uri=True)
+    yield uri
+    keepalive.close()
 
-    yield # This is where the test function runs
+@pytest.fixture(scope="session")
+def manager(db_path):
+    """
+    One ConversationManager for the session, so the schema is created once. Tests
+    are isolated by their session_id rather than by database.
+    """
+    return ConversationManager(db_path=db_path)
 
-    # Teardown: remove the database file and directory
-    if os.path.exists(TEST_DB_PATH):
-        os.remove(TEST_DB_PATH)
-    if os.path.exists(TEST_METADATA_DIR) and not os.listdir(TEST_METADATA_DIR):
-         os.rmdir(TEST_METADATA_DIR)
+@pytest.fixture
+def session_id():
+    """A conversation session id unique to the requesting test."""
+    return f"session_{uuid.uuid4().hex}"
 
 
 # --- Test ConversationManager ---
 
-def test_conversation_manager_initialization():
+def test_conversation_manager_initialization(manager, db_path):
     """Tests successful initialization and table creation."""
-    manager = ConversationManager(db_path=TEST_DB_PATH)
-    assert os.path.exists(TEST_DB_PATH)
     # Check if table was created
-    conn = sqlite3.connect(TEST_DB_PATH)
+    conn = sqlite3.connect(db_path, uri=True)
     cursor = conn.cursor()
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-    tables = cursor.fetchall()
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='conversation_history'")
+    table = cursor.fetchone()
     conn.close()
-    table_names = [table[0] for table in tables]
-    assert "conversation_history" in table_names
+    assert table is not None
 
-def test_conversation_manager_add_message():
+def test_conversation_manager_add_message(manager, session_id):
     """Tests adding messages to the history."""
-    manager = ConversationManager(db_path=TEST_DB_PATH)
-    session_id = "session_add_message"
 
     manager.add_message(session_id, 'user', "User message 1")
     manager.add_message(session_id, 'assistant', "Assistant message 1")
@@ -76,21 +74,22 @@ def test_conversation_manager_add_message():
     assert history[2]['message'] == 'User message 2'
     assert history[2]['metadata'] == {"doc_ref": "doc1"} # Check deserialized metadata
 
-def test_conversation_manager_get_conversation_history():
+def test_conversation_manager_get_conversation_history(manager, session_id):
     """Tests retrieving conversation history."""
-    manager = ConversationManager(db_path=TEST_DB_PATH)
-    session_id = "session_get_history"
 
-    manager.add_message(session_id, 'user', "Msg 1")
-    manager.add_message(session_id, 'assistant', "Msg 2")
-    manager.add_message(session_id, 'user', "Msg 3")
-    manager.add_message(session_id, 'assistant', "Msg 4")
+    manager.add_messages_bulk(session_id, [
+        ('user', "Msg 1", None),
+        ('assistant', "Msg 2", None),
+        ('user', "Msg 3", None),
+        ('assistant', "Msg 4", None),
+    ])
 
     # Get full history
     full_history = manager.get_conversation_history(session_id)
     assert len(full_history) == 4
     assert full_history[0]['message'] == 'Msg 1'
     assert full_history[3]['message'] == 'Msg 4'
+    assert [turn['turn_index'] for turn in full_history] == [0, 1, 2, 3]
 
     # Get limited history
     limited_history = manager.get_conversation_history(session_id, limit=2)
@@ -102,10 +101,8 @@ def test_conversation_manager_get_conversation_history():
     non_existent_history = manager.get_conversation_history("non_existent_session")
     assert len(non_existent_history) == 0
 
-def test_conversation_manager_get_last_turn_index():
+def test_conversation_manager_get_last_turn_index(manager, session_id):
     """Tests getting the last turn index."""
-    manager = ConversationManager(db_path=TEST_DB_PATH)
-    session_id = "session_last_turn"
 
     assert manager.get_last_turn_index(session_id) == -1 # No history yet
 
@@ -118,73 +115,76 @@ def test_conversation_manager_get_last_turn_index():
     manager.add_message(session_id, 'user', "Msg 3")
     assert manager.get_last_turn_index(session_id) == 2
 
-def test_conversation_manager_clear_conversation():
+def test_conversation_manager_clear_conversation(manager, session_id):
     """Tests clearing conversation history."""
-    manager = ConversationManager(db_path=TEST_DB_PATH)
-    session_id = "session_clear"
 
-    manager.add_message(session_id, 'user', "Msg 1")
-    manager.add_message(session_id, 'assistant', "Msg 2")
+    manager.add_messages_bulk(session_id, [('user', "Msg 1", None), ('assistant', "Msg 2", None)])
     assert len(manager.get_conversation_history(session_id)) == 2
 
     manager.clear_conversation(session_id)
     assert len(manager.get_conversation_history(session_id)) == 0
     assert manager.get_last_turn_index(session_id) == -1 # Index should reset
 
-def test_conversation_manager_get_context_for_llm():
+LLM_CONTEXT_MESSAGES = [
+    "User: Short message.",
+    "Assistant: A slightly longer response with more words.",
+    "User: This is a much longer message to test truncation and token limits.",
+    "Assistant: Final short reply.",
+]
+
+@pytest.fixture
+def llm_context_session(manager, session_id):
+    """A manager holding a four-turn history with messages of varying lengths."""
+    manager.add_messages_bulk(session_id, [
+        ('user', "Short message.", None), # Approx 2 tokens
+        ('assistant', "A slightly longer response with more words.", None), # Approx 6 tokens
+        ('user', "This is a much longer message to test truncation and token limits.", None), # Approx 10 tokens
+        ('assistant', "Final short reply.", None), # Approx 3 tokens
+    ])
+    return manager, session_id
+
+# Approximate token counts: 2, 6, 10, 3. Total ~21.
+@pytest.mark.parametrize("max_tokens, must_include, must_exclude", [
+    # Large limit: should include all messages
+    (100, LLM_CONTEXT_MESSAGES, []),
+    # Smaller limit: the last message plus the third (potentially truncated), not the first two
+    (15, ["Assistant: Final short reply.", "User: This is a much longer message"],
+         ["User: Short message.", "Assistant: A slightly longer response"]),
+    # Very small limit: at least the last message, but not the third
+    (5, ["Assistant: Final short reply."], ["User: This is a much longer message"]),
+], ids=["large", "small", "very_small"])
+def test_conversation_manager_get_context_for_llm(llm_context_session, max_tokens, must_include, must_exclude):
     """Tests generating context for the LLM with token limit."""
-    manager = ConversationManager(db_path=TEST_DB_PATH)
-    session_id = "session_llm_context"
+    manager, session_id = llm_context_session
+    context = manager.get_context_for_llm(session_id, max_tokens=max_tokens)
+    for needle in must_include:
+        assert needle in context
+    for needle in must_exclude:
+        assert needle not in context
+
+def test_conversation_manager_get_context_for_llm_order(llm_context_session):
+    """Tests that the LLM context lists messages chronologically."""
+    manager, session_id = llm_context_session
+    context_large = manager.get_context_for_llm(session_id, max_tokens=100)
+    # Locate every message once, then check presence and order from the offsets
+    offsets = [context_large.find(needle) for needle in LLM_CONTEXT_MESSAGES]
+    assert all(offset >= 0 for offset in offsets), offsets
+    assert offsets == sorted(offsets)
 
-    # Add messages with varying lengths
-    manager.add_message(session_id, 'user', "Short message.") # Approx 2 tokens
-    manager.add_message(session_id, 'assistant', "A slightly longer response with more words.") # Approx 6 tokens
-    manager.add_message(session_id, 'user', "This is a much longer message to test truncation and token limits.") # Approx 10 tokens
-    manager.add_message(session_id, 'assistant', "Final short reply.") # Approx 3 tokens
+def test_conversation_manager_get_context_for_llm_empty(llm_context_session):
+    """Tests that a zero token limit or an empty history gives an empty context."""
+    manager, session_id = llm_context_session
+    assert manager.get_context_for_llm(session_id, max_tokens=0) == ""
 
-    # Test with a large token limit (should include all messages)
-    context_large = manager.get_context_for_llm(session_id, max_tokens=100)
-    assert "User: Short message." in context_large
-    assert "Assistant: A slightly longer response with more words." in context_large
-    assert "User: This is a much longer message to test truncation and token limits." in context_large
-    assert "Assistant: Final short reply." in context_large
-    # Check order (should be chronological)
-    assert context_large.index("User: Short message.") < context_large.index("Assistant: A slightly longer response with more words.")
-
-    # Test with a smaller token limit (should truncate or exclude earlier messages)
-    # Approximate token counts: 2, 6, 10, 3. Total ~21.
-    # Let's set a limit of 15 tokens. Should get the last two messages and maybe part of the third.
-    context_small = manager.get_context_for_llm(session_id, max_tokens=15)
-    # Should definitely include the last message
-    assert "Assistant: Final short reply." in context_small
-    # Should include the third message, potentially truncated
-    assert "User: This is a much longer message" in context_small
-    # Should NOT include the first two messages
-    assert "User: Short message." not in context_small
-    assert "Assistant: A slightly longer response" not in context_small
-
-    # Test with a very small token limit
-    context_very_small = manager.get_context_for_llm(session_id, max_tokens=5)
-    assert "Assistant: Final short reply." in context_very_small # Should at least get the last message
-    assert "User: This is a much longer message" not in context_very_small # Should not get the third message
-
-    # Test with zero token limit
-    context_zero = manager.get_context_for_llm(session_id, max_tokens=0)
-    assert context_zero == ""
-
-    # Test with empty history
     manager.clear_conversation(session_id)
-    context_empty = manager.get_context_for_llm(session_id, max_tokens=100)
-    assert context_empty == ""
+    assert manager.get_context_for_llm(session_id, max_tokens=100) == ""
 
 # Note: The _estimate_token_count is a simple approximation.
 # For more accurate token counting, a proper tokenizer (like from transformers) would be needed.
 # This test relies on the simple word split, which is sufficient for basic functionality testing.
 
-def test_conversation_manager_save_and_load_state():
+def test_conversation_manager_save_and_load_state(manager, session_id):
     """Tests saving and loading conversation state."""
-    manager = ConversationManager(db_path=TEST_DB_PATH)
-    session_id = "session_state"
     initial_state = {"active_document": "report.pdf", "status": "draft"}
 
     # Save initial state
@@ -206,10 +206,8 @@ def test_conversation_manager_save_and_load_state():
     non_existent_state = manager.load_state("non_existent_session_state")
     assert non_existent_state is None
 
-def test_conversation_manager_clear_conversation_clears_state():
+def test_conversation_manager_clear_conversation_clears_state(manager, session_id):
     """Tests that clearing conversation history also clears the state due to cascade delete."""
-    manager = ConversationManager(db_path=TEST_DB_PATH)
-    session_id = "session_clear_state"
 
     # Add a message and save state
     manager.add_message(session_id, 'user', "Message to clear.")
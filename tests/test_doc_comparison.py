@@ -1,18 +1,17 @@
 import pytest
 import os
-from docx import Document as DocxDocument
-from docx.shared import Pt
-from src.utils.doc_comparison import compare_documents
+from src.utils.doc_comparison import compare_documents, compare_paragraphs, _run_format_tuple, _document_paragraphs
 
-# Define paths for dummy test files
-TEST_DIR = "tests/temp_comparison_files"
-ORIGINAL_DOC_PATH = os.path.join(TEST_DIR, "original.docx")
-MODIFIED_DOC_PATH_TEXT_CHANGE = os.path.join(TEST_DIR, "modified_text.docx")
-MODIFIED_DOC_PATH_FORMAT_CHANGE = os.path.join(TEST_DIR, "modified_format.docx")
-MODIFIED_DOC_PATH_STRUCT_CHANGE = os.path.join(TEST_DIR, "modified_structure.docx")
+# File names of the dummy test files, created under a session temp dir
+ORIGINAL_DOC = "original.docx"
+MODIFIED_DOC_TEXT_CHANGE = "modified_text.docx"
+MODIFIED_DOC_FORMAT_CHANGE = "modified_format.docx"
+MODIFIED_DOC_STRUCT_CHANGE = "modified_structure.docx"
 
 def create_test_doc(path: str, content_config: list):
     """Helper to create a docx file for testing."""
+    from docx import Document as DocxDocument
+    from docx.shared import Pt
     doc = DocxDocument()
     for item in content_config:
         p = doc.add_paragraph()
@@ -31,110 +30,108 @@ def create_test_doc(path: str, content_config: list):
                     run.font.size = Pt(run_config.get("font_size"))
     doc.save(path)
 
-@pytest.fixture(scope="module", autouse=True)
-def setup_comparison_test_files():
-    """Fixture to create and remove dummy test files for comparison."""
-    os.makedirs(TEST_DIR, exist_ok=True)
+# Paragraph content for each dummy file. Run-level fonts are part of the config so
+# every file is written in a single save.
+SPECIFIC_FONT_PARAGRAPH = [{"text": "Third paragraph with specific font.", "font_name": "Arial", "font_size": 14}]
+BOLD_ITALIC_PARAGRAPH = [{"text": "This is a "}, {"text": "bold", "bold": True}, {"text": " and "}, {"text": "italic", "italic": True}, {"text": " run."}]
 
-    # Original Document
-    original_content = [
+COMPARISON_DOC_CONTENT = {
+    ORIGINAL_DOC: [
         "This is the first paragraph.",
-        [{"text": "This is a "}, {"text": "bold", "bold": True}, {"text": " and "}, {"text": "italic", "italic": True}, {"text": " run."}],
-        "Third paragraph with specific font.",
-    ]
-    create_test_doc(ORIGINAL_DOC_PATH, original_content)
-    # Set specific font for the third paragraph's first run in original
-    doc_orig_temp = DocxDocument(ORIGINAL_DOC_PATH)
-    if len(doc_orig_temp.paragraphs) > 2 and doc_orig_temp.paragraphs[2].runs:
-        doc_orig_temp.paragraphs[2].runs[0].font.name = "Arial"
-        doc_orig_temp.paragraphs[2].runs[0].font.size = Pt(14)
-    doc_orig_temp.save(ORIGINAL_DOC_PATH)
-
-
-    # Modified Document - Text Change
-    modified_content_text = [
+        BOLD_ITALIC_PARAGRAPH,
+        SPECIFIC_FONT_PARAGRAPH,
+    ],
+    # Text change
+    MODIFIED_DOC_TEXT_CHANGE: [
         "This is the FIRST paragraph, changed.", # Text change
-        [{"text": "This is a "}, {"text": "bold", "bold": True}, {"text": " and "}, {"text": "italic", "italic": True}, {"text": " run."}],
-        "Third paragraph with specific font.",
-    ]
-    create_test_doc(MODIFIED_DOC_PATH_TEXT_CHANGE, modified_content_text)
-    doc_mod_text_temp = DocxDocument(MODIFIED_DOC_PATH_TEXT_CHANGE)
-    if len(doc_mod_text_temp.paragraphs) > 2 and doc_mod_text_temp.paragraphs[2].runs:
-         doc_mod_text_temp.paragraphs[2].runs[0].font.name = "Arial"
-         doc_mod_text_temp.paragraphs[2].runs[0].font.size = Pt(14)
-    doc_mod_text_temp.save(MODIFIED_DOC_PATH_TEXT_CHANGE)
-
-
-    # Modified Document - Format Change
-    modified_content_format = [
+        BOLD_ITALIC_PARAGRAPH,
+        SPECIFIC_FONT_PARAGRAPH,
+    ],
+    # Format change
+    MODIFIED_DOC_FORMAT_CHANGE: [
         "This is the first paragraph.",
         [{"text": "This is a "}, {"text": "normal", "bold": False}, {"text": " and "}, {"text": "very italic", "italic": True, "font_name": "Times New Roman"}, {"text": " run."}], # Bold removed, font changed
-        "Third paragraph with specific font.",
-    ]
-    create_test_doc(MODIFIED_DOC_PATH_FORMAT_CHANGE, modified_content_format)
-    doc_mod_fmt_temp = DocxDocument(MODIFIED_DOC_PATH_FORMAT_CHANGE)
-    if len(doc_mod_fmt_temp.paragraphs) > 2 and doc_mod_fmt_temp.paragraphs[2].runs:
-        doc_mod_fmt_temp.paragraphs[2].runs[0].font.name = "Arial" # Keep this same as original for this test
-        doc_mod_fmt_temp.paragraphs[2].runs[0].font.size = Pt(12) # Change size
-    doc_mod_fmt_temp.save(MODIFIED_DOC_PATH_FORMAT_CHANGE)
-
-
-    # Modified Document - Structure Change (extra paragraph)
-    modified_content_structure = [
+        [{"text": "Third paragraph with specific font.", "font_name": "Arial", "font_size": 12}], # Same font as original, size changed
+    ],
+    # Structure change (extra paragraph)
+    MODIFIED_DOC_STRUCT_CHANGE: [
         "This is the first paragraph.",
-        [{"text": "This is a "}, {"text": "bold", "bold": True}, {"text": " and "}, {"text": "italic", "italic": True}, {"text": " run."}],
+        BOLD_ITALIC_PARAGRAPH,
         "This is an entirely new third paragraph.",
-        "Third paragraph with specific font.", # This becomes the fourth
-    ]
-    create_test_doc(MODIFIED_DOC_PATH_STRUCT_CHANGE, modified_content_structure)
-    doc_mod_struct_temp = DocxDocument(MODIFIED_DOC_PATH_STRUCT_CHANGE)
-    # Ensure the "specific font" paragraph (now 4th) has its original font for comparison base
-    if len(doc_mod_struct_temp.paragraphs) > 3 and doc_mod_struct_temp.paragraphs[3].runs:
-         doc_mod_struct_temp.paragraphs[3].runs[0].font.name = "Arial"
-         doc_mod_struct_temp.paragraphs[3].runs[0].font.size = Pt(14)
-    doc_mod_struct_temp.save(MODIFIED_DOC_PATH_STRUCT_CHANGE)
-
-    yield
-
-    # Teardown
-    if os.path.exists(TEST_DIR):
-        import shutil
-        shutil.rmtree(TEST_DIR)
-
-def test_compare_identical_documents():
+        SPECIFIC_FONT_PARAGRAPH, # This becomes the fourth, keeping its original font
+    ],
+}
+
+@pytest.fixture(scope="session")
+def comparison_files(tmp_path_factory):
+    """
+    Creates the dummy test files for comparison once per session and returns their
+    paths keyed by file name. The files are only read by the tests, so a single
+    tmp_path_factory directory is safe to share (including under pytest-xdist).
+    """
+    test_dir = tmp_path_factory.mktemp("comparison_files")
+    paths = {}
+    for name, content_config in COMPARISON_DOC_CONTENT.items():
+        paths[name] = str(test_dir / name)
+        create_test_doc(paths[name], content_config)
+    return paths
+
+@pytest.fixture(scope="session")
+def diffs_cache():
+    """Session-wide memo of compare_documents results."""
+    return {}
+
+def cached_compare(original_path: str, modified_path: str, cache: dict) -> list:
+    """
+    compare_documents, memoized on both files' (mtime, size). The result is a pure
+    function of the file contents, so tests comparing the same pair share one parse.
+    """
+    stat_a = os.stat(original_path)
+    stat_b = os.stat(modified_path)
+    key = (original_path, stat_a.st_mtime_ns, stat_a.st_size, modified_path, stat_b.st_mtime_ns, stat_b.st_size)
+    if key not in cache:
+        cache[key] = compare_documents(original_path, modified_path)
+    return cache[key]
+
+def test_compare_identical_documents(comparison_files, diffs_cache):
     """Tests comparison of two identical documents."""
-    diffs = compare_documents(ORIGINAL_DOC_PATH, ORIGINAL_DOC_PATH)
+    diffs = cached_compare(comparison_files[ORIGINAL_DOC], comparison_files[ORIGINAL_DOC], diffs_cache)
     assert "No differences found." in diffs[-1] # Last item should be no diffs
 
-def test_compare_text_changes():
-    """Tests comparison with text changes."""
-    diffs = compare_documents(ORIGINAL_DOC_PATH, MODIFIED_DOC_PATH_TEXT_CHANGE)
-    assert any("Text content differs:" in d for d in diffs), "Text difference not detected"
-    assert any("- This is the first paragraph." in d for d in diffs)
-    assert any("+ This is the FIRST paragraph, changed." in d for d in diffs)
-
-def test_compare_formatting_changes():
-    """Tests comparison with formatting changes."""
-    diffs = compare_documents(ORIGINAL_DOC_PATH, MODIFIED_DOC_PATH_FORMAT_CHANGE)
-    print("Diffs for test_compare_formatting_changes:")
+def find_expected_lines(diffs, wanted: dict) -> dict:
+    """
+    Scans the diff report once and returns, for each key in `wanted`, whether any
+    line contains one of that key's alternative needles.
+    """
+    found = {key: False for key in wanted}
     for d in diffs:
-        print(d)
-    # Look for specific formatting change reports
-    assert any("Bold: True -> None" in d or "Bold: True -> False" in d for d in diffs), "Bold change not detected" # Adjusted for None
-    assert any("Font Name: 'None' -> 'Times New Roman'" in d or "Font Name: '' -> 'Times New Roman'" in d for d in diffs), "Font name change not detected"
-    # Check for font size change in the third paragraph (which is index 2)
-    # The utility reports paragraph numbers 1-based.
-    # The specific run is the first run of the third paragraph.
-    assert any("Font Size: 14.0pt -> 12.0pt" in d for d in diffs), "Font size change not detected"
-
-
-def test_compare_structural_changes():
-    """Tests comparison with structural changes (e.g., added/removed paragraphs)."""
-    diffs = compare_documents(ORIGINAL_DOC_PATH, MODIFIED_DOC_PATH_STRUCT_CHANGE)
-    print("Diffs for test_compare_structural_changes:")
-    for d in diffs:
-        print(d)
-    
+        for key, needles in wanted.items():
+            if not found[key] and any(needle in d for needle in needles):
+                found[key] = True
+    return found
+
+def check_text_changes(diffs):
+    """Checks the report for the text-change document."""
+    found = find_expected_lines(diffs, {
+        "Text difference not detected": ("Text content differs:",),
+        "Removed line not reported": ("- This is the first paragraph.",),
+        "Added line not reported": ("+ This is the FIRST paragraph, changed.",),
+    })
+    assert all(found.values()), [message for message, ok in found.items() if not ok]
+
+def check_formatting_changes(diffs):
+    """Checks the report for the formatting-change document."""
+    # Look for specific formatting change reports.
+    # The font size change is on the first run of the third paragraph.
+    found = find_expected_lines(diffs, {
+        "Bold change not detected": ("Bold: True -> None", "Bold: True -> False"), # Adjusted for None
+        "Font name change not detected": ("Font Name: 'None' -> 'Times New Roman'", "Font Name: '' -> 'Times New Roman'"),
+        "Font size change not detected": ("Font Size: 14.0pt -> 12.0pt",),
+    })
+    assert all(found.values()), [message for message, ok in found.items() if not ok]
+
+def check_structural_changes(diffs):
+    """Checks the report for the structure-change document (added/removed paragraphs)."""
     # Check that Paragraph 3 header exists and is followed by text difference report
     para3_header_found = False
     text_diff_for_para3_found = False
@@ -158,7 +155,64 @@ def test_compare_structural_changes():
     # Check for the extra paragraph indication
     assert any("Paragraph 4: Extra in modified" in d for d in diffs), "Indication of extra paragraph (Paragraph 4) not found"
 
-def test_compare_non_existent_file():
+@pytest.fixture(scope="session", params=[
+    (MODIFIED_DOC_TEXT_CHANGE, check_text_changes),
+    (MODIFIED_DOC_FORMAT_CHANGE, check_formatting_changes),
+    (MODIFIED_DOC_STRUCT_CHANGE, check_structural_changes),
+], ids=["text", "formatting", "structure"])
+def diff_case(request, comparison_files, diffs_cache):
+    """Diffs the original against one modified document, once per session, with its checks."""
+    modified_doc, check = request.param
+    return cached_compare(comparison_files[ORIGINAL_DOC], comparison_files[modified_doc], diffs_cache), check
+
+def test_compare_modified_documents(diff_case, request):
+    """Tests comparison with text, formatting and structural changes."""
+    diffs, check = diff_case
+    # Shown alongside the failure report only, instead of printing on every run
+    request.node.add_report_section("call", "diffs", "\n".join(diffs))
+    check(diffs)
+
+def test_compare_non_existent_file(comparison_files):
     """Tests comparison when one file does not exist."""
-    diffs = compare_documents(ORIGINAL_DOC_PATH, "non_existent_file.docx")
-    assert any("Error opening documents:" in d for d in diffs)
\ No newline at end of file
+    diffs = compare_documents(comparison_files[ORIGINAL_DOC], "non_existent_file.docx")
+    assert any("Error opening documents:" in d for d in diffs)
+
+def test_run_format_tuple_matches_python_docx():
+    """Tests that the direct rPr read agrees with python-docx's run/font properties."""
+    from docx import Document as DocxDocument
+    from docx.shared import Pt
+    doc = DocxDocument()
+    p = doc.add_paragraph()
+    plain = p.add_run("plain")
+    styled = p.add_run("styled")
+    styled.bold = True
+    styled.italic = False
+    styled.font.name = "Arial"
+    styled.font.size = Pt(10.5)
+    for run in (plain, styled):
+        expected = (run.bold, run.italic, run.font.name, run.font.size.pt if run.font.size else None)
+        assert _run_format_tuple(run) == expected
+
+
+def test_document_paragraphs_matches_python_docx(comparison_files):
+    """Tests that the w:body fast path extracts the same paragraphs and runs as doc.paragraphs."""
+    from docx import Document as DocxDocument
+    doc = DocxDocument(comparison_files[ORIGINAL_DOC])
+    extracted = _document_paragraphs(doc)
+    assert [text for text, _ in extracted] == [p.text for p in doc.paragraphs]
+    assert [[text for text, _ in runs] for _, runs in extracted] == [[r.text for r in p.runs] for p in doc.paragraphs]
+
+
+def test_compare_paragraphs_aligns_inserted_run():
+    """Tests that an inserted run is reported on its own instead of shifting later runs."""
+    from docx import Document as DocxDocument
+    doc = DocxDocument()
+    original = doc.add_paragraph()
+    modified = doc.add_paragraph()
+    for text in ["Alpha ", "Beta ", "Gamma"]:
+        original.add_run(text)
+    for text in ["Alpha ", "Inserted ", "Beta ", "Gamma"]:
+        modified.add_run(text)
+    diffs = compare_paragraphs(original, modified)
+    assert "    - Extra run in modified: 'Inserted '" in diffs
+    assert not any("Run text:" in d for d in diffs)
@@ -1,6 +1,6 @@
 import pytest
 import os
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 from datetime import datetime
 
 # Assuming components are in src/
@@ -9,46 +9,39 @@ from src.rag.vector_store import VectorStore
 from src.rag.embeddings import EmbeddingModel
 from src.data.metadata_store import MetadataStore
 from src.config import settings
+from tests.helpers import spec_mock
 
-# Define paths for dummy test files
-TEST_DIR = "tests/temp_indexing_test_files"
-DUMMY_DOCX_PATH = os.path.join(TEST_DIR, "dummy_indexing.docx")
-NON_EXISTENT_PATH = os.path.join(TEST_DIR, "non_existent.txt")
+# File names of the dummy test files, created under a session temp dir
+DUMMY_DOCX = "dummy_indexing.docx"
+NON_EXISTENT = "non_existent.txt"
 
-@pytest.fixture(scope="module", autouse=True)
-def setup_and_teardown_test_files():
+@pytest.fixture(scope="session")
+def indexing_files(tmp_path_factory):
     """
-    Fixture to create and remove dummy test files for indexer tests.
+    Creates the dummy test files for indexer tests once per session and returns their
+    paths keyed by file name; pytest cleans the temp dir up.
+    parse_document is always mocked, so the dummy "docx" only has to exist on disk
+    for the indexer's os.path.exists check; an empty file is enough.
     """
-    os.makedirs(TEST_DIR, exist_ok=True)
-
-    # Create dummy docx
-    try:
-        from docx import Document as DocxDocument
-        doc = DocxDocument()
-        doc.add_paragraph("This is the first paragraph for indexing test.")
-        doc.add_paragraph("This is the second paragraph.")
-        doc.save(DUMMY_DOCX_PATH)
-    except ImportError:
-        pytest.skip("python-docx not installed, skipping docx tests")
-    except Exception as e:
-        print(f"Error creating dummy docx: {e}")
-
-    yield # This is where the tests run
-
-    # Teardown: remove test files and directory
-    if os.path.exists(TEST_DIR):
-        import shutil
-        shutil.rmtree(TEST_DIR)
+    test_dir = tmp_path_factory.mktemp("indexing")
+    paths = {name: str(test_dir / name) for name in (DUMMY_DOCX, NON_EXISTENT)}
+    with open(paths[DUMMY_DOCX], 'wb') as f:
+        f.write(b'')
+    return paths
+
+# Dummy embeddings returned by the mocked model, built once for the module
+_EMB_A = [0.1] * settings.EMBEDDING_BATCH_SIZE
+_EMB_B = [0.2] * settings.EMBEDDING_BATCH_SIZE
+_EMB_RET = [_EMB_A, _EMB_B]
 
 @pytest.fixture
 def mock_components():
     """
     Fixture to provide mocked instances of DocumentIndexer dependencies.
     """
-    mock_vector_store = MagicMock(spec=VectorStore)
-    mock_embedding_model = MagicMock(spec=EmbeddingModel)
-    mock_metadata_store = MagicMock(spec=MetadataStore)
+    mock_vector_store = spec_mock(VectorStore)
+    mock_embedding_model = spec_mock(EmbeddingModel)
+    mock_metadata_store = spec_mock(MetadataStore)
 
     # Configure mocks for expected calls during indexing
     mock_metadata_store.add_document_metadata.return_value = 1 # Simulate returning a document ID
@@ -56,176 +49,85 @@ def mock_components():
         {"id": 101, "document_id": 1, "chunk_index": 0, "content": "chunk 1 content", "metadata": {}},
         {"id": 102, "document_id": 1, "chunk_index": 1, "content": "chunk 2 content", "metadata": {}},
     ] # Simulate returning stored chunks with IDs
-    mock_embedding_model.generate_embeddings.return_value = [[0.1]*settings.EMBEDDING_BATCH_SIZE, [0.2]*settings.EMBEDDING_BATCH_SIZE] # Dummy embeddings
+    mock_embedding_model.generate_embeddings.return_value = _EMB_RET # Dummy embeddings
 
     return mock_vector_store, mock_embedding_model, mock_metadata_store
 
-# --- Test DocumentIndexer ---
+@pytest.fixture(scope="module")
+def parser_patches():
+    """Patches the indexer's parse and chunk functions once for the whole module."""
+    with patch('src.rag.indexing.parse_document') as mock_parse_document, \
+         patch('src.rag.indexing.chunk_document_elements') as mock_chunk_document_elements:
+        yield mock_parse_document, mock_chunk_document_elements
 
-@patch('src.rag.indexing.parse_document')
-@patch('src.rag.indexing.chunk_document_elements')
-def test_document_indexer_index_document_success(
-    mock_chunk_document_elements,
-    mock_parse_document,
-    mock_components
-):
-    """
-    Tests successful document indexing.
-    """
-    mock_vector_store, mock_embedding_model, mock_metadata_store = mock_components
+@pytest.fixture(autouse=True)
+def patched_parsers(parser_patches):
+    """Hands each test the module-wide parser mocks, reset afterwards so no calls or returns leak."""
+    yield parser_patches
+    for mock in parser_patches:
+        mock.reset_mock(return_value=True, side_effect=True)
 
-    # Configure mocks for this specific test
-    mock_parse_document.return_value = [{"content": "element 1"}, {"content": "element 2"}]
-    mock_chunk_document_elements.return_value = [
-        {"content": "chunk 1 content", "metadata": {}},
-        {"content": "chunk 2 content", "metadata": {}},
-    ]
-    mock_metadata_store.get_chunks_by_document_id.return_value = [ # Ensure this matches chunk_document_elements output count
-        {"id": 101, "document_id": 1, "chunk_index": 0, "content": "chunk 1 content", "metadata": {}},
-        {"id": 102, "document_id": 1, "chunk_index": 1, "content": "chunk 2 content", "metadata": {}},
-    ]
-    mock_embedding_model.generate_embeddings.return_value = [[0.1]*settings.EMBEDDING_BATCH_SIZE, [0.2]*settings.EMBEDDING_BATCH_SIZE]
-
-
-    indexer = DocumentIndexer(mock_vector_store, mock_embedding_model, mock_metadata_store)
-
-    # Ensure dummy file exists before attempting to index
-    if not os.path.exists(DUMMY_DOCX_PATH):
-         pytest.skip("Dummy docx file not created.")
-
-    indexer.index_document(DUMMY_DOCX_PATH)
-
-    # Assert that the correct methods were called on the mocks
-    mock_parse_document.assert_called_once_with(DUMMY_DOCX_PATH)
-    mock_chunk_document_elements.assert_called_once() # Check args more specifically if needed
-    mock_metadata_store.add_document_metadata.assert_called_once() # Check args more specifically if needed
-    mock_metadata_store.add_chunk_metadata.assert_called_once() # Check args more specifically if needed
-    mock_metadata_store.get_chunks_by_document_id.assert_called_once() # Check args more specifically if needed
-    mock_embedding_model.generate_embeddings.assert_called_once() # Check args more specifically if needed
-    mock_vector_store.add_embeddings.assert_called_once() # Check args more specifically if needed
-
-@patch('src.rag.indexing.parse_document')
-@patch('src.rag.indexing.chunk_document_elements')
-def test_document_indexer_index_document_non_existent_file(
-    mock_chunk_document_elements,
-    mock_parse_document,
-    mock_components
-):
-    """
-    Tests indexing a non-existent file.
-    """
-    mock_vector_store, mock_embedding_model, mock_metadata_store = mock_components
-    indexer = DocumentIndexer(mock_vector_store, mock_embedding_model, mock_metadata_store)
+# --- Test DocumentIndexer ---
 
-    indexer.index_document(NON_EXISTENT_PATH)
-
-    # Assert that parsing, chunking, metadata, embedding, and vector store methods were NOT called
-    mock_parse_document.assert_not_called()
-    mock_chunk_document_elements.assert_not_called()
-    mock_metadata_store.add_document_metadata.assert_not_called()
-    mock_metadata_store.add_chunk_metadata.assert_not_called()
-    mock_metadata_store.get_chunks_by_document_id.assert_not_called()
-    mock_embedding_model.generate_embeddings.assert_not_called()
-    mock_vector_store.add_embeddings.assert_not_called()
-
-@patch('src.rag.indexing.parse_document')
-@patch('src.rag.indexing.chunk_document_elements')
-def test_document_indexer_index_document_no_elements(
-    mock_chunk_document_elements,
-    mock_parse_document,
-    mock_components
-):
+TWO_CHUNKS = [
+    {"content": "chunk 1 content", "metadata": {}},
+    {"content": "chunk 2 content", "metadata": {}},
+]
+STORED_CHUNK_1 = {"id": 101, "document_id": 1, "chunk_index": 0, "content": "chunk 1 content", "metadata": {}}
+STORED_CHUNK_2 = {"id": 102, "document_id": 1, "chunk_index": 1, "content": "chunk 2 content", "metadata": {}}
+
+# Call counts expected on each indexer dependency, in pipeline order:
+# parse, chunk, add_document_metadata, add_chunk_metadata, get_chunks_by_document_id,
+# generate_embeddings, add_embeddings.
+def _expected_calls(*counts):
+    names = ("parse_document", "chunk_document_elements", "add_document_metadata", "add_chunk_metadata",
+             "get_chunks_by_document_id", "generate_embeddings", "add_embeddings")
+    return dict(zip(names, counts))
+
+@pytest.mark.parametrize("file_name, parse_ret, chunk_ret, stored, expected", [
+    # Successful document indexing: every stage runs once
+    (DUMMY_DOCX, [{"content": "element 1"}, {"content": "element 2"}], TWO_CHUNKS,
+     [STORED_CHUNK_1, STORED_CHUNK_2], _expected_calls(1, 1, 1, 1, 1, 1, 1)),
+    # Non-existent file: nothing past the existence check is called
+    (NON_EXISTENT, None, None, None, _expected_calls(0, 0, 0, 0, 0, 0, 0)),
+    # Parsing returns no elements: document metadata is still added, nothing after it
+    (DUMMY_DOCX, [], None, None, _expected_calls(1, 0, 1, 0, 0, 0, 0)),
+    # Chunking returns no chunks: chunk metadata (an empty list) is still added and fetched
+    (DUMMY_DOCX, [{"content": "element 1"}], [], None, _expected_calls(1, 1, 1, 1, 1, 0, 0)),
+    # Stored chunk count doesn't match the created chunks: embedding and vector store are skipped
+    (DUMMY_DOCX, [{"content": "element 1"}, {"content": "element 2"}], TWO_CHUNKS,
+     [STORED_CHUNK_1], _expected_calls(1, 1, 1, 1, 1, 0, 0)),
+], ids=["success", "non_existent_file", "no_elements", "no_chunks", "chunk_mismatch"])
+def test_document_indexer_index_document(patched_parsers, mock_components, indexing_files, file_name, parse_ret, chunk_ret, stored, expected):
     """
-    Tests indexing a document where parsing returns no elements.
+    Tests which indexing stages run for each parse/chunk/store outcome.
     """
+    mock_parse_document, mock_chunk_document_elements = patched_parsers
     mock_vector_store, mock_embedding_model, mock_metadata_store = mock_components
-    indexer = DocumentIndexer(mock_vector_store, mock_embedding_model, mock_metadata_store)
 
-    # Configure mocks for this specific test
-    mock_parse_document.return_value = [] # Simulate no elements parsed
-
-    # Ensure dummy file exists before attempting to index
-    if not os.path.exists(DUMMY_DOCX_PATH):
-         pytest.skip("Dummy docx file not created.")
-
-    indexer.index_document(DUMMY_DOCX_PATH)
-
-    # Assert that parsing was called, but subsequent steps were NOT called
-    mock_parse_document.assert_called_once_with(DUMMY_DOCX_PATH)
-    mock_chunk_document_elements.assert_not_called()
-    mock_metadata_store.add_document_metadata.assert_called_once() # Document metadata should still be added
-    mock_metadata_store.add_chunk_metadata.assert_not_called()
-    mock_metadata_store.get_chunks_by_document_id.assert_not_called()
-    mock_embedding_model.generate_embeddings.assert_not_called()
-    mock_vector_store.add_embeddings.assert_not_called()
-
-@patch('src.rag.indexing.parse_document')
-@patch('src.rag.indexing.chunk_document_elements')
-def test_document_indexer_index_document_no_chunks(
-    mock_chunk_document_elements,
-    mock_parse_document,
-    mock_components
-):
-    """
-    Tests indexing a document where chunking returns no chunks.
-    """
-    mock_vector_store, mock_embedding_model, mock_metadata_store = mock_components
-    indexer = DocumentIndexer(mock_vector_store, mock_embedding_model, mock_metadata_store)
+    # Configure mocks for this case; None keeps the default
+    if parse_ret is not None:
+        mock_parse_document.return_value = parse_ret
+    if chunk_ret is not None:
+        mock_chunk_document_elements.return_value = chunk_ret
+    if stored is not None:
+        mock_metadata_store.get_chunks_by_document_id.return_value = stored
 
-    # Configure mocks for this specific test
-    mock_parse_document.return_value = [{"content": "element 1"}]
-    mock_chunk_document_elements.return_value = [] # Simulate no chunks created
-
-    # Ensure dummy file exists before attempting to index
-    if not os.path.exists(DUMMY_DOCX_PATH):
-         pytest.skip("Dummy docx file not created.")
-
-    indexer.index_document(DUMMY_DOCX_PATH)
-
-    # Assert that parsing and chunking were called, but subsequent steps were NOT called
-    mock_parse_document.assert_called_once_with(DUMMY_DOCX_PATH)
-    mock_chunk_document_elements.assert_called_once()
-    mock_metadata_store.add_document_metadata.assert_called_once() # Document metadata should still be added
-    mock_metadata_store.add_chunk_metadata.assert_called_once() # Chunk metadata should be added (even if empty list)
-    mock_metadata_store.get_chunks_by_document_id.assert_called_once() # Should still attempt to get chunks
-    mock_embedding_model.generate_embeddings.assert_not_called()
-    mock_vector_store.add_embeddings.assert_not_called()
-
-@patch('src.rag.indexing.parse_document')
-@patch('src.rag.indexing.chunk_document_elements')
-def test_document_indexer_index_document_chunk_mismatch(
-    mock_chunk_document_elements,
-    mock_parse_document,
-    mock_components
-):
-    """
-    Tests indexing where the number of stored chunks doesn't match the number of created chunks.
-    """
-    mock_vector_store, mock_embedding_model, mock_metadata_store = mock_components
     indexer = DocumentIndexer(mock_vector_store, mock_embedding_model, mock_metadata_store)
 
-    # Configure mocks for this specific test
-    mock_parse_document.return_value = [{"content": "element 1"}, {"content": "element 2"}]
-    mock_chunk_document_elements.return_value = [
-        {"content": "chunk 1 content", "metadata": {}},
-        {"content": "chunk 2 content", "metadata": {}},
-    ]
-    # Simulate a mismatch: get_chunks_by_document_id returns a different number
-    mock_metadata_store.get_chunks_by_document_id.return_value = [
-        {"id": 101, "document_id": 1, "chunk_index": 0, "content": "chunk 1 content", "metadata": {}},
-    ] # Only one chunk returned
-
-    # Ensure dummy file exists before attempting to index
-    if not os.path.exists(DUMMY_DOCX_PATH):
-         pytest.skip("Dummy docx file not created.")
-
-    indexer.index_document(DUMMY_DOCX_PATH)
-
-    # Assert that parsing, chunking, and metadata calls were made, but embedding and vector store calls were NOT
-    mock_parse_document.assert_called_once_with(DUMMY_DOCX_PATH)
-    mock_chunk_document_elements.assert_called_once()
-    mock_metadata_store.add_document_metadata.assert_called_once()
-    mock_metadata_store.add_chunk_metadata.assert_called_once()
-    mock_metadata_store.get_chunks_by_document_id.assert_called_once()
-    mock_embedding_model.generate_embeddings.assert_not_called() # Embedding should be skipped due to mismatch
-    mock_vector_store.add_embeddings.assert_not_called() # Adding to vector store should be skipped
\ No newline at end of file
+    file_path = indexing_files[file_name]
+    indexer.index_document(file_path)
+
+    # Compare every call count at once so a failure shows the whole pipeline
+    actual = {
+        "parse_document": mock_parse_document.call_count,
+        "chunk_document_elements": mock_chunk_document_elements.call_count,
+        "add_document_metadata": mock_metadata_store.add_document_metadata.call_count,
+        "add_chunk_metadata": mock_metadata_store.add_chunk_metadata.call_count,
+        "get_chunks_by_document_id": mock_metadata_store.get_chunks_by_document_id.call_count,
+        "generate_embeddings": mock_embedding_model.generate_embeddings.call_count,
+        "add_embeddings": mock_vector_store.add_embeddings.call_count,
+    }
+    assert actual == expected
+    if expected["parse_document"]:
+        mock_parse_document.assert_called_once_with(file_path)
@@ -1,49 +1,61 @@
 import pytest
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import DEFAULT, MagicMock, patch
 import google.generativeai as genai
-from google.generativeai.types import GenerateContentResponse, Part, PromptFeedback, BlockReason
+from google.generativeai.types import BlockReason
 
 # Assuming GeminiClient is in src/llm/gemini.py
 from src.llm.gemini import GeminiClient
 from src.config import settings
 
+# Plain stand-ins for Gemini responses: GeminiClient only reads .parts, .text and
+# .prompt_feedback.block_reason, so spec'd MagicMocks are unnecessary.
+def _text_response(text):
+    return SimpleNamespace(parts=[SimpleNamespace(text=text)], text=text, prompt_feedback=None)
+
+STREAM_CHUNKS = (_text_response("Chunk 1 "), _text_response("Chunk 2."))
+
+@pytest.fixture(scope="module")
+def patched_settings():
+    """Patches the client's settings once for the module, with a dummy API key."""
+    with patch('src.llm.gemini.settings') as mock_settings:
+        mock_settings.GEMINI_API_KEY = "dummy_api_key"
+        yield mock_settings
+
+@pytest.fixture
+def genai_mocks():
+    """Patches genai.configure and genai.GenerativeModel together, yielding the mocks by name."""
+    with patch.multiple('google.generativeai', configure=DEFAULT, GenerativeModel=DEFAULT) as mocks:
+        yield mocks
+
 # Mock the genai.configure call
 @patch('google.generativeai.configure')
-def test_gemini_client_initialization(mock_configure):
+def test_gemini_client_initialization(mock_configure, patched_settings):
     """Tests successful initialization of GeminiClient."""
-    # Mock settings to provide an API key
-    with patch('src.llm.gemini.settings') as mock_settings:
-        mock_settings.GEMINI_API_KEY = "dummy_api_key"
-        client = GeminiClient()
-        mock_configure.assert_called_once_with(api_key="dummy_api_key")
-        assert isinstance(client.model, genai.GenerativeModel) # Check if model is initialized
+    client = GeminiClient()
+    mock_configure.assert_called_once_with(api_key="dummy_api_key")
+    assert isinstance(client.model, genai.GenerativeModel) # Check if model is initialized
 
 @patch('google.generativeai.configure')
-def test_gemini_client_initialization_no_api_key(mock_configure):
+def test_gemini_client_initialization_no_api_key(mock_configure, patched_settings, monkeypatch):
     """Tests initialization failure when no API key is provided."""
-    with patch('src.llm.gemini.settings') as mock_settings:
-        mock_settings.GEMINI_API_KEY = None # Simulate no API key in settings
-        with pytest.raises(ValueError, match="Gemini API key not provided or found in settings."):
-            GeminiClient()
-        mock_configure.assert_not_called()
+    monkeypatch.setattr(patched_settings, "GEMINI_API_KEY", None) # Simulate no API key in settings
+    with pytest.raises(ValueError, match="Gemini API key not provided or found in settings."):
+        GeminiClient()
+    mock_configure.assert_not_called()
 
-@patch('google.generativeai.configure')
-@patch('google.generativeai.GenerativeModel')
-def test_gemini_client_generate_response_non_streaming_success(mock_generative_model, mock_configure):
+def test_gemini_client_generate_response_non_streaming_success(genai_mocks, patched_settings):
     """Tests successful non-streaming response generation."""
+    mock_generative_model = genai_mocks["GenerativeModel"]
     # Configure the mock model instance
     mock_model_instance = MagicMock()
     mock_generative_model.return_value = mock_model_instance
 
     # Configure the mock response
-    mock_response = MagicMock(spec=GenerateContentResponse)
-    mock_response.parts = [MagicMock(spec=Part, text="Generated response text.")]
-    mock_response.prompt_feedback = None # Simulate no feedback/blocking
+    mock_response = _text_response("Generated response text.") # No feedback/blocking
     mock_model_instance.generate_content.return_value = mock_response
 
-    with patch('src.llm.gemini.settings') as mock_settings:
-        mock_settings.GEMINI_API_KEY = "dummy_api_key"
-        client = GeminiClient()
+    client = GeminiClient()
 
     prompt = "Test prompt"
     response = client.generate_response(prompt, stream=False)
@@ -51,21 +63,19 @@ def test_gemini_client_generate_response_non_streaming_success(mock_generative_m
     mock_model_instance.generate_content.assert_called_once_with(prompt, stream=False)
     assert response == "Generated response text."
 
-@patch('google.generativeai.configure')
-@patch('google.generativeai.GenerativeModel')
-def test_gemini_client_generate_response_non_streaming_blocked(mock_generative_model, mock_configure):
+def test_gemini_client_generate_response_non_streaming_blocked(genai_mocks, patched_settings):
     """Tests non-streaming response handling when the response is blocked."""
+    mock_generative_model = genai_mocks["GenerativeModel"]
     mock_model_instance = MagicMock()
     mock_generative_model.return_value = mock_model_instance
 
-    mock_response = MagicMock(spec=GenerateContentResponse)
-    mock_response.parts = [] # Simulate no parts
-    mock_response.prompt_feedback = MagicMock(spec=PromptFeedback, block_reason=BlockReason.SAFETY) # Simulate blocking
+    mock_response = SimpleNamespace(
+        parts=[], # Simulate no parts
+        prompt_feedback=SimpleNamespace(block_reason=BlockReason.SAFETY), # Simulate blocking
+    )
     mock_model_instance.generate_content.return_value = mock_response
 
-    with patch('src.llm.gemini.settings') as mock_settings:
-        mock_settings.GEMINI_API_KEY = "dummy_api_key"
-        client = GeminiClient()
+    client = GeminiClient()
 
     prompt = "Test prompt"
     response = client.generate_response(prompt, stream=False)
@@ -73,27 +83,16 @@ def test_gemini_client_generate_response_non_streaming_blocked(mock_generative_m
     mock_model_instance.generate_content.assert_called_once_with(prompt, stream=False)
     assert "Error: Gemini response blocked or empty. Finish reason: SAFETY" in response
 
-@patch('google.generativeai.configure')
-@patch('google.generativeai.GenerativeModel')
-def test_gemini_client_generate_response_streaming_success(mock_generative_model, mock_configure):
+def test_gemini_client_generate_response_streaming_success(genai_mocks, patched_settings):
     """Tests successful streaming response generation."""
+    mock_generative_model = genai_mocks["GenerativeModel"]
     mock_model_instance = MagicMock()
     mock_generative_model.return_value = mock_model_instance
 
-    # Simulate a streaming response (a generator)
-    def mock_streaming_response_generator():
-        chunk1 = MagicMock(spec=GenerateContentResponse)
-        chunk1.parts = [MagicMock(spec=Part, text="Chunk 1 ")]
-        yield chunk1
-        chunk2 = MagicMock(spec=GenerateContentResponse)
-        chunk2.parts = [MagicMock(spec=Part, text="Chunk 2.")]
-        yield chunk2
+    # Simulate a streaming response (an iterator over prebuilt chunks)
+    mock_model_instance.generate_content.return_value = iter(STREAM_CHUNKS)
 
-    mock_model_instance.generate_content.return_value = mock_streaming_response_generator()
-
-    with patch('src.llm.gemini.settings') as mock_settings:
-        mock_settings.GEMINI_API_KEY = "dummy_api_key"
-        client = GeminiClient()
+    client = GeminiClient()
 
     prompt = "Test prompt"
     response_generator = client.generate_response(prompt, stream=True)
@@ -104,25 +103,20 @@ def test_gemini_client_generate_response_streaming_success(mock_generative_model
     chunks = list(response_generator)
     assert chunks == ["Chunk 1 ", "Chunk 2."]
 
-@patch('google.generativeai.configure')
-@patch('google.generativeai.GenerativeModel')
-def test_gemini_client_generate_response_streaming_error(mock_generative_model, mock_configure):
+def test_gemini_client_generate_response_streaming_error(genai_mocks, patched_settings):
     """Tests streaming response handling when an error occurs during streaming."""
+    mock_generative_model = genai_mocks["GenerativeModel"]
     mock_model_instance = MagicMock()
     mock_generative_model.return_value = mock_model_instance
 
     # Simulate a streaming response that raises an exception
     def mock_streaming_response_generator_with_error():
-        chunk1 = MagicMock(spec=GenerateContentResponse)
-        chunk1.parts = [MagicMock(spec=Part, text="Chunk 1 ")]
-        yield chunk1
+        yield STREAM_CHUNKS[0]
         raise Exception("Simulated streaming error")
 
     mock_model_instance.generate_content.return_value = mock_streaming_response_generator_with_error()
 
-    with patch('src.llm.gemini.settings') as mock_settings:
-        mock_settings.GEMINI_API_KEY = "dummy_api_key"
-        client = GeminiClient()
+    client = GeminiClient()
 
     prompt = "Test prompt"
     response_generator = client.generate_response(prompt, stream=True)
@@ -135,32 +129,26 @@ def test_gemini_client_generate_response_streaming_error(mock_generative_model,
     assert chunks[0] == "Chunk 1 "
     assert "Error during streaming: Simulated streaming error" in chunks[1]
 
-@patch('google.generativeai.configure')
-@patch('google.generativeai.GenerativeModel')
-def test_gemini_client_generate_response_empty_prompt_non_streaming(mock_generative_model, mock_configure):
+def test_gemini_client_generate_response_empty_prompt_non_streaming(genai_mocks, patched_settings):
     """Tests handling of empty prompt in non-streaming mode."""
+    mock_generative_model = genai_mocks["GenerativeModel"]
     mock_model_instance = MagicMock()
     mock_generative_model.return_value = mock_model_instance
 
-    with patch('src.llm.gemini.settings') as mock_settings:
-        mock_settings.GEMINI_API_KEY = "dummy_api_key"
-        client = GeminiClient()
+    client = GeminiClient()
 
     response = client.generate_response("", stream=False)
 
     mock_model_instance.generate_content.assert_not_called() # Should not call API for empty prompt
     assert response == "Error: Prompt cannot be empty."
 
-@patch('google.generativeai.configure')
-@patch('google.generativeai.GenerativeModel')
-def test_gemini_client_generate_response_empty_prompt_streaming(mock_generative_model, mock_configure):
+def test_gemini_client_generate_response_empty_prompt_streaming(genai_mocks, patched_settings):
     """Tests handling of empty prompt in streaming mode."""
+    mock_generative_model = genai_mocks["GenerativeModel"]
     mock_model_instance = MagicMock()
     mock_generative_model.return_value = mock_model_instance
 
-    with patch('src.llm.gemini.settings') as mock_settings:
-        mock_settings.GEMINI_API_KEY = "dummy_api_key"
-        client = GeminiClient()
+    client = GeminiClient()
 
     response_generator = client.generate_response("", stream=True)
 
@@ -175,75 +163,74 @@ from src.llm.prompts import PromptTemplates
 
 # --- Test PromptTemplates ---
 
-def test_prompt_templates_qa_template():
-    """Tests the optimized qa_template."""
-    context = "This is some context."
-    query = "What is the context?"
-    prompt = PromptTemplates.qa_template(context, query)
-
-    assert "Answer the following question based *only* on the provided context." in prompt
-    assert 'If the answer is not in the context, state "I don\'t know."' in prompt # Check escaped quote
-    assert "Context:\nThis is some context." in prompt
-    assert "Question: What is the context?" in prompt
-    assert "Answer:" in prompt
-    # Ensure removed phrases are gone
-    assert "You are a helpful assistant" not in prompt
-    assert "Use the context below" not in prompt
-
-def test_prompt_templates_summarize_template():
-    """Tests the optimized summarize_template."""
-    text = "This is a long text that needs to be summarized. It has multiple sentences."
-    prompt = PromptTemplates.summarize_template(text)
-
-    assert "Summarize the following text concisely and informatively." in prompt
-    assert "Text:\nThis is a long text that needs to be summarized. It has multiple sentences." in prompt
-    assert "Summary:" in prompt
-    # Ensure removed phrases are gone
-    assert "You are a helpful assistant" not in prompt
-
-def test_prompt_templates_policy_analysis_template():
-    """Tests the optimized policy_analysis_template."""
-    context = "Policy document content."
-    policy_query = "Analyze this policy."
-    prompt = PromptTemplates.policy_analysis_template(context, policy_query)
-
-    assert "*Only* using the provided policy document, as a policy expert, analyze the document to answer the following query." in prompt
-    assert 'If the answer is not present, state "Information not found in the policy document."' in prompt
-    assert "Policy Document:\nPolicy document content." in prompt
-    assert "Query: Analyze this policy." in prompt
-    assert "Analysis:" in prompt
-     # Ensure removed phrases are gone
-    assert "You are a policy expert" not in prompt # Check if original phrasing is gone
-    assert "Use the policy document below" not in prompt
-
-def test_prompt_templates_document_update_template():
-    """Tests the optimized document_update_template."""
-    original_text = "Original text."
-    suggested_changes = "Suggested changes."
-    context = "Surrounding context."
-    prompt = PromptTemplates.document_update_template(original_text, suggested_changes, context)
-
-    assert "Update the ORIGINAL TEXT with the SUGGESTED CHANGES, considering the CONTEXT for consistency and maintaining original style. Explain your REASONING." in prompt
-    assert "ORIGINAL TEXT:\nOriginal text." in prompt
-    assert "SUGGESTED CHANGES:\nSuggested changes." in prompt
-    assert "CONTEXT:\nSurrounding context." in prompt
-    assert "REVISED TEXT:" in prompt
-    assert "REASONING:" in prompt
-    # Ensure removed phrases are gone
-    assert "You are an AI assistant" not in prompt
-    assert "Review the ORIGINAL TEXT" not in prompt # Check if original phrasing is gone
-
-def test_prompt_templates_consistency_check_template():
-    """Tests the optimized consistency_check_template."""
-    document_section = "Section content."
-    related_sections = "Related content."
-    prompt = PromptTemplates.consistency_check_template(document_section, related_sections)
-
-    assert "Compare the DOCUMENT SECTION with the RELATED SECTIONS for consistency." in prompt
-    assert "Identify and explain any inconsistencies in information, terminology, or style. Suggest resolutions." in prompt
-    assert "DOCUMENT SECTION:\nSection content." in prompt
-    assert "RELATED SECTIONS:\nRelated content." in prompt
-    assert "Consistency Check Results:" in prompt
-    # Ensure removed phrases are gone
-    assert "You are an AI assistant" not in prompt
-    assert "Review the DOCUMENT SECTION" not in prompt # Check if original phrasing is gone
\ No newline at end of file
+# Substrings each optimized template must contain, and phrasing removed from the originals.
+_QA_EXPECTED = (
+    "Answer the following question based *only* on the provided context.",
+    'If the answer is not in the context, state "I don\'t know."', # Check escaped quote
+    "Context:\nThis is some context.",
+    "Question: What is the context?",
+    "Answer:",
+)
+_QA_FORBIDDEN = ("You are a helpful assistant", "Use the context below")
+
+_SUMMARIZE_EXPECTED = (
+    "Summarize the following text concisely and informatively.",
+    "Text:\nThis is a long text that needs to be summarized. It has multiple sentences.",
+    "Summary:",
+)
+_SUMMARIZE_FORBIDDEN = ("You are a helpful assistant",)
+
+_POLICY_EXPECTED = (
+    "*Only* using the provided policy document, as a policy expert, analyze the document to answer the following query.",
+    'If the answer is not present, state "Information not found in the policy document."',
+    "Policy Document:\nPolicy document content.",
+    "Query: Analyze this policy.",
+    "Analysis:",
+)
+_POLICY_FORBIDDEN = ("You are a policy expert", "Use the policy document below")
+
+_UPDATE_EXPECTED = (
+    "Update the ORIGINAL TEXT with the SUGGESTED CHANGES, considering the CONTEXT for consistency and maintaining original style. Explain your REASONING.",
+    "ORIGINAL TEXT:\nOriginal text.",
+    "SUGGESTED CHANGES:\nSuggested changes.",
+    "CONTEXT:\nSurrounding context.",
+    "REVISED TEXT:",
+    "REASONING:",
+)
+_UPDATE_FORBIDDEN = ("You are an AI assistant", "Review the ORIGINAL TEXT")
+
+_CONSISTENCY_EXPECTED = (
+    "Compare the DOCUMENT SECTION with the RELATED SECTIONS for consistency.",
+    "Identify and explain any inconsistencies in information, terminology, or style. Suggest resolutions.",
+    "DOCUMENT SECTION:\nSection content.",
+    "RELATED SECTIONS:\nRelated content.",
+    "Consistency Check Results:",
+)
+_CONSISTENCY_FORBIDDEN = ("You are an AI assistant", "Review the DOCUMENT SECTION")
+
+@pytest.mark.parametrize("template_fn, args, expected_strs, forbidden_strs", [
+    (PromptTemplates.qa_template, ("This is some context.", "What is the context?"),
+     _QA_EXPECTED, _QA_FORBIDDEN),
+    (PromptTemplates.summarize_template, ("This is a long text that needs to be summarized. It has multiple sentences.",),
+     _SUMMARIZE_EXPECTED, _SUMMARIZE_FORBIDDEN),
+    (PromptTemplates.policy_analysis_template, ("Policy document content.", "Analyze this policy."),
+     _POLICY_EXPECTED, _POLICY_FORBIDDEN),
+    (PromptTemplates.document_update_template, ("Original text.", "Suggested changes.", "Surrounding context."),
+     _UPDATE_EXPECTED, _UPDATE_FORBIDDEN),
+    (PromptTemplates.consistency_check_template, ("Section content.", "Related content."),
+     _CONSISTENCY_EXPECTED, _CONSISTENCY_FORBIDDEN),
+], ids=["qa", "summarize", "policy_analysis", "document_update", "consistency_check"])
+def test_prompt_templates(template_fn, args, expected_strs, forbidden_strs):
+    """Tests that each optimized template has its expected wording and none of the removed phrasing."""
+    prompt = template_fn(*args)
+    assert [s for s in expected_strs if s not in prompt] == []
+    assert [s for s in forbidden_strs if s in prompt] == []
+
+def test_qa_prompt_prefix_is_shared():
+    """The QA prompt starts with the same static prefix whatever the context and query."""
+    prompt_a = PromptTemplates.qa_template("Context A.", "Question A?")
+    prompt_b = PromptTemplates.qa_template("A different, longer context B.", "Question B?")
+    prefix = PromptTemplates.qa_prefix()
+    assert prompt_a.startswith(prefix) and prompt_b.startswith(prefix)
+    assert prompt_a == prefix + PromptTemplates.qa_suffix("Context A.", "Question A?")
+    assert "Context A." not in prefix
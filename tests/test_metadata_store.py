@@ -1,52 +1,73 @@
 import pytest
-import os
 import sqlite3
-import json
+import uuid
 from datetime import datetime
 
 # Assuming MetadataStore is in src/data/metadata_store
-from src.data.metadata_store import MetadataStore
+from src.data import metadata_store as metadata_store_module
+from src.data.metadata_store import MetadataStore, _dump_metadata
 from src.config import settings # To get the base metadata directory
 
-# Define path for the temporary test database
-TEST_METADATA_DIR = "tests/temp_metadata_test_data"
-TEST_DB_PATH = os.path.join(TEST_METADATA_DIR, "test_metadata.db")
+# Unique per process, so pytest-xdist workers each get their own database
+TEST_DB_URI = f"file:metastore_{uuid.uuid4().hex}?mode=memory&cache=shared"
 
-@pytest.fixture(scope="function", autouse=True)
-def setup_and_teardown_database():
+@pytest.fixture(scope="session")
+def db_conn():
     """
-    Fixture to create and remove a temporary database for each test function.
+    One connection to the shared in-memory test database for the whole session, used
+    for all direct checks and cleanup. It has no row factory, so queries return plain
+    tuples. Holding it open also keeps the database alive: a shared-cache in-memory
+    database is dropped when its last connection closes.
     """
-    os.makedirs(TEST_METADATA_DIR, exist_ok=True)
-    # Ensure the database file does not exist before the test
-    if os.path.exists(TEST_DB_PATH):
-        os.remove(TEST_DB_PATH)
+    conn = sqlite3.connect(TEST_DB_URI, uri=True)
+    conn.row_factory = None
+    yield conn
+    conn.close()
+
+@pytest.fixture(scope="session")
+def db_path(db_conn):
+    """URI of the in-memory database shared by the whole test session, so no test touches the disk."""
+    return TEST_DB_URI
 
-    yield # This is where the test function runs
+@pytest.fixture(scope="session")
+def shared_store(db_path):
+    """One MetadataStore for the session, so the schema is created once."""
+    return MetadataStore(db_path=db_path)
 
-    # Teardown: remove the database file and directory
-    if os.path.exists(TEST_DB_PATH):
-        os.remove(TEST_DB_PATH)
-    if os.path.exists(TEST_METADATA_DIR) and not os.listdir(TEST_METADATA_DIR):
-         os.rmdir(TEST_METADATA_DIR)
+@pytest.fixture
+def store(shared_store, db_conn):
+    """
+    The shared store, emptied after each test. MetadataStore opens a connection per
+    call, so a savepoint on a separate connection could not roll its writes back;
+    clearing both tables gives every test the same empty starting state instead.
+    """
+    yield shared_store
+    with db_conn:
+        db_conn.execute("DELETE FROM chunks")
+        db_conn.execute("DELETE FROM documents")
 
 
 # --- Test MetadataStore ---
-def test_metadata_store_initialization():
-    store = MetadataStore(db_path=TEST_DB_PATH)
-    assert os.path.exists(TEST_DB_PATH)
-    # Check if tables were created
-    conn = sqlite3.connect(TEST_DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-    tables = cursor.fetchall()
+def test_metadata_store_initialization(store, db_conn):
+    # Check if tables were created, probing for each one instead of listing them all
+    for table in ("documents", "chunks"):
+        row = db_conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table,)).fetchone()
+        assert row is not None, table
+
+def test_metadata_store_sqlite_pragmas(tmp_path):
+    # WAL needs a database file, so this test uses its own on-disk store
+    db_file = str(tmp_path / "metadata.db")
+    store = MetadataStore(db_path=db_file)
+    conn = sqlite3.connect(db_file)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
     conn.close()
-    table_names = [table[0] for table in tables]
-    assert "documents" in table_names
-    assert "chunks" in table_names
 
-def test_metadata_store_add_document_metadata():
-    store = MetadataStore(db_path=TEST_DB_PATH)
+    conn = store._get_connection()
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1 # NORMAL
+    assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2 # MEMORY
+    conn.close()
+
+def test_metadata_store_add_document_metadata(store, db_conn):
     doc_meta = {
         "file_path": "data/documents/doc1.txt",
         "filename": "doc1.txt",
@@ -62,20 +83,10 @@ def test_metadata_store_add_document_metadata():
     assert doc_id > 0
 
     # Verify the document was added
-    conn = sqlite3.connect(TEST_DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM documents WHERE id = ?", (doc_id,))
-    row = cursor.fetchone()
-    conn.close()
-
-    assert row is not None
-    assert row["file_path"] == doc_meta["file_path"]
-    assert row["filename"] == doc_meta["filename"]
-    assert row["version"] == 1 # Check default version
+    rows = db_conn.execute("SELECT file_path, filename, version FROM documents WHERE id = ?", (doc_id,)).fetchall()
+    assert rows == [(doc_meta["file_path"], doc_meta["filename"], 1)] # Check default version
 
-def test_metadata_store_add_document_metadata_duplicate_path():
-    store = MetadataStore(db_path=TEST_DB_PATH)
+def test_metadata_store_add_document_metadata_duplicate_path(store, db_conn):
     doc_meta_v1 = {
         "file_path": "data/documents/doc_duplicate.txt",
         "filename": "doc_duplicate.txt",
@@ -104,21 +115,12 @@ def test_metadata_store_add_document_metadata_duplicate_path():
     assert doc_id_v2 == doc_id_v1 # Should return the same ID
 
     # Verify the version was incremented and modification time updated
-    conn = sqlite3.connect(TEST_DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM documents WHERE id = ?", (doc_id_v1,))
-    row = cursor.fetchone()
-    conn.close()
-
-    assert row is not None
-    assert row["file_path"] == doc_meta_v1["file_path"] # File path remains the same
-    assert row["filename"] == doc_meta_v1["filename"] # Filename is NOT updated by add_document_metadata
-    assert row["version"] == 2 # Version should be 2
+    # File path remains the same, filename is NOT updated by add_document_metadata, version should be 2
+    rows = db_conn.execute("SELECT file_path, filename, version FROM documents WHERE id = ?", (doc_id_v1,)).fetchall()
+    assert rows == [(doc_meta_v1["file_path"], doc_meta_v1["filename"], 2)]
     # Note: modification_time check is tricky due to timing, skip for now
 
-def test_metadata_store_add_chunk_metadata():
-    store = MetadataStore(db_path=TEST_DB_PATH)
+def test_metadata_store_add_chunk_metadata(store, db_conn):
     doc_meta = {
         "file_path": "data/documents/doc_with_chunks.txt",
         "filename": "doc_with_chunks.txt",
@@ -138,24 +140,43 @@ def test_metadata_store_add_chunk_metadata():
     store.add_chunk_metadata(doc_id, chunks_meta)
 
     # Verify chunks were added
-    conn = sqlite3.connect(TEST_DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM chunks WHERE document_id = ? ORDER BY chunk_index", (doc_id,))
-    rows = cursor.fetchall()
-    conn.close()
+    # Metadata is stored with sorted keys, so the JSON text can be compared directly
+    rows = db_conn.execute("SELECT document_id, chunk_index, chunk_type, metadata FROM chunks WHERE document_id = ? ORDER BY chunk_index", (doc_id,)).fetchall()
+    assert rows == [
+        (doc_id, chunk["chunk_index"], chunk["chunk_type"], _dump_metadata(chunk["metadata"]))
+        for chunk in chunks_meta
+    ]
+
+def test_metadata_store_dump_metadata_matches_json_fallback(monkeypatch):
+    # Stored text must not depend on whether orjson is installed
+    metadata = {"page": 2, "source": "doc.txt", "title": "Übersicht", "tags": ["a", "b"], "score": None}
+    encoded = _dump_metadata(metadata)
+    monkeypatch.setattr(metadata_store_module, "orjson", None)
+    assert _dump_metadata(metadata) == encoded
+    assert metadata_store_module._load_metadata(encoded) == metadata
+
+@pytest.mark.parametrize("use_orjson", [True, False], ids=["orjson", "json"])
+def test_metadata_store_non_string_metadata_keys(store, monkeypatch, use_orjson):
+    # json.dumps writes non-string keys as strings; the stored chunk must not be dropped
+    if not use_orjson:
+        monkeypatch.setattr(metadata_store_module, "orjson", None)
+    doc_id = store.add_document_metadata({
+        "file_path": f"data/documents/int_keys_{use_orjson}.txt",
+        "filename": "int_keys.txt",
+        "file_type": ".txt", "size": 10,
+        "creation_time": datetime.now().isoformat(),
+        "modification_time": datetime.now().isoformat(),
+        "title": "Int Keys", "author": "Author K"
+    })
+    store.add_chunk_metadata(doc_id, [
+        {"chunk_index": 0, "chunk_type": "table", "content": "table chunk", "metadata": {1: "a", "page": 3}},
+    ])
+
+    retrieved_chunks = store.get_chunks_by_document_id(doc_id)
+    assert len(retrieved_chunks) == 1
+    assert retrieved_chunks[0]["metadata"] == {"1": "a", "page": 3}
 
-    assert len(rows) == len(chunks_meta)
-    for i, row in enumerate(rows):
-        assert row["document_id"] == doc_id
-        assert row["chunk_index"] == chunks_meta[i]["chunk_index"]
-        assert row["chunk_type"] == chunks_meta[i]["chunk_type"]
-        # Check JSON metadata
-        retrieved_metadata = json.loads(row["metadata"])
-        assert retrieved_metadata == chunks_meta[i]["metadata"]
-
-def test_metadata_store_get_document_by_path():
-    store = MetadataStore(db_path=TEST_DB_PATH)
+def test_metadata_store_get_document_by_path(store):
     doc_meta = {
         "file_path": "data/documents/doc_to_get.txt",
         "filename": "doc_to_get.txt",
@@ -176,8 +197,7 @@ def test_metadata_store_get_document_by_path():
     non_existent_doc = store.get_document_by_path("non_existent.txt")
     assert non_existent_doc is None
 
-def test_metadata_store_get_chunks_by_document_id():
-    store = MetadataStore(db_path=TEST_DB_PATH)
+def test_metadata_store_get_chunks_by_document_id(store):
     doc_meta = {
         "file_path": "data/documents/doc_get_chunks.txt",
         "filename": "doc_get_chunks.txt",
@@ -203,9 +223,107 @@ def test_metadata_store_get_chunks_by_document_id():
     for i, chunk in enumerate(retrieved_chunks):
         assert chunk["document_id"] == doc_id
         assert chunk["chunk_index"] == i # Check order
-        assert json.loads(chunk["metadata"]) == chunks_meta[i]["metadata"] # Check metadata content
+        assert chunk["metadata"] == chunks_meta[i]["metadata"] # Metadata comes back decoded
 
     # Test retrieving chunks for a non-existent document ID
     retrieved_chunks_non_existent = store.get_chunks_by_document_id(999)
     assert isinstance(retrieved_chunks_non_existent, list)
-    assert len(retrieved_chunks_non_existent) == 0
\ No newline at end of file
+    assert len(retrieved_chunks_non_existent) == 0
+
+
+def test_metadata_store_get_chunks_by_ids(store):
+    doc_id = store.add_document_metadata({"file_path": "data/documents/doc_by_ids.txt", "filename": "doc_by_ids.txt"})
+    # More chunks than SQLite allows host parameters in one statement
+    store.add_chunk_metadata(doc_id, [{"chunk_index": i, "content": f"chunk {i}", "metadata": {}} for i in range(1500)])
+    ids = [chunk["id"] for chunk in store.get_chunks_by_document_id(doc_id)]
+
+    chunks = store.get_chunks_by_ids(ids + [ids[0], 999999])
+    assert set(chunks) == set(ids) # Duplicates collapse and unknown IDs are left out
+    assert all(chunks[chunk_id]["id"] == chunk_id for chunk_id in ids)
+    assert chunks[ids[-1]]["content"] == "chunk 1499"
+    assert store.get_chunks_by_ids([]) == {}
+
+def test_metadata_store_chunk_metadata_parsing(store):
+    doc_id = store.add_document_metadata({"file_path": "data/documents/doc_parse.txt", "filename": "doc_parse.txt"})
+    store.add_chunk_metadata(doc_id, [{"chunk_index": 0, "content": "chunk", "metadata": {"topic": "test", "page": 1}}])
+    chunk_id = store.get_chunks_by_document_id(doc_id)[0]["id"]
+
+    # Decoded once at read time by default, the stored JSON string on request
+    assert store.get_chunk_by_id(chunk_id)["metadata"] == {"topic": "test", "page": 1}
+    assert store.get_chunks_by_ids([chunk_id])[chunk_id]["metadata"] == {"topic": "test", "page": 1}
+    raw = _dump_metadata({"topic": "test", "page": 1})
+    assert store.get_chunk_by_id(chunk_id, parse_metadata=False)["metadata"] == raw
+    assert store.get_chunks_by_ids([chunk_id], parse_metadata=False)[chunk_id]["metadata"] == raw
+
+
+def test_metadata_store_get_previous_chunk(store):
+    doc_id = store.add_document_metadata({"file_path": "data/documents/doc_prev.txt", "filename": "doc_prev.txt"})
+    store.add_chunk_metadata(doc_id, [{"chunk_index": i, "content": f"chunk {i}", "metadata": {"page": i}} for i in range(2)])
+    first_id, second_id = (chunk["id"] for chunk in store.get_chunks_by_document_id(doc_id))
+
+    previous = store.get_previous_chunk(second_id)
+    assert previous["id"] == first_id
+    assert previous["metadata"] == {"page": 0}
+    assert store.get_previous_chunk(second_id, parse_metadata=False)["metadata"] == _dump_metadata({"page": 0})
+    assert store.get_previous_chunk(first_id) is None
+
+def test_metadata_store_get_next_chunk(store):
+    doc_id = store.add_document_metadata({"file_path": "data/documents/doc_next.txt", "filename": "doc_next.txt"})
+    store.add_chunk_metadata(doc_id, [{"chunk_index": i, "content": f"chunk {i}", "metadata": {"page": i}} for i in range(2)])
+    first_id, second_id = (chunk["id"] for chunk in store.get_chunks_by_document_id(doc_id))
+
+    following = store.get_next_chunk(first_id)
+    assert following["id"] == second_id
+    assert following["metadata"] == {"page": 1}
+    assert store.get_next_chunk(first_id, parse_metadata=False)["metadata"] == _dump_metadata({"page": 1})
+    assert store.get_next_chunk(second_id) is None
+
+@pytest.mark.parametrize("sql, params", [
+    ("SELECT * FROM chunks WHERE document_id = ? ORDER BY chunk_index", (1,)),
+    ("SELECT * FROM documents WHERE file_path = ?", ("data/documents/doc1.txt",)),
+], ids=["chunks_by_document", "document_by_path"])
+def test_metadata_store_lookups_use_index(store, db_conn, sql, params):
+    # The UNIQUE constraints back these lookups with indexes; no full scan or sort step
+    plan = [row[-1] for row in db_conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()]
+    assert any("USING INDEX" in step or "USING COVERING INDEX" in step for step in plan), plan
+    assert not any("TEMP B-TREE" in step for step in plan), plan
+
+class _CountingCursor(sqlite3.Cursor):
+    """Cursor that tallies execute/executemany calls into its connection's counts."""
+    def execute(self, *args, **kwargs):
+        self.connection.counts["execute"] += 1
+        return super().execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        self.connection.counts["executemany"] += 1
+        return super().executemany(*args, **kwargs)
+
+def test_metadata_store_add_chunks_is_batched(store, monkeypatch):
+    doc_id = store.add_document_metadata({"file_path": "data/documents/doc_batched.txt", "filename": "doc_batched.txt"})
+    assert doc_id is not None
+
+    counts = {"execute": 0, "executemany": 0}
+    class CountingConnection(sqlite3.Connection):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.counts = counts
+
+        def cursor(self, factory=_CountingCursor):
+            return super().cursor(factory)
+
+    real_connect = sqlite3.connect
+    monkeypatch.setattr(sqlite3, "connect", lambda *args, **kwargs: real_connect(*args, factory=CountingConnection, **kwargs))
+
+    chunks_meta = [{"chunk_index": i, "chunk_type": "p", "content": f"chunk {i}", "metadata": {"i": i}} for i in range(10000)]
+    store.add_chunk_metadata(doc_id, chunks_meta)
+    monkeypatch.undo()
+
+    # The rows and their previous/next links must go in as batches, not one statement per chunk
+    assert counts["execute"] <= 3
+    assert counts["executemany"] >= 1
+
+    chunks = store.get_chunks_by_document_id(doc_id)
+    assert len(chunks) == len(chunks_meta)
+    assert chunks[0]["previous_chunk_id"] is None
+    assert chunks[-1]["next_chunk_id"] is None
+    assert all(a["next_chunk_id"] == b["id"] and b["previous_chunk_id"] == a["id"] for a, b in zip(chunks, chunks[1:]))
@@ -1,5 +1,5 @@
 import pytest
-import json
+import numpy as np
 from typing import List, Dict, Any, Optional
 from unittest.mock import MagicMock
 
@@ -11,8 +11,20 @@ from src.llm.gemini import GeminiClient
 
 # Mock classes and functions for testing
 class MockEmbeddingModel:
-    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
-        return [[0.1 * i for i in range(384)] for _ in range(len(texts))]  # Dummy embeddings
+    _ROW = (0.1 * np.arange(384)).astype(np.float32)
+
+    def generate_embeddings(self, texts: List[str]) -> np.ndarray:
+        # Dummy embeddings with EmbeddingModel's shape/dtype: a read-only broadcast view of one
+        # row, so no per-call buffer is filled (the Retriever only reads embeddings)
+        return np.broadcast_to(self._ROW, (len(texts), self._ROW.shape[0]))
+
+class MockTextEmbeddingModel:
+    """Embeds each text as the vector registered for it, so queries can be made similar or not."""
+    def __init__(self, vectors: Dict[str, np.ndarray]):
+        self.vectors = vectors
+
+    def generate_embeddings(self, texts: List[str]) -> np.ndarray:
+        return np.stack([self.vectors[text] for text in texts])
 
 class MockVectorStore:
     def search(self, query_embedding: List[float], k: int = 5) -> List[Dict[str, Any]]:
@@ -28,12 +40,16 @@ class MockMetadataStore:
             "chunk_index": chunk_id,
             "content": f"This is chunk {chunk_id}.",
             "chunk_type": "paragraph",
-            "metadata": json.dumps({"topic": "test"}),
+            "metadata": {"topic": "test"},
         }
+    def get_chunks_by_ids(self, chunk_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        return {chunk_id: self.get_chunk_by_id(chunk_id) for chunk_id in chunk_ids}
+
     def _get_connection(self):
-        # Mock the _get_connection method
+        # Mock the _get_connection method; the cursor yields the (id, content) rows BM25 is built from
         conn = MagicMock()
         cursor = MagicMock()
+        cursor.fetchall.return_value = [(i, f"This is chunk {i}.") for i in range(10)]
         conn.cursor.return_value = cursor
         return conn
 
@@ -46,7 +62,7 @@ class MockMetadataStore:
                 "chunk_index": 0,
                 "content": "This is chunk 1 for document " + str(document_id),
                 "chunk_type": "paragraph",
-                "metadata": json.dumps({"topic": "test"}),
+                "metadata": {"topic": "test"},
             },
             {
                 "id": 2,
@@ -54,7 +70,7 @@ class MockMetadataStore:
                 "chunk_index": 1,
                 "content": "This is chunk 2 for document " + str(document_id),
                 "chunk_type": "paragraph",
-                "metadata": json.dumps({"topic": "test"}),
+                "metadata": {"topic": "test"},
             },
         ]
 
@@ -62,15 +78,23 @@ class MockGeminiClient:
     def generate_response(self, prompt: str) -> str:
         return "This is a dummy response."
 
-@pytest.fixture
-def retriever():
+@pytest.fixture(scope="module")
+def shared_retriever():
+    """One Retriever for the module, with its BM25 index built once up front."""
     embedding_model = MockEmbeddingModel()
     vector_store = MockVectorStore()
     metadata_store = MockMetadataStore()
     gemini_client = MockGeminiClient()
     retriever = Retriever(embedding_model, vector_store, metadata_store, gemini_client)
+    retriever.build_bm25_index()
     return retriever
 
+@pytest.fixture
+def retriever(shared_retriever):
+    """The shared Retriever, with its retrieval cache emptied after each test."""
+    yield shared_retriever
+    shared_retriever.clear_cache()
+
 def test_retrieve_basic(retriever: Retriever):
     query = "test query"
     results = retriever.retrieve(query, k=3)
@@ -85,7 +109,7 @@ def test_retrieve_metadata_filtering(retriever: Retriever):
     assert len(results) == 3
     assert all("content" in r for r in results)
     assert all("response" in r for r in results)
-    assert all(json.loads(r["metadata"]).get("topic") == "test" for r in results)
+    assert all(r["metadata"].get("topic") == "test" for r in results)
 
 def test_retrieve_context_window_management(retriever: Retriever):
     query = "test query"
@@ -118,4 +142,38 @@ def test_retrieve_caching(retriever: Retriever, capsys):
     results_pass3 = retriever.retrieve(query, k=k)
     captured3 = capsys.readouterr()
     assert "Retrieving results from cache - MISS" in captured3.out
-    assert results_pass1 == results_pass3 # Results should still be identical if retrieval is deterministic
\ No newline at end of file
+    assert results_pass1 == results_pass3 # Results should still be identical if retrieval is deterministic
+
+def test_retrieve_semantic_cache(capsys):
+    """Tests that similar vector queries reuse retrieved chunks but get their own response."""
+    rng = np.random.default_rng(42) # Not 0: the cache draws its hyperplanes from seed 0
+    base = rng.standard_normal(384).astype(np.float32)
+    noise = rng.standard_normal(384).astype(np.float32)
+    embedding_model = MockTextEmbeddingModel({
+        "test query": base,
+        "Test query?": base + 0.01 * noise, # Cosine ~0.9999, above the 0.95 threshold
+        "Another query": base + 0.5 * noise, # Cosine ~0.89, below the threshold
+    })
+    gemini_client = MagicMock()
+    gemini_client.generate_response.side_effect = lambda prompt: prompt # Echo, to see which query was answered
+    retriever = Retriever(embedding_model, MockVectorStore(), MockMetadataStore(), gemini_client)
+    retriever.build_bm25_index()
+    capsys.readouterr()
+
+    results = retriever.retrieve("test query", k=3, search_type="vector")
+    assert "Retrieving results from cache - MISS" in capsys.readouterr().out
+
+    # Above the threshold: the chunks come from the semantic cache, the response is for this query
+    results_similar = retriever.retrieve("Test query?", k=3, search_type="vector")
+    assert "Retrieving results from cache - HIT (semantic)" in capsys.readouterr().out
+    assert [r["id"] for r in results_similar] == [r["id"] for r in results]
+    assert "Test query?" in results_similar[0]["response"]
+    assert gemini_client.generate_response.call_count == 2
+
+    # Below the threshold: a full retrieval
+    retriever.retrieve("Another query", k=3, search_type="vector")
+    assert "Retrieving results from cache - MISS" in capsys.readouterr().out
+
+    # Hybrid results depend on the query's words through BM25, so they are never reused
+    retriever.retrieve("Test query?", k=3, search_type="hybrid")
+    assert "Retrieving results from cache - MISS" in capsys.readouterr().out
@@ -1,8 +1,6 @@
 import pytest
-import os
-import shutil
-from unittest.mock import MagicMock, patch
-import json
+from unittest.mock import patch
+import numpy as np
 
 # Assuming modules are in src/rag
 from src.rag.embeddings import EmbeddingModel
@@ -11,51 +9,37 @@ from src.data.metadata_store import MetadataStore
 from src.rag.retriever import Retriever
 from src.llm.gemini import GeminiClient
 from src.llm.prompts import PromptTemplates
+from tests.helpers import spec_mock
 
-# Define paths for temporary test data
-TEST_RETRIEVAL_DIR = "tests/temp_retrieval_test_data"
-TEST_VECTOR_DB_DIR = os.path.join(TEST_RETRIEVAL_DIR, "vector_db")
-TEST_METADATA_DB_PATH = os.path.join(TEST_RETRIEVAL_DIR, "metadata.db")
-TEST_DOCUMENTS_DIR = os.path.join(TEST_RETRIEVAL_DIR, "documents")
-DUMMY_DOCX_PATH = os.path.join(TEST_DOCUMENTS_DIR, "dummy_retrieval_test.docx")
+# Scratch paths and a dummy DOCX, if a test needs them, come from the
+# session-scoped retrieval_test_data fixture in conftest.py
 
-@pytest.fixture(scope="module", autouse=True)
-def setup_and_teardown_retriever_test_data():
-    """
-    Fixture to create and remove temporary directories and dummy files for Retriever tests.
-    """
-    os.makedirs(TEST_VECTOR_DB_DIR, exist_ok=True)
-    os.makedirs(os.path.dirname(TEST_METADATA_DB_PATH), exist_ok=True)
-    os.makedirs(TEST_DOCUMENTS_DIR, exist_ok=True)
-
-    # Create a simple dummy docx file for indexing test
-    try:
-        from docx import Document as DocxDocument
-        doc = DocxDocument()
-        doc.add_paragraph("This is a test document for RAG retrieval.")
-        doc.add_paragraph("It has a second paragraph about keyword matching.")
-        doc.save(DUMMY_DOCX_PATH)
-    except ImportError:
-        print("python-docx not installed, skipping dummy docx creation.")
-    except Exception as e:
-        print(f"Error creating dummy docx for RAG test: {e}")
-
-    yield # This is where the tests run
-
-    # Teardown: remove temporary directory
-    if os.path.exists(TEST_RETRIEVAL_DIR):
-        shutil.rmtree(TEST_RETRIEVAL_DIR)
+# Chunk rows served by the mocked metadata store, built once; the Retriever copies
+# rows before annotating them, so sharing them between tests is safe
+_CHUNK_META = {"page": 1, "source": "test_doc.txt"}
+_CHUNK_TABLE = {
+    i: {"id": i, "content": f"This is chunk content for chunk ID {i}.", "metadata": _CHUNK_META}
+    for i in range(32)
+}
+_DOCUMENT_CHUNKS = [
+    {"id": 1, "chunk_index": 0, "content": "chunk 1 content", "metadata": {"page": 1}},
+    {"id": 2, "chunk_index": 1, "content": "chunk 2 content", "metadata": {"page": 1}},
+    {"id": 3, "chunk_index": 2, "content": "chunk 3 content", "metadata": {"page": 2}},
+]
 
 # Mock dependencies for Retriever test
 @pytest.fixture
 def mock_embedding_model():
-    mock = MagicMock(spec=EmbeddingModel)
-    mock.generate_embeddings.side_effect = lambda texts: [[i * 0.1] * 10 for i in range(len(texts))] # Return dummy embeddings
+    mock = spec_mock(EmbeddingModel)
+    # Dummy (len(texts), 10) float32 embeddings; row i is filled with i * 0.1 (a read-only broadcast view)
+    mock.generate_embeddings.side_effect = lambda texts: np.broadcast_to(
+        0.1 * np.arange(len(texts), dtype=np.float32)[:, None], (len(texts), 10)
+    )
     return mock
 
 @pytest.fixture
 def mock_vector_store():
-    mock = MagicMock(spec=VectorStore)
+    mock = spec_mock(VectorStore)
     mock.search.return_value = [
         {"external_id": "1", "distance": 0.1},
         {"external_id": "2", "distance": 0.2},
@@ -66,22 +50,17 @@ def mock_vector_store():
 
 @pytest.fixture
 def mock_metadata_store():
-    mock = MagicMock(spec=MetadataStore)
-    mock.get_chunk_by_id.side_effect = lambda chunk_id: {
-        "id": chunk_id,
-        "content": f"This is chunk content for chunk ID {chunk_id}.",
-        "metadata": json.dumps({"page": 1, "source": "test_doc.txt"})
+    mock = spec_mock(MetadataStore)
+    mock.get_chunk_by_id.side_effect = _CHUNK_TABLE.get
+    mock.get_chunks_by_ids.side_effect = lambda chunk_ids: {
+        chunk_id: _CHUNK_TABLE[chunk_id] for chunk_id in chunk_ids if chunk_id in _CHUNK_TABLE
     }
-    mock.get_chunks_by_document_id.return_value = [
-        {"id": 1, "chunk_index": 0, "content": "chunk 1 content", "metadata": json.dumps({"page": 1})},
-        {"id": 2, "chunk_index": 1, "content": "chunk 2 content", "metadata": json.dumps({"page": 1})},
-        {"id": 3, "chunk_index": 2, "content": "chunk 3 content", "metadata": json.dumps({"page": 2})},
-    ]
+    mock.get_chunks_by_document_id.return_value = _DOCUMENT_CHUNKS
     return mock
 
 @pytest.fixture
 def mock_gemini_client():
-    mock = MagicMock(spec=GeminiClient)
+    mock = spec_mock(GeminiClient)
     mock.generate_response.return_value = "This is a generated response from Gemini."
     return mock
 
@@ -102,6 +81,12 @@ def test_retriever_retrieve(mock_embedding_model, mock_vector_store, mock_metada
     assert "metadata" in results[0]
     assert "response" in results[0]
     assert results[0]["response"] == "This is a generated response from Gemini."
+    # One LLM round trip answers over all selected chunks; it is not repeated per chunk
+    mock_gemini_client.generate_response.assert_called_once()
+    assert all(r["response"] == results[0]["response"] for r in results)
+    # Chunk rows are read in batches, never one get_chunk_by_id call per hit
+    mock_metadata_store.get_chunk_by_id.assert_not_called()
+    assert mock_metadata_store.get_chunks_by_ids.call_count <= 2
 
 def test_retriever_retrieve_empty_query(mock_embedding_model, mock_vector_store, mock_metadata_store, mock_gemini_client):
     retriever = Retriever(mock_embedding_model, mock_vector_store, mock_metadata_store, mock_gemini_client)
@@ -112,7 +97,7 @@ def test_retriever_retrieve_empty_query(mock_embedding_model, mock_vector_store,
 
 def test_retriever_retrieve_no_results(mock_embedding_model, mock_metadata_store, mock_gemini_client):
     # Mock vector store to return no results
-    mock_vector_store = MagicMock(spec=VectorStore)
+    mock_vector_store = spec_mock(VectorStore)
     mock_vector_store.search.return_value = []
     mock_vector_store.get_size.return_value = 0
 
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from src.rag.semantic_cache import LSHCache
+
+DIM = 64
+
+@pytest.fixture
+def cache():
+    return LSHCache(n_planes=16, threshold=0.95, seed=0)
+
+def _vector(seed: int) -> np.ndarray:
+    return np.random.default_rng(seed).standard_normal(DIM).astype(np.float32)
+
+def test_lsh_cache_hits_same_and_near_duplicate_embedding(cache):
+    base = _vector(1)
+    cache.put(base, "cached")
+    assert cache.get(base) == "cached"
+    assert cache.get(base * 3.0) == "cached" # Only the direction matters
+    # A tiny perturbation keeps the cosine well above the threshold and almost always the bucket
+    assert cache.get(base + 1e-4 * _vector(2)) == "cached"
+
+def test_lsh_cache_misses_dissimilar_embedding(cache):
+    cache.put(_vector(1), "cached")
+    assert cache.get(_vector(3)) is None
+    assert cache.get(-_vector(1)) is None
+
+def test_lsh_cache_namespaces_are_separate(cache):
+    base = _vector(1)
+    cache.put(base, "k=3", namespace="k=3")
+    assert cache.get(base, namespace="k=3") == "k=3"
+    assert cache.get(base, namespace="k=5") is None
+
+def test_lsh_cache_returns_most_similar_entry(cache):
+    base = _vector(1)
+    cache.put(base + 0.05 * _vector(2), "further")
+    cache.put(base, "closest")
+    assert cache.get(base) == "closest"
+
+def test_lsh_cache_ignores_zero_embedding_and_clears(cache):
+    cache.put(np.zeros(DIM), "zero")
+    assert len(cache) == 0
+    assert cache.get(np.zeros(DIM)) is None
+
+    cache.put(_vector(1), "cached")
+    assert len(cache) == 1
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.get(_vector(1)) is None
+
+def test_lsh_cache_evicts_least_recently_used():
+    cache = LSHCache(n_planes=16, threshold=0.95, max_entries=2, seed=0)
+    cache.put(_vector(1), "first")
+    cache.put(_vector(2), "second")
+    assert cache.get(_vector(1)) == "first" # Now more recently used than "second"
+    cache.put(_vector(3), "third")
+    assert len(cache) == 2
+    assert cache.get(_vector(2)) is None
+    assert cache.get(_vector(1)) == "first"
+    assert cache.get(_vector(3)) == "third"
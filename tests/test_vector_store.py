@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("faiss")
+from src.rag.vector_store import VectorStore
+
+@pytest.fixture
+def store(tmp_path):
+    return VectorStore(index_path=str(tmp_path))
+
+@pytest.mark.parametrize("ids", [
+    [1, 2, 3],
+    [np.int64(4), 5],
+    ["a", "b"],
+    [""], # Would read back as [] from the .txt format
+    ["a", np.int64(7)], # numpy integer mixed with str IDs
+    [],
+], ids=["int", "numpy_int", "str", "empty_str", "mixed", "empty"])
+def test_vector_store_id_map_round_trip(store, ids):
+    store.index_id_to_external_id = ids
+    store._save_id_map()
+    assert store._load_id_map() == [int(i) if isinstance(i, np.integer) else i for i in ids]
+
+def test_vector_store_converts_legacy_pickled_id_map(store):
+    legacy_ids = ["chunk-1", 2]
+    np.save(store._id_map_file, np.asarray(legacy_ids, dtype=object), allow_pickle=True)
+
+    assert store._load_id_map() == legacy_ids
+    # Rewritten in a pickle-free format, and read back from it next time
+    assert store._load_id_map() == legacy_ids
+    with pytest.raises(FileNotFoundError):
+        np.load(store._id_map_file, allow_pickle=False)
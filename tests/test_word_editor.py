@@ -1,6 +1,10 @@
 # tests/test_word_editor.py
 import unittest
 import os
+import io
+import tempfile
+import copy
+import pytest
 from docx import Document
 from docx.shared import Pt
 from docx.enum.text import WD_ALIGN_PARAGRAPH
@@ -8,49 +12,144 @@ from src.editing.word_editor import WordEditor
 from src.editing.change_model import DocumentChange, ChangeType, LocationParagraph, LocationTable, LocationSection
 from docx.shared import RGBColor # Needed for color checks
 
+# python-docx parses its bundled default template on every Document(); parse it once
+_BLANK = Document()
+# Style names of the default template, collected once; tests needing a missing style are skipped
+_STYLE_NAMES = {style.name for style in _BLANK.styles}
+_HAVE_H1 = 'Heading 1' in _STYLE_NAMES
+_HAVE_HEADING_STYLES = {'Title', 'Heading 1', 'Heading 2'} <= _STYLE_NAMES
+
+# (text, style) of each paragraph in the test_08 heading document
+_HEADING_DOC_PARAS = (
+    ("Document Title", 'Title'),
+    ("Introduction", 'Heading 1'),
+    ("This is the first paragraph of the intro.", None),
+    ("This is the second paragraph of the intro.", None),
+    ("Methods", 'Heading 1'),
+    ("Details about methods.", None),
+    ("Sub-heading", 'Heading 2'), # Lower level heading
+    ("Details under sub-heading.", None),
+    ("Conclusion", 'Heading 1'),
+    ("Final thoughts.", None),
+)
+# Original paras: Title, H1-Intro, P1, P2, H1-Methods, P-Meth, H2-Sub, P-Sub, H1-Conc, P-Final (10 paras, idx 0-9)
+_HEADING_DOC_TEXTS = tuple(text for text, _ in _HEADING_DOC_PARAS)
+
+# test_08 replacement content and the paragraph texts expected afterwards
+_NEW_INTRO = ("New intro line 1.", "New intro line 2.")
+_NEW_CONCLUSION = ("The very end, part 1.", "The very end, part 2.")
+_NEW_METHODS = ("New method details only.",)
+_NEW_SUBHEADING = ("Fresh sub-details.",)
+# P1 and P2 replaced; the section ends at the next H1 ("Methods")
+_EXPECTED_CASE1 = _HEADING_DOC_TEXTS[:2] + _NEW_INTRO + _HEADING_DOC_TEXTS[4:]
+# H1-Conc is at index 8; P-Final replaced by the 2 new paragraphs (11 paras)
+_EXPECTED_CASE3 = _HEADING_DOC_TEXTS[:9] + _NEW_CONCLUSION
+# P-Meth, H2-Sub (lower level, so part of the section) and P-Sub replaced (8 paras)
+_EXPECTED_CASE5 = _HEADING_DOC_TEXTS[:5] + _NEW_METHODS + _HEADING_DOC_TEXTS[8:]
+# P-Sub replaced; the H2 section ends at H1-Conc (10 paras)
+_EXPECTED_CASE6 = _HEADING_DOC_TEXTS[:7] + _NEW_SUBHEADING + _HEADING_DOC_TEXTS[8:]
+# The same 3 paragraphs as case 5 removed and none added, so 10 - 3 = 7 remain
+_EXPECTED_CASE7 = _HEADING_DOC_TEXTS[:5] + _HEADING_DOC_TEXTS[8:]
+
+def fresh_editor():
+    """Returns an editor on a new blank document, copied from the cached template."""
+    return WordEditor.from_document(copy.deepcopy(_BLANK))
+
+@pytest.fixture(scope="class")
+def existing_bytes_on_class(request, existing_docx_bytes):
+    """Exposes the session-wide sample document bytes to the unittest class."""
+    request.cls._existing_bytes = existing_docx_bytes
+
+@pytest.mark.usefixtures("existing_bytes_on_class")
 class TestWordEditor(unittest.TestCase):
     """
     Unit tests for the WordEditor class.
+
+    The numbered tests are independent of each other and of run order; shared documents
+    are built once per class and every test works on its own copy, so the class can be
+    split across pytest-xdist workers.
     """
-    TEST_DOC_DIR = "test_docs"
-    NEW_DOC_PATH = os.path.join(TEST_DOC_DIR, "test_new_document.docx")
-    EXISTING_DOC_PATH = os.path.join(TEST_DOC_DIR, "test_existing_document.docx")
-    SAVED_DOC_PATH = os.path.join(TEST_DOC_DIR, "test_saved_document.docx")
 
     @classmethod
     def setUpClass(cls):
-        """Set up test directory and a sample existing document."""
-        if not os.path.exists(cls.TEST_DOC_DIR):
-            os.makedirs(cls.TEST_DOC_DIR)
+        """Set up a temporary test directory and the shared template documents."""
+        cls._tmp = tempfile.TemporaryDirectory()
+        cls.TEST_DOC_DIR = cls._tmp.name
+        cls.SAVED_DOC_PATH = os.path.join(cls.TEST_DOC_DIR, "test_saved_document.docx")
+
+        # The sample existing document comes from the session-scoped existing_docx_bytes
+        # fixture in conftest.py; each test loads its own copy via _load_existing()
+
+        # Formatting sources for test_05/test_06, deep-copied by each test:
+        # paragraph 0 holds the formatted source run, paragraph 1 is the formatted source paragraph
+        fmt_doc = copy.deepcopy(_BLANK)
+        source_run = fmt_doc.add_paragraph().add_run("Source Run")
+        source_run.bold = True
+        source_run.italic = False
+        source_run.underline = True
+        source_run.font.name = "Times New Roman"
+        source_run.font.size = Pt(10)
+        source_run.font.strike = True
+        # source_run.font.highlight_color = WD_COLOR_INDEX.YELLOW # Requires WD_COLOR_INDEX
 
-        # Create a sample document for loading tests
-        doc = Document()
-        p1 = doc.add_paragraph()
-        run1 = p1.add_run("Hello, existing world!")
-        run1.bold = True
-        run1.font.name = 'Arial'
-        run1.font.size = Pt(12)
-        p1.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        doc.add_paragraph("This is the second paragraph.")
-        doc.save(cls.EXISTING_DOC_PATH)
+        source_paragraph = fmt_doc.add_paragraph("Source Paragraph")
+        if _HAVE_H1: # test_06 is skipped otherwise
+            source_paragraph.style = 'Heading 1'
+        source_paragraph.alignment = WD_ALIGN_PARAGRAPH.RIGHT
+        source_pf = source_paragraph.paragraph_format
+        source_pf.left_indent = Pt(36) # 0.5 inch
+        source_pf.right_indent = Pt(72) # 1 inch
+        source_pf.space_before = Pt(6)
+        source_pf.space_after = Pt(12)
+        source_pf.line_spacing = 1.5
+        source_pf.keep_with_next = True
+        cls._fmt_source_doc = fmt_doc
+
+        # Heading document for test_08, deep-copied by each of its cases. It needs the
+        # 'Title', 'Heading 1' and 'Heading 2' styles; without them test_08 is skipped.
+        if _HAVE_HEADING_STYLES:
+            heading_doc = copy.deepcopy(_BLANK)
+            for text, style in _HEADING_DOC_PARAS:
+                heading_doc.add_paragraph(text, style=style)
+            cls._heading_doc = heading_doc
+
+        # Table documents for test_11-test_13; tests that edit them work on a deep copy
+        cls._table2x2_doc = copy.deepcopy(_BLANK)
+        table = cls._table2x2_doc.add_table(rows=2, cols=2)
+        table.cell(0, 0).text = "R0C0"
+        table.cell(0, 1).text = "R0C1"
+        table.cell(1, 0).text = "R1C0"
+        table.cell(1, 1).text = "R1C1"
+        cls._table1x1_doc = copy.deepcopy(_BLANK)
+        cls._table1x1_doc.add_table(rows=1, cols=1).cell(0,0).text = "Old Text"
+        cls._table1x2_doc = copy.deepcopy(_BLANK)
+        cls._table1x2_doc.add_table(rows=1, cols=2)
 
     @classmethod
     def tearDownClass(cls):
-        """Clean up test files and directory."""
-        for path in [cls.NEW_DOC_PATH, cls.EXISTING_DOC_PATH, cls.SAVED_DOC_PATH]:
-            if os.path.exists(path):
-                os.remove(path)
-        if os.path.exists(cls.TEST_DOC_DIR):
-            # Check if directory is empty before removing
-            if not os.listdir(cls.TEST_DOC_DIR):
-                 os.rmdir(cls.TEST_DOC_DIR)
-            else:
-                # If other files exist (e.g. from word_editor.py example), remove them
-                for f in os.listdir(cls.TEST_DOC_DIR):
-                    if f.startswith("test_document_new") and f.endswith(".docx"): # from example in word_editor
-                        os.remove(os.path.join(cls.TEST_DOC_DIR, f))
-                if not os.listdir(cls.TEST_DOC_DIR): # recheck
-                    os.rmdir(cls.TEST_DOC_DIR)
+        """Remove the temporary test directory and everything written to it."""
+        cls._tmp.cleanup()
+
+    def _load_existing(self):
+        """Returns an editor on a fresh copy of the sample existing document."""
+        return WordEditor(io.BytesIO(self._existing_bytes))
+
+    def _make_editor_with_styled_para(self, text, **run_attrs):
+        """
+        Returns (editor, paragraph) for a blank document holding one paragraph with a single
+        run of text. Each keyword sets that attribute on the run (e.g. bold) or, if the run
+        has no such attribute, on its font (e.g. name, size).
+        """
+        editor = fresh_editor()
+        paragraph = editor.document.add_paragraph()
+        run = paragraph.add_run(text)
+        for attr, value in run_attrs.items():
+            setattr(run if hasattr(run, attr) else run.font, attr, value)
+        return editor, paragraph
+
+    def assertParaTexts(self, editor, expected):
+        """Asserts that the editor's paragraph texts are exactly expected (any sequence), in order."""
+        self.assertTupleEqual(tuple(p.text for p in editor.document.paragraphs), tuple(expected))
 
 
     def test_01_create_new_document(self):
@@ -71,7 +170,7 @@ class TestWordEditor(unittest.TestCase):
 
     def test_02_load_existing_document(self):
         """Test loading an existing document."""
-        editor = WordEditor(self.EXISTING_DOC_PATH)
+        editor = self._load_existing()
         self.assertIsNotNone(editor.document)
         self.assertEqual(len(editor.document.paragraphs), 2)
         self.assertEqual(editor.document.paragraphs[0].text, "Hello, existing world!")
@@ -80,124 +179,92 @@ class TestWordEditor(unittest.TestCase):
 
     def test_03_save_document(self):
         """Test saving a document."""
-        editor = WordEditor()
+        editor = fresh_editor()
         p = editor.document.add_paragraph("Content to save.")
         run = p.add_run(" More text.")
         run.italic = True
-        editor.save_document(self.SAVED_DOC_PATH)
-        self.assertTrue(os.path.exists(self.SAVED_DOC_PATH))
-
-        # Verify content of saved document
-        loaded_doc = Document(self.SAVED_DOC_PATH)
+        # Verify content with an in-memory round trip
+        buffer = io.BytesIO()
+        editor.save_document(buffer)
+        buffer.seek(0)
+        loaded_doc = Document(buffer)
         self.assertEqual(len(loaded_doc.paragraphs), 1)
         self.assertEqual(loaded_doc.paragraphs[0].text, "Content to save. More text.")
         self.assertTrue(loaded_doc.paragraphs[0].runs[1].italic)
 
+        # Saving to a path still works
+        editor.save_document(self.SAVED_DOC_PATH)
+        self.assertTrue(os.path.exists(self.SAVED_DOC_PATH))
+
     def test_04_get_paragraph_text(self):
         """Test the get_paragraph_text method."""
-        editor = WordEditor(self.EXISTING_DOC_PATH)
+        editor = self._load_existing()
         self.assertEqual(editor.get_paragraph_text(0), "Hello, existing world!")
         self.assertEqual(editor.get_paragraph_text(1), "This is the second paragraph.")
         self.assertEqual(editor.get_paragraph_text(5), "") # Index out of bounds
 
     def test_05_copy_run_formatting(self):
         """Test the copy_run_formatting method."""
-        doc = Document()
-        p_source = doc.add_paragraph()
-        source_run = p_source.add_run("Source Run")
-        source_run.bold = True
-        source_run.italic = False
-        source_run.underline = True
-        source_run.font.name = "Times New Roman"
-        source_run.font.size = Pt(10)
-        source_run.font.strike = True
-        # source_run.font.highlight_color = WD_COLOR_INDEX.YELLOW # Requires WD_COLOR_INDEX
+        doc = copy.deepcopy(self._fmt_source_doc)
+        source_run = doc.paragraphs[0].runs[0]
 
         p_target = doc.add_paragraph()
         target_run = p_target.add_run("Target Run")
 
-        editor = WordEditor() # Editor instance needed to call the method
+        editor = fresh_editor() # Editor instance needed to call the method
         editor.copy_run_formatting(source_run, target_run)
 
-        self.assertEqual(target_run.bold, source_run.bold)
-        self.assertEqual(target_run.italic, source_run.italic)
-        self.assertEqual(target_run.underline, source_run.underline)
-        self.assertEqual(target_run.font.name, source_run.font.name)
-        self.assertEqual(target_run.font.size, source_run.font.size)
-        self.assertEqual(target_run.font.strike, source_run.font.strike)
+        # (bold, italic, underline, font name, size, strike)
+        self.assertEqual(
+            (target_run.bold, target_run.italic, target_run.underline,
+             target_run.font.name, target_run.font.size, target_run.font.strike),
+            (source_run.bold, source_run.italic, source_run.underline,
+             source_run.font.name, source_run.font.size, source_run.font.strike))
         # self.assertEqual(target_run.font.highlight_color, source_run.font.highlight_color)
 
+    @unittest.skipUnless(_HAVE_H1, "Heading 1 style unavailable")
     def test_06_copy_paragraph_formatting(self):
         """Test the copy_paragraph_formatting method."""
-        doc = Document()
-        source_paragraph = doc.add_paragraph("Source Paragraph")
-        source_paragraph.style = 'Heading 1' # Assuming 'Heading 1' exists
-        source_paragraph.alignment = WD_ALIGN_PARAGRAPH.RIGHT
-        
+        doc = copy.deepcopy(self._fmt_source_doc)
+        source_paragraph = doc.paragraphs[1]
         source_pf = source_paragraph.paragraph_format
-        source_pf.left_indent = Pt(36) # 0.5 inch
-        source_pf.right_indent = Pt(72) # 1 inch
-        source_pf.space_before = Pt(6)
-        source_pf.space_after = Pt(12)
-        source_pf.line_spacing = 1.5
-        source_pf.keep_with_next = True
-
 
         target_paragraph = doc.add_paragraph("Target Paragraph")
 
-        editor = WordEditor() # Editor instance needed to call the method
+        editor = fresh_editor() # Editor instance needed to call the method
         editor.copy_paragraph_formatting(source_paragraph, target_paragraph)
 
-        # Ensure the style is available in the test document and styles are not None
-        if 'Heading 1' in doc.styles:
-            target_style_name = target_paragraph.style.name if target_paragraph.style and target_paragraph.style.name else None
-            source_style_obj = source_paragraph.style
-            source_style_name = source_style_obj.name if source_style_obj else None
-            
-            if target_style_name is not None and source_style_name is not None:
-                self.assertEqual(target_style_name, source_style_name)
-            else:
-                print("Warning: Paragraph style name is None. Style copy test might be lenient.")
-        else:
-            print("Warning: 'Heading 1' style not found in test_06_copy_paragraph_formatting. Style copy test might be lenient.")
+        self.assertEqual(target_paragraph.style.name, source_paragraph.style.name)
 
-        self.assertEqual(target_paragraph.alignment, source_paragraph.alignment)
-        
+        # (alignment, left/right indent, space before/after, line spacing, keep with next)
         target_pf = target_paragraph.paragraph_format
-        self.assertEqual(target_pf.left_indent, source_pf.left_indent)
-        self.assertEqual(target_pf.right_indent, source_pf.right_indent)
-        self.assertEqual(target_pf.space_before, source_pf.space_before)
-        self.assertEqual(target_pf.space_after, source_pf.space_after)
-        self.assertEqual(target_pf.line_spacing, source_pf.line_spacing)
-        self.assertEqual(target_pf.keep_with_next, source_pf.keep_with_next)
+        self.assertEqual(
+            (target_paragraph.alignment, target_pf.left_indent, target_pf.right_indent,
+             target_pf.space_before, target_pf.space_after, target_pf.line_spacing, target_pf.keep_with_next),
+            (source_paragraph.alignment, source_pf.left_indent, source_pf.right_indent,
+             source_pf.space_before, source_pf.space_after, source_pf.line_spacing, source_pf.keep_with_next))
 
 
     def test_07_update_paragraph_text(self):
         """Test the update_paragraph_text method."""
         # Test case 1: Preserve style
-        editor_preserve = WordEditor()
-        p_orig_preserve = editor_preserve.document.add_paragraph()
-        run_orig_preserve = p_orig_preserve.add_run("Original bold text.")
-        run_orig_preserve.bold = True
-        run_orig_preserve.font.name = 'Calibri'
-        run_orig_preserve.font.size = Pt(16)
+        editor_preserve, p_orig_preserve = self._make_editor_with_styled_para(
+            "Original bold text.", bold=True, name='Calibri', size=Pt(16))
         p_orig_preserve.add_run(" More normal text.") # Add a second run
 
         editor_preserve.update_paragraph_text(0, "Updated bold text.", preserve_style=True)
         updated_p_preserve = editor_preserve.document.paragraphs[0]
         self.assertEqual(updated_p_preserve.text, "Updated bold text.")
-        self.assertTrue(len(updated_p_preserve.runs) > 0, "Paragraph should have runs after update.")
+        runs_preserve = updated_p_preserve.runs
+        self.assertTrue(len(runs_preserve) > 0, "Paragraph should have runs after update.")
         # Check formatting of the first run (or the only run if text is short)
-        self.assertTrue(updated_p_preserve.runs[0].bold)
-        self.assertEqual(updated_p_preserve.runs[0].font.name, 'Calibri') # Check if other formatting sticks
-        self.assertEqual(updated_p_preserve.runs[0].font.size, Pt(16)) # Check if other formatting sticks
+        first_run = runs_preserve[0]
+        self.assertTrue(first_run.bold)
+        self.assertEqual(first_run.font.name, 'Calibri') # Check if other formatting sticks
+        self.assertEqual(first_run.font.size, Pt(16)) # Check if other formatting sticks
 
         # Test case 2: Do not preserve style
-        editor_no_preserve = WordEditor()
-        p_orig_no_preserve = editor_no_preserve.document.add_paragraph()
-        run_orig_no_preserve = p_orig_no_preserve.add_run("Original italic text.")
-        run_orig_no_preserve.italic = True
-        run_orig_no_preserve.font.name = 'Arial'
+        editor_no_preserve, _ = self._make_editor_with_styled_para("Original italic text.", italic=True, name='Arial')
 
         editor_no_preserve.update_paragraph_text(0, "Updated plain text.", preserve_style=False)
         updated_p_no_preserve = editor_no_preserve.document.paragraphs[0]
@@ -205,149 +272,84 @@ class TestWordEditor(unittest.TestCase):
         self.assertTrue(len(updated_p_no_preserve.runs) > 0, "Paragraph should have runs after update.")
         # Formatting should be default or paragraph's style, not necessarily italic or Arial
         # We can't easily assert it's *not* italic without knowing the default.
-        # A simple check is that it's not explicitly the old style if the new text is different.
-        if updated_p_no_preserve.runs[0].font.name == 'Arial':
-            print("Warning: Font name might have been unintentionally preserved or is default.")
         # self.assertFalse(updated_p_no_preserve.runs[0].italic) # This might fail if default is italic
 
         # Test case 3: Update paragraph in an existing document
-        editor_existing = WordEditor(self.EXISTING_DOC_PATH)
-        original_first_p_text = editor_existing.document.paragraphs[0].text
-        original_first_p_font_name = editor_existing.document.paragraphs[0].runs[0].font.name
+        editor_existing = self._load_existing()
+        original_first_p = editor_existing.document.paragraphs[0]
+        original_first_p_text = original_first_p.text
+        original_first_p_font_name = original_first_p.runs[0].font.name
         
         editor_existing.update_paragraph_text(0, "New content for existing doc.", preserve_style=True)
-        self.assertEqual(editor_existing.document.paragraphs[0].text, "New content for existing doc.")
-        self.assertTrue(editor_existing.document.paragraphs[0].runs[0].bold) # From EXISTING_DOC_PATH setup
-        self.assertEqual(editor_existing.document.paragraphs[0].runs[0].font.name, original_first_p_font_name)
+        updated_first_p = editor_existing.document.paragraphs[0]
+        self.assertEqual(updated_first_p.text, "New content for existing doc.")
+        updated_first_run = updated_first_p.runs[0]
+        self.assertTrue(updated_first_run.bold) # From the existing_docx_bytes sample document
+        self.assertEqual(updated_first_run.font.name, original_first_p_font_name)
 
         # Test case 4: Index out of bounds
-        editor_bounds = WordEditor()
-        editor_bounds.document.add_paragraph("A paragraph.")
+        editor_bounds, _ = self._make_editor_with_styled_para("A paragraph.")
         # Should print warning and not crash
         editor_bounds.update_paragraph_text(5, "This should not appear.", preserve_style=True)
-        self.assertEqual(editor_bounds.document.paragraphs[0].text, "A paragraph.") # No change
-        self.assertEqual(len(editor_bounds.document.paragraphs), 1)
+        self.assertParaTexts(editor_bounds, ["A paragraph."]) # No change
 
 
+    @unittest.skipUnless(_HAVE_HEADING_STYLES, "Title/Heading 1/Heading 2 styles unavailable")
     def test_08_replace_text_after_heading(self):
         """Test the replace_text_after_heading method."""
-        # Setup a document with headings and content
-        doc = Document()
-        doc.add_paragraph("Document Title", style='Title')
-        doc.add_paragraph("Introduction", style='Heading 1')
-        doc.add_paragraph("This is the first paragraph of the intro.")
-        doc.add_paragraph("This is the second paragraph of the intro.")
-        doc.add_paragraph("Methods", style='Heading 1')
-        doc.add_paragraph("Details about methods.")
-        doc.add_paragraph("Sub-heading", style='Heading 2') # Lower level heading
-        doc.add_paragraph("Details under sub-heading.")
-        doc.add_paragraph("Conclusion", style='Heading 1')
-        doc.add_paragraph("Final thoughts.")
-
-        temp_doc_path = os.path.join(self.TEST_DOC_DIR, "temp_heading_test.docx")
-        # Ensure styles are available or add them
-        # For 'Heading 1', 'Heading 2', 'Title' to be available, they should be in the default template
-        # or added explicitly if using a very minimal new document.
-        # python-docx uses default template which usually has them.
-        try:
-            doc.styles['Heading 1']
-            doc.styles['Heading 2']
-            doc.styles['Title']
-        except KeyError as e:
-            print(f"Warning: A standard style ({e}) was not found. Test might behave unexpectedly.")
-            # For a robust test, one might add these styles if they don't exist.
-            # from docx.enum.style import WD_STYLE_TYPE
-            # if not 'Heading 1' in doc.styles:
-            #     doc.styles.add_style('Heading 1', WD_STYLE_TYPE.PARAGRAPH)
-            # etc.
-
-        doc.save(temp_doc_path)
+        # Each case below edits its own deep copy of the class heading document; nothing is re-parsed
+        # Paragraphs and expected results are the module-level _HEADING_DOC_* / _EXPECTED_CASE* tuples
 
         # Case 1: Replace content after "Introduction" (Heading 1)
-        editor1 = WordEditor(temp_doc_path)
-        new_intro_content = ["New intro line 1.", "New intro line 2."]
-        result1 = editor1.replace_text_after_heading("Introduction", new_intro_content, heading_style_name="Heading 1")
+        editor1 = WordEditor.from_document(copy.deepcopy(self._heading_doc))
+        result1 = editor1.replace_text_after_heading("Introduction", list(_NEW_INTRO), heading_style_name="Heading 1")
         self.assertTrue(result1)
-        self.assertEqual(editor1.document.paragraphs[1].text, "Introduction")
-        self.assertEqual(editor1.document.paragraphs[2].text, "New intro line 1.")
-        self.assertEqual(editor1.document.paragraphs[3].text, "New intro line 2.")
-        self.assertEqual(editor1.document.paragraphs[4].text, "Methods") # Next H1
+        self.assertParaTexts(editor1, _EXPECTED_CASE1)
         # editor1.save_document(os.path.join(self.TEST_DOC_DIR, "debug_case1.docx"))
 
 
         # Case 2: Heading not found
-        editor2 = WordEditor(temp_doc_path) # Reload original content
+        editor2 = WordEditor.from_document(copy.deepcopy(self._heading_doc)) # Fresh copy of the original content
         result2 = editor2.replace_text_after_heading("NonExistent Heading", ["Should not appear"], heading_style_name="Heading 1")
         self.assertFalse(result2)
-        self.assertEqual(editor2.document.paragraphs[2].text, "This is the first paragraph of the intro.") # Unchanged
+        self.assertParaTexts(editor2, _HEADING_DOC_TEXTS) # Unchanged
 
         # Case 3: Section extends to end of document
-        editor3 = WordEditor(temp_doc_path) # Reload
-        new_conclusion_content = ["The very end, part 1.", "The very end, part 2."]
-        result3 = editor3.replace_text_after_heading("Conclusion", new_conclusion_content, heading_style_name="Heading 1")
+        editor3 = WordEditor.from_document(copy.deepcopy(self._heading_doc)) # Fresh copy
+        result3 = editor3.replace_text_after_heading("Conclusion", list(_NEW_CONCLUSION), heading_style_name="Heading 1")
         self.assertTrue(result3)
-        # Original paras: Title, H1-Intro, P1, P2, H1-Methods, P-Meth, H2-Sub, P-Sub, H1-Conc, P-Final (10 paras, idx 0-9)
-        # H1-Conc is at index 8.
-        self.assertEqual(editor3.document.paragraphs[8].text, "Conclusion")
-        self.assertEqual(editor3.document.paragraphs[9].text, "The very end, part 1.")
-        self.assertEqual(editor3.document.paragraphs[10].text, "The very end, part 2.")
-        self.assertEqual(len(editor3.document.paragraphs), 11) # Original 10 - 1 (P-Final) + 2 (new_conclusion_content)
+        self.assertParaTexts(editor3, _EXPECTED_CASE3)
         # editor3.save_document(os.path.join(self.TEST_DOC_DIR, "debug_case3.docx"))
 
         # Case 5: Section followed by heading of same/higher level (H1 followed by H2, then H1)
-        editor5 = WordEditor(temp_doc_path) # Reload
-        new_methods_content = ["New method details only."]
-        result5 = editor5.replace_text_after_heading("Methods", new_methods_content, heading_style_name="Heading 1")
+        editor5 = WordEditor.from_document(copy.deepcopy(self._heading_doc)) # Fresh copy
+        result5 = editor5.replace_text_after_heading("Methods", list(_NEW_METHODS), heading_style_name="Heading 1")
         self.assertTrue(result5)
         # Original: ..., H1-Methods(idx 4), P-Meth(5), H2-Sub(6), P-Sub(7), H1-Conc(8)
         # Expected: ..., H1-Methods(idx 4), "New method details only."(5), H1-Conc(6)
-        self.assertEqual(editor5.document.paragraphs[4].text, "Methods")
-        self.assertEqual(editor5.document.paragraphs[5].text, "New method details only.")
-        self.assertEqual(editor5.document.paragraphs[6].text, "Conclusion")
-        self.assertEqual(len(editor5.document.paragraphs), 8) # Original 10 - 3 (P-Meth, H2-Sub, P-Sub) + 1 (new_methods_content)
+        self.assertParaTexts(editor5, _EXPECTED_CASE5)
         # editor5.save_document(os.path.join(self.TEST_DOC_DIR, "debug_case5.docx"))
 
         # Case 6: Replace content after "Sub-heading" (Heading 2)
-        editor6 = WordEditor(temp_doc_path) # Reload
-        new_subheading_content = ["Fresh sub-details."]
-        result6 = editor6.replace_text_after_heading("Sub-heading", new_subheading_content, heading_style_name="Heading 2")
+        editor6 = WordEditor.from_document(copy.deepcopy(self._heading_doc)) # Fresh copy
+        result6 = editor6.replace_text_after_heading("Sub-heading", list(_NEW_SUBHEADING), heading_style_name="Heading 2")
         self.assertTrue(result6)
         # Original: ..., H2-Sub(idx 6), P-Sub(7), H1-Conc(8)
         # Expected: ..., H2-Sub(idx 6), "Fresh sub-details."(7), H1-Conc(8)
-        self.assertEqual(editor6.document.paragraphs[6].text, "Sub-heading")
-        self.assertEqual(editor6.document.paragraphs[7].text, "Fresh sub-details.")
-        self.assertEqual(editor6.document.paragraphs[8].text, "Conclusion")
-        self.assertEqual(len(editor6.document.paragraphs), 10) # Original 10 - 1 (P-Sub) + 1 (new_subheading_content)
+        self.assertParaTexts(editor6, _EXPECTED_CASE6)
         # editor6.save_document(os.path.join(self.TEST_DOC_DIR, "debug_case6.docx"))
 
         # Case 7: Empty new content (deletes the section)
-        editor7 = WordEditor(temp_doc_path) # Reload
+        editor7 = WordEditor.from_document(copy.deepcopy(self._heading_doc)) # Fresh copy
         result7 = editor7.replace_text_after_heading("Methods", [], heading_style_name="Heading 1")
         self.assertTrue(result7)
-        # Original: ..., H1-Methods(idx 4), P-Meth(5), H2-Sub(6), P-Sub(7), H1-Conc(8)
-        # Expected: ..., H1-Methods(idx 4), H1-Conc(idx 5)
-        self.assertEqual(editor7.document.paragraphs[4].text, "Methods")
-        self.assertEqual(editor7.document.paragraphs[5].text, "Conclusion")
-        self.assertEqual(len(editor7.document.paragraphs), 7) # Original 10 - 3 (P-Meth, H2-Sub, P-Sub) = 7. No new paras.
-                                                            # Actually, 10 - 3 paragraphs removed (P-Meth, H2-Sub, P-Sub) = 7
+        # Expected: ..., H1-Methods(idx 4), H1-Conc(idx 5), P-Final(idx 6)
+        self.assertParaTexts(editor7, _EXPECTED_CASE7)
         # editor7.save_document(os.path.join(self.TEST_DOC_DIR, "debug_case7.docx"))
-        # Re-evaluating count for case 7:
-        # Original 10 paragraphs.
-        # Section for "Methods" (H1) includes:
-        #   - "Details about methods." (para after H1)
-        #   - "Sub-heading" (H2, lower level, so part of section)
-        #   - "Details under sub-heading." (para after H2)
-        # These 3 paragraphs are removed. No new paragraphs are added.
-        # So, 10 - 3 = 7 paragraphs should remain.
-        self.assertEqual(len(editor7.document.paragraphs), 7)
-
-
-        if os.path.exists(temp_doc_path):
-            os.remove(temp_doc_path)
 
     def test_09_insert_paragraph_after(self):
         """Test inserting a paragraph after a specified index."""
-        editor = WordEditor()
+        editor = fresh_editor()
         p1 = editor.document.add_paragraph("Paragraph 1")
         p2 = editor.document.add_paragraph("Paragraph 2") # Original second paragraph
 
@@ -355,83 +357,68 @@ class TestWordEditor(unittest.TestCase):
         new_p_text = "Inserted Paragraph A"
         inserted_p = editor.insert_paragraph_after(0, new_p_text, style='ListBullet') # Assuming ListBullet style exists
         self.assertIsNotNone(inserted_p)
-        self.assertEqual(len(editor.document.paragraphs), 3)
-        self.assertEqual(editor.document.paragraphs[0].text, "Paragraph 1")
-        self.assertEqual(editor.document.paragraphs[1].text, new_p_text)
+        self.assertParaTexts(editor, ["Paragraph 1", new_p_text, "Paragraph 2"]) # Original p2 shifted
+        inserted_style = editor.document.paragraphs[1].style
         if 'List Bullet' in editor.document.styles: # Name might have space
-            if editor.document.paragraphs[1].style:
-                self.assertEqual(editor.document.paragraphs[1].style.name, 'List Bullet')
+            if inserted_style:
+                self.assertEqual(inserted_style.name, 'List Bullet')
         elif 'ListBullet' in editor.document.styles:
-            if editor.document.paragraphs[1].style:
-                self.assertEqual(editor.document.paragraphs[1].style.name, 'ListBullet')
-
-        self.assertEqual(editor.document.paragraphs[2].text, "Paragraph 2") # Original p2 shifted
+            if inserted_style:
+                self.assertEqual(inserted_style.name, 'ListBullet')
 
         # Insert after the new last paragraph (which was original p2, now at index 2)
         editor.insert_paragraph_after(2, "Paragraph End", style=None)
-        self.assertEqual(len(editor.document.paragraphs), 4)
-        self.assertEqual(editor.document.paragraphs[3].text, "Paragraph End")
+        self.assertParaTexts(editor, ["Paragraph 1", new_p_text, "Paragraph 2", "Paragraph End"])
 
         # Test inserting after current last paragraph
-        editor_last = WordEditor()
+        editor_last = fresh_editor()
         editor_last.document.add_paragraph("Only Paragraph")
         editor_last.insert_paragraph_after(0, "Appended Paragraph")
-        self.assertEqual(len(editor_last.document.paragraphs), 2)
-        self.assertEqual(editor_last.document.paragraphs[1].text, "Appended Paragraph")
+        self.assertParaTexts(editor_last, ["Only Paragraph", "Appended Paragraph"])
 
         # Test invalid index
         result_invalid = editor.insert_paragraph_after(10, "Invalid insert")
         self.assertIsNone(result_invalid)
-        self.assertEqual(len(editor.document.paragraphs), 4) # No change
+        self.assertParaTexts(editor, ["Paragraph 1", new_p_text, "Paragraph 2", "Paragraph End"]) # No change
 
     def test_10_delete_paragraph(self):
         """Test deleting a paragraph at a specified index."""
-        editor = WordEditor()
+        editor = fresh_editor()
         p1 = editor.document.add_paragraph("Paragraph A to delete")
         p2 = editor.document.add_paragraph("Paragraph B to keep")
         p3 = editor.document.add_paragraph("Paragraph C to delete")
         p4 = editor.document.add_paragraph("Paragraph D to keep")
-        initial_len = len(editor.document.paragraphs) # Should be 4
 
         # Delete first paragraph (index 0)
         result1 = editor.delete_paragraph(0)
         self.assertTrue(result1)
-        self.assertEqual(len(editor.document.paragraphs), initial_len - 1) # Now 3
-        self.assertEqual(editor.document.paragraphs[0].text, "Paragraph B to keep")
+        self.assertParaTexts(editor, ["Paragraph B to keep", "Paragraph C to delete", "Paragraph D to keep"])
 
         # Delete what is now the second paragraph (originally p3, "Paragraph C to delete")
         # After first deletion: B, C, D. So C is at index 1.
         result2 = editor.delete_paragraph(1)
         self.assertTrue(result2)
-        self.assertEqual(len(editor.document.paragraphs), initial_len - 2) # Now 2
-        self.assertEqual(editor.document.paragraphs[0].text, "Paragraph B to keep")
-        self.assertEqual(editor.document.paragraphs[1].text, "Paragraph D to keep")
+        self.assertParaTexts(editor, ["Paragraph B to keep", "Paragraph D to keep"])
 
         # Test deleting last paragraph
         result_last = editor.delete_paragraph(1) # Deletes "Paragraph D"
         self.assertTrue(result_last)
-        self.assertEqual(len(editor.document.paragraphs), initial_len - 3) # Now 1
-        self.assertEqual(editor.document.paragraphs[0].text, "Paragraph B to keep")
+        self.assertParaTexts(editor, ["Paragraph B to keep"])
 
         # Test invalid index
         result_invalid = editor.delete_paragraph(5) # Index out of bounds
         self.assertFalse(result_invalid)
-        self.assertEqual(len(editor.document.paragraphs), 1) # No change
+        self.assertParaTexts(editor, ["Paragraph B to keep"]) # No change
 
         # Test deleting the only remaining paragraph
         result_only = editor.delete_paragraph(0)
         self.assertTrue(result_only)
-        self.assertEqual(len(editor.document.paragraphs), 0)
+        self.assertParaTexts(editor, [])
 
     def test_11_get_table_cell_text(self):
         """Test get_table_cell_text method."""
-        editor = WordEditor()
-        # Add a table for testing
-        table = editor.document.add_table(rows=2, cols=2)
-        table.cell(0, 0).text = "R0C0"
-        table.cell(0, 1).text = "R0C1"
-        table.cell(1, 0).text = "R1C0"
-        table.cell(1, 1).text = "R1C1"
+        # Only reads the table, so the class document is used without copying
+        editor = WordEditor.from_document(self._table2x2_doc)
 
         self.assertEqual(editor.get_table_cell_text(0, 0, 0), "R0C0")
         self.assertEqual(editor.get_table_cell_text(0, 1, 1), "R1C1")
@@ -446,9 +433,7 @@ class TestWordEditor(unittest.TestCase):
 
     def test_12_update_table_cell_text(self):
         """Test update_table_cell_text method."""
-        editor = WordEditor()
-        table = editor.document.add_table(rows=1, cols=1)
-        table.cell(0,0).text = "Old Text"
+        editor = WordEditor.from_document(copy.deepcopy(self._table1x1_doc))
 
         result = editor.update_table_cell_text(0, 0, 0, "New Text")
         self.assertTrue(result)
@@ -470,8 +455,8 @@ class TestWordEditor(unittest.TestCase):
 
     def test_13_add_row_to_table(self):
         """Test add_row_to_table method."""
-        editor = WordEditor()
-        table = editor.document.add_table(rows=1, cols=2)
+        editor = WordEditor.from_document(copy.deepcopy(self._table1x2_doc))
+        table = editor.document.tables[0]
         self.assertEqual(len(table.rows), 1)
 
         new_row = editor.add_row_to_table(0)
@@ -483,7 +468,7 @@ class TestWordEditor(unittest.TestCase):
 
     def test_14_get_list_item_text(self):
         """Test get_list_item_text method (currently basic)."""
-        editor = WordEditor()
+        editor = fresh_editor()
         # For now, it behaves like get_paragraph_text
         # A 'ListBullet' style should exist in the default template.
         # If not, this test might be too strict on style application for a placeholder.
@@ -498,7 +483,7 @@ class TestWordEditor(unittest.TestCase):
 
     def test_15_update_list_item_text(self):
         """Test update_list_item_text method (currently basic)."""
-        editor = WordEditor()
+        editor = fresh_editor()
         # For now, it behaves like update_paragraph_text
         style_to_test = 'ListNumber' # Should exist in default template
         try:
@@ -653,13 +638,9 @@ class TestWordEditor(unittest.TestCase):
         # Table is now at index 9 (original index 9, unaffected by paragraph changes before it)
         self.assertEqual(updated_doc.tables[0].cell(1, 1).text, "Updated R1C1")
 
-        # Clean up the temporary document
-        if os.path.exists(temp_doc_path):
-            os.remove(temp_doc_path)
-
     def test_17_update_paragraph_text_formatting(self):
         """Test update_paragraph_text preserves various formatting."""
-        editor = WordEditor()
+        editor = fresh_editor()
         p = editor.document.add_paragraph()
         run1 = p.add_run("Bold ")
         run1.bold = True
@@ -689,7 +670,7 @@ class TestWordEditor(unittest.TestCase):
 
     def test_18_update_paragraph_text_no_preserve_style(self):
         """Test update_paragraph_text with preserve_style=False."""
-        editor = WordEditor()
+        editor = fresh_editor()
         p = editor.document.add_paragraph()
         run1 = p.add_run("Bold text.")
         run1.bold = True
@@ -703,7 +684,7 @@ class TestWordEditor(unittest.TestCase):
 
     def test_19__update_run_text_formatting(self):
         """Test _update_run_text preserves formatting."""
-        editor = WordEditor()
+        editor = fresh_editor()
         p = editor.document.add_paragraph("Prefix ")
         run_to_update = p.add_run("original text")
         run_to_update.italic = True
@@ -721,7 +702,7 @@ class TestWordEditor(unittest.TestCase):
 
     def test_20_update_table_cell_text_formatting(self):
         """Test update_table_cell_text preserves formatting within cell."""
-        editor = WordEditor()
+        editor = fresh_editor()
         table = editor.document.add_table(rows=1, cols=1)
         cell = table.cell(0, 0)
         p = cell.paragraphs[0]
@@ -742,7 +723,7 @@ class TestWordEditor(unittest.TestCase):
 
     def test_21_add_row_to_table_structure(self):
         """Test add_row_to_table adds a row with correct number of cells."""
-        editor = WordEditor()
+        editor = fresh_editor()
         table = editor.document.add_table(rows=1, cols=3)
         self.assertEqual(len(table.rows), 1)
         self.assertEqual(len(table.rows[0].cells), 3)
@@ -839,11 +820,6 @@ class TestWordEditor(unittest.TestCase):
         self.assertTrue(updated_doc_run.paragraphs[0].runs[1].italic)
         self.assertEqual(updated_doc_run.paragraphs[0].runs[1].font.color.rgb, RGBColor(0, 0, 255))
 
-        if os.path.exists(temp_doc_path):
-            os.remove(temp_doc_path)
-        if os.path.exists(temp_doc_path_run):
-            os.remove(temp_doc_path_run)
-
     def test_23_apply_changes_table_cell_update_formatting(self):
         """Test apply_changes with TABLE_CELL_UPDATE preserves formatting."""
         doc = Document()
@@ -881,9 +857,6 @@ class TestWordEditor(unittest.TestCase):
         self.assertTrue(updated_cell.paragraphs[0].runs[0].bold)
         self.assertFalse(updated_cell.paragraphs[0].runs[0].italic) # Not italic
 
-        if os.path.exists(temp_doc_path):
-            os.remove(temp_doc_path)
-
     # Add placeholder tests for list manipulation once fully implemented
     # def test_XX_get_list_item_text_full(self):
     #     """Test get_list_item_text with actual list structures."""
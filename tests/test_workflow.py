@@ -1,6 +1,8 @@
 # tests/test_workflow.py
 import unittest
 import os
+import contextlib
+import shutil
 from datetime import datetime
 from docx import Document as DocxDocument
 from docx.shared import Pt
@@ -58,12 +60,7 @@ class TestWorkflowSystem(unittest.TestCase):
     @classmethod
     def tearDownClass(cls):
         """Clean up test files and directory."""
-        for path in [cls.ORIG_DOC_PATH, cls.MOD_DOC_PATH]:
-            if os.path.exists(path):
-                os.remove(path)
-        if os.path.exists(cls.TEST_DIR):
-            if not os.listdir(cls.TEST_DIR): # Only remove if empty
-                os.rmdir(cls.TEST_DIR)
+        shutil.rmtree(cls.TEST_DIR, ignore_errors=True)
 
     def test_01_workflow_creation_and_add_change(self):
         """Test creating a workflow and adding changes."""
@@ -191,7 +188,7 @@ class TestWorkflowSystem(unittest.TestCase):
         self.assertEqual(workflow.get_change_by_id(change.change_id).status, ChangeStatus.APPLIED)
 
         # Clean up
-        if os.path.exists(temp_doc_path):
+        with contextlib.suppress(FileNotFoundError):
             os.remove(temp_doc_path)
 
     def test_07_applier_text_update_run(self):
@@ -226,7 +223,7 @@ class TestWorkflowSystem(unittest.TestCase):
         self.assertEqual(workflow.get_change_by_id(change.change_id).status, ChangeStatus.APPLIED)
 
         # Clean up
-        if os.path.exists(temp_doc_path):
+        with contextlib.suppress(FileNotFoundError):
             os.remove(temp_doc_path)
 
     def test_08_applier_paragraph_insert(self):
@@ -263,7 +260,7 @@ class TestWorkflowSystem(unittest.TestCase):
         self.assertEqual(workflow.get_change_by_id(change.change_id).status, ChangeStatus.APPLIED)
 
         # Clean up
-        if os.path.exists(temp_doc_path):
+        with contextlib.suppress(FileNotFoundError):
             os.remove(temp_doc_path)
 
     def test_09_applier_paragraph_delete(self):
@@ -299,7 +296,7 @@ class TestWorkflowSystem(unittest.TestCase):
         self.assertEqual(workflow.get_change_by_id(change.change_id).status, ChangeStatus.APPLIED)
 
         # Clean up
-        if os.path.exists(temp_doc_path):
+        with contextlib.suppress(FileNotFoundError):
             os.remove(temp_doc_path)
 
     def test_10_applier_section_replace(self):
@@ -338,7 +335,7 @@ class TestWorkflowSystem(unittest.TestCase):
         self.assertEqual(workflow.get_change_by_id(change.change_id).status, ChangeStatus.APPLIED)
 
         # Clean up
-        if os.path.exists(temp_doc_path):
+        with contextlib.suppress(FileNotFoundError):
             os.remove(temp_doc_path)
 
     def test_11_applier_table_cell_update(self):
@@ -370,7 +367,7 @@ class TestWorkflowSystem(unittest.TestCase):
         self.assertEqual(workflow.get_change_by_id(change.change_id).status, ChangeStatus.APPLIED)
 
         # Clean up
-        if os.path.exists(temp_doc_path):
+        with contextlib.suppress(FileNotFoundError):
             os.remove(temp_doc_path)
 
     def test_12_applier_mixed_changes(self):
@@ -458,7 +455,7 @@ class TestWorkflowSystem(unittest.TestCase):
             self.assertEqual(workflow.get_change_by_id(change.change_id).status, ChangeStatus.APPLIED)
 
         # Clean up
-        if os.path.exists(temp_doc_path):
+        with contextlib.suppress(FileNotFoundError):
             os.remove(temp_doc_path)
 
 
@@ -493,7 +490,7 @@ class TestWorkflowSystem(unittest.TestCase):
         self.assertEqual(workflow.get_change_by_id(change.change_id).status, ChangeStatus.REJECTED) # Status should remain REJECTED
 
         # Clean up
-        if os.path.exists(temp_doc_path):
+        with contextlib.suppress(FileNotFoundError):
             os.remove(temp_doc_path)
 
     # Add tests for error handling during application if specific error cases are identified.